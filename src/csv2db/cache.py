@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+#
+# Since: October, 2026
+# Author: gvenzl
+# Name: cache.py
+# Description: On-disk cache of file headers and column statistics for csv2db
+#
+# Copyright 2026 Gerald Venzl
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+import csv2db.config as cfg
+import csv2db.functions as f
+from csv2db.inference import ColumnStats
+
+# Size of the first block of a file that is hashed for the fingerprint
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+
+def get_default_cache_dir():
+    """Returns the default cache directory.
+
+    Returns
+    -------
+    str
+        The csv2db directory within $XDG_CACHE_HOME or ~/.cache.
+    """
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                        "csv2db")
+
+
+def get_file_fingerprint(file_name):
+    """Returns the fingerprint of a file and the options used to read it.
+
+    The fingerprint consists of the path, size, modification time and a hash of the first block of the file,
+    so that it changes whenever the file is modified or replaced.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    dict
+        The fingerprint of the file.
+    """
+    # Members of an archive are fingerprinted by the archive
+    archive = f.split_archive_member(file_name)[0]
+    stat = os.stat(archive)
+    with open(archive, mode="rb") as file:
+        block_hash = hashlib.sha256(file.read(FINGERPRINT_BLOCK_SIZE)).hexdigest()
+    return {"path": os.path.abspath(file_name), "size": stat.st_size, "mtime": stat.st_mtime_ns,
+            "hash": block_hash, "separator": cfg.column_separator, "quote": cfg.quote_char,
+            "encoding": cfg.file_encoding}
+
+
+class HeaderCache:
+    """This class caches the header and the column statistics of files on disk.
+
+    Every file has its own cache entry, a JSON file named after the hash of the file path.
+    An entry is only used if the fingerprint of the file still matches.
+    """
+
+    def __init__(self, cache_dir):
+        """Initializes a HeaderCache object.
+
+        Parameters
+        ----------
+        cache_dir : str
+            The directory to store the cache entries in
+        """
+        self.cache_dir = cache_dir
+
+    def get_entry_name(self, file_name):
+        """Returns the name of the cache entry of a file.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+
+        Returns
+        -------
+        str
+            The file name of the cache entry.
+        """
+        path_hash = hashlib.sha256(os.path.abspath(file_name).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, path_hash + ".json")
+
+    def read_entry(self, file_name, fingerprint):
+        """Reads the cache entry of a file.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+        fingerprint : dict
+            The current fingerprint of the file
+
+        Returns
+        -------
+        dict
+            The cache entry, or None if there is no valid entry for the current fingerprint.
+        """
+        try:
+            with open(self.get_entry_name(file_name), mode="r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("fingerprint") != fingerprint:
+            return None
+        return entry
+
+    def write_entry(self, file_name, entry):
+        """Writes the cache entry of a file.
+
+        The entry is written into a temporary file first and then renamed,
+        so that parallel workers never read a partially written entry.
+        Errors are ignored, as the cache is only an optimization.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+        entry : dict
+            The cache entry
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, mode="w", encoding="utf-8") as file:
+                json.dump(entry, file)
+            os.replace(temp_name, self.get_entry_name(file_name))
+        except OSError as err:
+            f.debug("Cannot write cache entry for file '{0}': {1}".format(file_name, err))
+
+    def get(self, file_name, sample_rows=None):
+        """Returns the cached header and, if requested, column statistics of a file.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+        sample_rows : int
+            The number of data rows the column statistics were collected from, None if no statistics are needed
+
+        Returns
+        -------
+        ([str,], [inference.ColumnStats,])
+            The raw header and the column statistics, or (None, None) if the file is not cached.
+            The column statistics are None if not requested.
+        """
+        entry = self.read_entry(file_name, get_file_fingerprint(file_name))
+        if entry is None:
+            return None, None
+        if sample_rows is None:
+            return entry["header"], None
+        stats = entry["stats"].get(str(sample_rows))
+        # Statistics cached by a version collecting fewer statistics have to be collected again
+        if stats is None or any(set(vars(ColumnStats())) - set(column_stats) for column_stats in stats):
+            return None, None
+        return entry["header"], [ColumnStats.from_dict(column_stats) for column_stats in stats]
+
+    def put(self, file_name, header, stats=None, sample_rows=None):
+        """Caches the header and, if given, the column statistics of a file.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+        header : [str,]
+            The raw header of the file
+        stats : [inference.ColumnStats,]
+            The column statistics
+        sample_rows : int
+            The number of data rows the column statistics were collected from
+        """
+        fingerprint = get_file_fingerprint(file_name)
+        entry = self.read_entry(file_name, fingerprint)
+        if entry is None or entry["header"] != header:
+            entry = {"fingerprint": fingerprint, "header": header, "stats": {}}
+        if stats is not None:
+            entry["stats"][str(sample_rows)] = [column_stats.to_dict() for column_stats in stats]
+        self.write_entry(file_name, entry)
+
+    def clear(self):
+        """Removes all cache entries.
+
+        Returns
+        -------
+        int
+            The number of removed cache entries.
+        """
+        removed = 0
+        for entry_name in glob.glob(os.path.join(self.cache_dir, "*.json")):
+            os.remove(entry_name)
+            removed += 1
+        return removed
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+#
+# Since: October, 2026
+# Author: gvenzl
+# Name: checkpoint.py
+# Description: Checkpoint journal to resume loads for csv2db
+#
+# Copyright 2026 Gerald Venzl
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import os
+
+import csv2db.functions as f
+
+
+class CheckpointJournal:
+    """This class records the progress of a load in a journal file.
+
+    The journal is a JSON lines file. A line is appended whenever a batch has been committed,
+    recording the number of data rows of the file read so far, and when a file has been loaded.
+    A file is identified by its path, size and modification time, so that the progress of a file
+    that has been changed in the meantime is not used.
+    """
+
+    def __init__(self, file_name, resume=False):
+        """Initializes a CheckpointJournal object.
+
+        Parameters
+        ----------
+        file_name : str
+            The journal file name
+        resume : bool
+            Whether to read the progress of a previous load from the journal and continue it,
+            otherwise the journal is started over
+        """
+        self.file_name = file_name
+        self.files = {}
+        if resume:
+            self.read()
+        self.file = open(file_name, mode="a" if resume else "w", encoding="utf-8")
+
+    def read(self):
+        """Reads the progress of a previous load from the journal."""
+        try:
+            with open(self.file_name, mode="r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    # The last line may be incomplete if the previous load has been killed
+                    except ValueError:
+                        continue
+                    self.files[entry["file"]] = entry
+        except FileNotFoundError:
+            pass
+
+    def get_entry(self, file_name):
+        """Returns the progress of a file, if the file has not changed since.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+
+        Returns
+        -------
+        dict
+            The last journal entry of the file, or None if there is none.
+        """
+        entry = self.files.get(os.path.abspath(file_name))
+        if entry is None or entry["id"] != get_file_id(file_name):
+            return None
+        return entry
+
+    def is_done(self, file_name):
+        """Returns whether a file has been loaded completely.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+
+        Returns
+        -------
+        bool
+            True if the file has been loaded, otherwise False.
+        """
+        entry = self.get_entry(file_name)
+        return entry is not None and entry["done"]
+
+    def get_rows(self, file_name):
+        """Returns the number of data rows of a file that have already been committed.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+
+        Returns
+        -------
+        int
+            The number of data rows read from the file up to the last committed batch.
+        """
+        entry = self.get_entry(file_name)
+        return entry["rows"] if entry is not None else 0
+
+    def record(self, file_name, rows=0, done=False):
+        """Records the progress of a file.
+
+        The entry is written through to disk, as it must not be lost once the batch has been committed.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+        rows : int
+            The number of data rows read from the file up to the last committed batch
+        done : bool
+            Whether the file has been loaded completely
+        """
+        entry = {"file": os.path.abspath(file_name), "id": get_file_id(file_name), "rows": rows, "done": done}
+        self.files[entry["file"]] = entry
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        """Close the journal file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def get_file_id(file_name):
+    """Returns the size and modification time of a file, identifying the version of the file.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    [int, int]
+        The size and modification time of the file.
+    """
+    # Members of an archive are identified by the archive
+    stat = os.stat(f.split_archive_member(file_name)[0])
+    return [stat.st_size, stat.st_mtime_ns]
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+#
+# Since: October, 2026
+# Author: gvenzl
+# Name: compression.py
+# Description: Decompression of compressed files and tar archives for csv2db
+#
+# Copyright 2026 Gerald Venzl
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import atexit
+import bz2
+import gzip
+import io
+import lzma
+import shutil
+import subprocess
+import tarfile
+import tempfile
+
+import csv2db.config as cfg
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def open_zstd(file_name):
+    """Opens a zstd compressed file via the zstandard package.
+
+    Parameters
+    ----------
+    file_name : str
+        The file to open
+
+    Returns
+    -------
+    file-object
+        A binary file object of the decompressed data
+
+    Raises
+    ------
+    ImportError
+        If the zstandard package is not installed
+    """
+    if zstandard is None:
+        raise ImportError("Reading .zst files requires either the 'zstd' command or the 'zstandard' package.")
+    return zstandard.ZstdDecompressor().stream_reader(open(file_name, mode="rb"), closefd=True)
+
+
+class Decompressor:
+    """This class describes how to decompress the files of one compression format.
+
+    The external commands are tried in order and the first one found is used,
+    as they decompress in a separate process and often with multiple threads.
+    Otherwise, the file is decompressed within the process via the Python module.
+    """
+
+    def __init__(self, open_function, commands):
+        """Initializes a Decompressor object.
+
+        Parameters
+        ----------
+        open_function : function
+            The function to open a file for reading the decompressed data as binary file object
+        commands : [[str,],]
+            The external commands writing the decompressed data of the file appended to them to stdout
+        """
+        self.open_function = open_function
+        self.commands = commands
+
+    def get_command(self):
+        """Returns the first external command that is installed.
+
+        Returns
+        -------
+        [str,]
+            The command, or None if no command is installed or external commands are disabled.
+        """
+        if cfg.decompressor == "python":
+            return None
+        for command in self.commands:
+            if shutil.which(command[0]) is not None:
+                return command
+        return None
+
+
+# File extension -> decompressor
+DECOMPRESSORS = {
+    ".gz": Decompressor(gzip.open, [["pigz", "-dc"]]),
+    ".bz2": Decompressor(bz2.open, [["lbzip2", "-dc"], ["pbzip2", "-dc"]]),
+    ".xz": Decompressor(lzma.open, [["xz", "-dc", "-T0"]]),
+    ".zst": Decompressor(open_zstd, [["zstd", "-dc", "-q"]]),
+}
+
+# Tar archive file extension -> extension of its compression
+TAR_EXTENSIONS = {
+    ".tar": None,
+    ".tar.gz": ".gz",
+    ".tgz": ".gz",
+    ".tar.bz2": ".bz2",
+    ".tbz2": ".bz2",
+    ".tar.xz": ".xz",
+    ".txz": ".xz",
+    ".tar.zst": ".zst",
+}
+
+
+class NamedStream(io.RawIOBase):
+    """This class reads the decompressed data of a file via a binary file object.
+
+    It gives the stream the name of the file, which is used to name the bad records file.
+    """
+
+    def __init__(self, name, stream, resources=()):
+        """Initializes a NamedStream object.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stream
+        stream : file-object
+            The binary file object to read from
+        resources : [object,]
+            Further objects to close once the stream is closed, i.e. the underlying file
+        """
+        super().__init__()
+        self.name = name
+        self.stream = stream
+        self.resources = resources
+
+    def readable(self):
+        """Returns whether the stream is readable."""
+        return True
+
+    def readinto(self, buffer):
+        """Reads bytes into a pre-allocated buffer.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            The buffer to read into
+
+        Returns
+        -------
+        int
+            The number of bytes read, 0 at the end of the stream.
+        """
+        return self.stream.readinto(buffer)
+
+    def close(self):
+        """Close the stream and the resources it reads from."""
+        if not self.closed:
+            self.stream.close()
+            for resource in self.resources:
+                resource.close()
+        super().close()
+
+
+class ProcessStream(io.RawIOBase):
+    """This class reads the decompressed data of a file from the stdout of an external command.
+
+    The stderr of the command is written into a temporary file, so that the command never blocks
+    on a full pipe, no matter how many warnings it writes.
+    """
+
+    def __init__(self, name, command):
+        """Initializes a ProcessStream object and starts the command.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stream
+        command : [str,]
+            The command to run
+        """
+        super().__init__()
+        self.name = name
+        self.command = command
+        self.stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                        stderr=self.stderr, bufsize=0)
+
+    def readable(self):
+        """Returns whether the stream is readable."""
+        return True
+
+    def readinto(self, buffer):
+        """Reads bytes into a pre-allocated buffer.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            The buffer to read into
+
+        Returns
+        -------
+        int
+            The number of bytes read, 0 at the end of the stream.
+
+        Raises
+        ------
+        OSError
+            If the command failed, i.e. because the file is corrupt
+        """
+        count = self.process.stdout.readinto(buffer)
+        if count == 0 and self.process.wait() != 0:
+            self.stderr.seek(0)
+            raise OSError("Command '{0}' failed with exit code {1}: {2}"
+                          .format(" ".join(self.command), self.process.returncode,
+                                  self.stderr.read().decode(errors="replace").strip()))
+        return count
+
+    def close(self):
+        """Close the stream, stopping the command if it is still running."""
+        if not self.closed:
+            # The file may not have been read to the end, i.e. when only reading the header
+            if self.process.poll() is None:
+                self.process.kill()
+            self.process.stdout.close()
+            self.process.wait()
+            self.stderr.close()
+        super().close()
+
+
+def get_compression(file_name):
+    """Returns the compression of a file, based on its file extension.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    str
+        The file extension of the compression, or None if the file is not compressed.
+    """
+    for extension, compression in TAR_EXTENSIONS.items():
+        if file_name.endswith(extension):
+            return compression
+    for extension in DECOMPRESSORS:
+        if file_name.endswith(extension):
+            return extension
+    return None
+
+
+def is_tar(file_name):
+    """Returns whether a file is a tar archive, based on its file extension.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    bool
+        True if the file is a tar archive, otherwise False.
+    """
+    return file_name.endswith(tuple(TAR_EXTENSIONS))
+
+
+def open_decompressed(file_name):
+    """Opens a file for reading its decompressed data.
+
+    Parameters
+    ----------
+    file_name : str
+        The file to open
+
+    Returns
+    -------
+    io.RawIOBase
+        A binary stream of the decompressed data, or of the file itself if it is not compressed.
+    """
+    compression = get_compression(file_name)
+    if compression is None:
+        return io.FileIO(file_name, mode="r")
+    decompressor = DECOMPRESSORS[compression]
+    command = decompressor.get_command()
+    if command is not None:
+        return ProcessStream(file_name, command + [file_name])
+    return NamedStream(file_name, decompressor.open_function(file_name))
+
+
+def open_tar(file_name):
+    """Opens a tar archive for reading its members sequentially.
+
+    Parameters
+    ----------
+    file_name : str
+        The tar archive to open
+
+    Returns
+    -------
+    (tarfile.TarFile, io.BufferedReader)
+        The tar archive in stream mode and the decompressed stream it reads from,
+        which has to be closed separately.
+    """
+    stream = io.BufferedReader(open_decompressed(file_name))
+    try:
+        return tarfile.open(fileobj=stream, mode="r|"), stream
+    except Exception:
+        stream.close()
+        raise
+
+
+def get_tar_members(file_name):
+    """Returns the names of all files within an uncompressed tar archive.
+
+    Only the headers of the members are read, the data of the members is skipped.
+    The members of compressed tar archives are listed while they are read, see iter_tar_members().
+
+    Parameters
+    ----------
+    file_name : str
+        The uncompressed tar archive
+
+    Returns
+    -------
+    ([str,], int)
+        The names of the files and the number of all members, including directories.
+    """
+    with tarfile.open(file_name, mode="r:") as tar_file:
+        members = tar_file.getmembers()
+    return [member.name for member in members if member.isfile()], len(members)
+
+
+def iter_tar_members(file_name):
+    """Yields the names of all files within a tar archive, reading the archive in a single pass.
+
+    The archive is kept open while the names are yielded, so that open_tar_member() opens
+    the file just yielded from the current position, instead of decompressing the archive again.
+    Files that are not opened are skipped.
+
+    Parameters
+    ----------
+    file_name : str
+        The tar archive
+
+    Returns
+    -------
+    iterator
+        The names of the files within the archive, in the order they are stored.
+    """
+    close_tar_reader()
+    tar_reader = cfg.tar_reader = TarReader(file_name)
+    try:
+        member_name = tar_reader.next_member()
+        # Stop if another archive has been opened in between
+        while member_name is not None and cfg.tar_reader is tar_reader:
+            yield member_name
+            member_name = tar_reader.next_member()
+    finally:
+        if cfg.tar_reader is tar_reader:
+            close_tar_reader()
+
+
+class TarReader:
+    """This class reads the members of a tar archive sequentially, in a single pass over the archive.
+
+    As tar archives have no index, every member can only be reached by reading the archive up to it.
+    Hence, the archive stays open after a member has been read, so that the next member is read
+    from where the previous one ended, instead of decompressing the archive again from the start.
+    """
+
+    def __init__(self, file_name):
+        """Initializes a TarReader object and opens the archive.
+
+        Parameters
+        ----------
+        file_name : str
+            The tar archive
+        """
+        self.file_name = file_name
+        self.tar_file, self.stream = open_tar(file_name)
+        # The file the archive has been advanced to by next_member(), but that has not been opened yet
+        self.member = None
+
+    def next_member(self):
+        """Advances to the next file of the archive, without opening it.
+
+        Returns
+        -------
+        str
+            The name of the file, or None at the end of the archive.
+        """
+        self.member = self.tar_file.next()
+        while self.member is not None and not self.member.isfile():
+            self.member = self.tar_file.next()
+        return self.member.name if self.member is not None else None
+
+    def open_member(self, member_name=None):
+        """Opens the next file of the archive with the given name.
+
+        Parameters
+        ----------
+        member_name : str
+            The name of the file within the archive, None to open the next file
+
+        Returns
+        -------
+        io.RawIOBase
+            A binary stream of the data of the file, or None if the file is not found after the current position.
+        """
+        # Iterating over the archive would start again with the members already read
+        member = self.member if self.member is not None else self.tar_file.next()
+        self.member = None
+        while member is not None:
+            if member.isfile() and member_name in (None, member.name):
+                # Name the stream like the members of ZIP archives
+                return NamedStream(member.name, self.tar_file.extractfile(member))
+            member = self.tar_file.next()
+        return None
+
+    def close(self):
+        """Close the archive."""
+        self.tar_file.close()
+        self.stream.close()
+
+
+def open_tar_member(file_name, member_name=None):
+    """Opens a file within a tar archive.
+
+    The archive is kept open, so that the members of an archive opened in order are read in a single pass.
+    The archive is only read again from the start if the file comes before the previously opened one.
+
+    Parameters
+    ----------
+    file_name : str
+        The tar archive
+    member_name : str
+        The name of the file within the archive, None to open the first file
+
+    Returns
+    -------
+    io.RawIOBase
+        A binary stream of the data of the file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the archive does not contain the file
+    """
+    if cfg.tar_reader is not None and cfg.tar_reader.file_name == file_name and member_name is not None:
+        stream = cfg.tar_reader.open_member(member_name)
+        if stream is not None:
+            return stream
+    close_tar_reader()
+    cfg.tar_reader = TarReader(file_name)
+    stream = cfg.tar_reader.open_member(member_name)
+    if stream is None:
+        close_tar_reader()
+        raise FileNotFoundError("No file '{0}' in archive: {1}".format(member_name, file_name))
+    return stream
+
+
+# Worker processes keep the archive open until they exit
+@atexit.register
+def close_tar_reader():
+    """Close the tar archive whose members are currently read, if any."""
+    if cfg.tar_reader is not None:
+        cfg.tar_reader.close()
+        cfg.tar_reader = None
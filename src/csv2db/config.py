@@ -25,11 +25,30 @@ version = "1.6.1"
 verbose = False
 debug = False
 direct_path = False
+bulk_load = False
 batch_size = 10000
+batch_tuner = None
+batch_bytes = 0
+pipeline_depth = 0
+async_connections = 0
+async_loop = None
+async_conns = []
 conn = None
+db_connection_details = {}
+parallel = 1
+chunk_size = 0
+cache_dir = None
+checkpoint = None
+manifest = None
+current_file = None
+rows_read = 0
 table_name = ""
+table_metadata = None
+convert_types = False
+date_format = None
+timestamp_format = None
 column_type = "varchar(1000)"
-input_data = []
+input_data = None
 db_type = None
 column_separator = ""
 quote_char = ""
@@ -39,5 +58,10 @@ ignore_errors = False
 log_bad_records = False
 bad_records_logger = None
 file_encoding = "utf-8"
+zip_members = None
+tar_reader = None
+decompressor = "auto"
+reader = "csv"
+mmap = False
 case_insensitive_identifiers = False
 quote_identifiers = False
@@ -44,8 +44,25 @@ class TerminalColor(Enum):
     RESET = "\x1b[0m"
 
 
+class DataType(Enum):
+    """Column data type enumeration, used for the type inference of generate."""
+    BOOLEAN = "boolean"
+    INTEGER = "integer"
+    BIGINT = "bigint"
+    DECIMAL = "decimal"
+    DATE = "date"
+    TIMESTAMP = "timestamp"
+    VARCHAR = "varchar"
+    CLOB = "clob"
+
+
 class DBConfigKeys(str, Enum):
     IDENTIFIER_QUOTE = "identifier_quote"
+    DATA_TYPES = "data_types"
+    MAX_DECIMAL_PRECISION = "max_decimal_precision"
+    MAX_TIMESTAMP_PRECISION = "max_timestamp_precision"
+    MAX_VARCHAR_LENGTH = "max_varchar_length"
+    TIMESTAMP_SEPARATORS = "timestamp_separators"
 
 
 DBConfig = {
@@ -55,5 +72,89 @@ DBConfig = {
         DBType.POSTGRES:  '"',
         DBType.SQLSERVER: '"',
         DBType.DB2:       '"'
+    },
+    # The column data types, {length} is the length in characters, {bytes} the length in UTF-8 bytes.
+    # None if the database has no data type that the values can be loaded into as they are.
+    DBConfigKeys.DATA_TYPES: {
+        DBType.MYSQL: {
+            DataType.BOOLEAN:   None,
+            DataType.INTEGER:   "INT",
+            DataType.BIGINT:    "BIGINT",
+            DataType.DECIMAL:   "DECIMAL({precision},{scale})",
+            DataType.DATE:      "DATE",
+            DataType.TIMESTAMP: "DATETIME({precision})",
+            DataType.VARCHAR:   "VARCHAR({length})",
+            DataType.CLOB:      "LONGTEXT"
+        },
+        DBType.ORACLE: {
+            DataType.BOOLEAN:   None,
+            DataType.INTEGER:   "NUMBER(10)",
+            DataType.BIGINT:    "NUMBER(19)",
+            DataType.DECIMAL:   "NUMBER({precision},{scale})",
+            # The default NLS date and timestamp formats reject ISO 8601 values
+            DataType.DATE:      None,
+            DataType.TIMESTAMP: None,
+            DataType.VARCHAR:   "VARCHAR2({bytes})",
+            DataType.CLOB:      "CLOB"
+        },
+        DBType.POSTGRES: {
+            DataType.BOOLEAN:   "BOOLEAN",
+            DataType.INTEGER:   "INTEGER",
+            DataType.BIGINT:    "BIGINT",
+            DataType.DECIMAL:   "NUMERIC({precision},{scale})",
+            DataType.DATE:      "DATE",
+            DataType.TIMESTAMP: "TIMESTAMP({precision})",
+            DataType.VARCHAR:   "VARCHAR({length})",
+            DataType.CLOB:      "TEXT"
+        },
+        DBType.SQLSERVER: {
+            DataType.BOOLEAN:   "BIT",
+            DataType.INTEGER:   "INT",
+            DataType.BIGINT:    "BIGINT",
+            DataType.DECIMAL:   "DECIMAL({precision},{scale})",
+            DataType.DATE:      "DATE",
+            DataType.TIMESTAMP: "DATETIME2({precision})",
+            DataType.VARCHAR:   "VARCHAR({bytes})",
+            DataType.CLOB:      "VARCHAR(MAX)"
+        },
+        DBType.DB2: {
+            DataType.BOOLEAN:   "BOOLEAN",
+            DataType.INTEGER:   "INTEGER",
+            DataType.BIGINT:    "BIGINT",
+            DataType.DECIMAL:   "DECIMAL({precision},{scale})",
+            DataType.DATE:      "DATE",
+            DataType.TIMESTAMP: "TIMESTAMP({precision})",
+            DataType.VARCHAR:   "VARCHAR({bytes})",
+            DataType.CLOB:      "CLOB"
+        }
+    },
+    DBConfigKeys.MAX_DECIMAL_PRECISION: {
+        DBType.MYSQL:     65,
+        DBType.ORACLE:    38,
+        DBType.POSTGRES:  1000,
+        DBType.SQLSERVER: 38,
+        DBType.DB2:       31
+    },
+    DBConfigKeys.MAX_TIMESTAMP_PRECISION: {
+        DBType.MYSQL:     6,
+        DBType.ORACLE:    9,
+        DBType.POSTGRES:  6,
+        DBType.SQLSERVER: 7,
+        DBType.DB2:       12
+    },
+    DBConfigKeys.MAX_VARCHAR_LENGTH: {
+        DBType.MYSQL:     16383,
+        DBType.ORACLE:    4000,
+        DBType.POSTGRES:  10485760,
+        DBType.SQLSERVER: 8000,
+        DBType.DB2:       32672
+    },
+    # The separators between date and time of ISO 8601 timestamps that the database accepts
+    DBConfigKeys.TIMESTAMP_SEPARATORS: {
+        DBType.MYSQL:     " T",
+        DBType.ORACLE:    "",
+        DBType.POSTGRES:  " T",
+        DBType.SQLSERVER: " T",
+        DBType.DB2:       " "
     }
 }
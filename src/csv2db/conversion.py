@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+#
+# Since: October, 2026
+# Author: gvenzl
+# Name: conversion.py
+# Description: Conversion of the values to load into the data types of the table columns for csv2db
+#
+# Copyright 2026 Gerald Venzl
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import datetime
+import decimal
+import re
+
+import csv2db.config as cfg
+from csv2db.constants import DBType
+
+INTEGER_TYPES = {"int", "integer", "bigint", "smallint", "tinyint", "mediumint", "int2", "int4", "int8"}
+DECIMAL_TYPES = {"decimal", "numeric", "number", "money", "smallmoney", "decfloat"}
+FLOAT_TYPES = {"float", "double", "double precision", "real", "binary_float", "binary_double"}
+TIMESTAMP_TYPES = {"timestamp", "timestamp without time zone", "datetime", "datetime2", "smalldatetime"}
+# Matches the length, precision or scale of a data type, i.e. "(6)" of "TIMESTAMP(6)"
+TYPE_MODIFIER_PATTERN = re.compile(r"\(.*?\)")
+# ISO 8601 timestamps with any number of fractional digits, i.e. "2024-01-31 12:30:00.5"
+ISO_TIMESTAMP_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}(?::\d{2})?)(?:\.(\d{1,9}))?$")
+
+# The errors of invalid values, leaving them to the database to reject
+CONVERSION_ERRORS = (ValueError, TypeError, ArithmeticError)
+
+
+def to_int(value):
+    """Converts a value into an integer, an empty value into None."""
+    return int(value) if value != "" else None
+
+
+def to_decimal(value):
+    """Converts a value into a decimal, an empty value into None."""
+    return decimal.Decimal(value) if value != "" else None
+
+
+def to_float(value):
+    """Converts a value into a float, an empty value into None."""
+    return float(value) if value != "" else None
+
+
+def to_date(value):
+    """Converts a value into a date, using the date format if set, an empty value into None."""
+    if value == "":
+        return None
+    if cfg.date_format is None:
+        return datetime.date.fromisoformat(value)
+    return datetime.datetime.strptime(value, cfg.date_format).date()
+
+
+def to_datetime(value):
+    """Converts a value into a timestamp, using the timestamp format if set, an empty value into None."""
+    if value == "":
+        return None
+    if cfg.timestamp_format is None:
+        return parse_iso_timestamp(value)
+    return datetime.datetime.strptime(value, cfg.timestamp_format)
+
+
+def parse_iso_timestamp(value):
+    """Parses an ISO 8601 timestamp.
+
+    Before Python 3.11, datetime.fromisoformat() only accepts 3 or 6 fractional digits,
+    hence the fraction is padded or truncated to 6 digits first.
+
+    Parameters
+    ----------
+    value : str
+        The timestamp to parse
+
+    Returns
+    -------
+    datetime.datetime
+        The timestamp.
+
+    Raises
+    ------
+    ValueError
+        If the value is not an ISO 8601 timestamp
+    """
+    match = ISO_TIMESTAMP_PATTERN.match(value)
+    if match is None:
+        return datetime.datetime.fromisoformat(value)
+    date, time, fraction = match.groups()
+    if fraction is not None:
+        time += "." + (fraction + "00000")[:6]
+    return datetime.datetime.fromisoformat(date + "T" + time)
+
+
+def to_oracle_date(value):
+    """Converts a value into a timestamp for an Oracle DATE column, which also holds the time.
+
+    Values in the date format, if set, are converted as well as values in the timestamp format.
+    """
+    if value == "" or cfg.date_format is None:
+        return to_datetime(value)
+    try:
+        return datetime.datetime.strptime(value, cfg.date_format)
+    except ValueError:
+        return to_datetime(value)
+
+
+def get_converter(db_type, data_type, scale):
+    """Returns the function converting the values of a column into the data type of the column.
+
+    Parameters
+    ----------
+    db_type : constants.DBType
+        The database type
+    data_type : str
+        The data type of the column as stored in the data dictionary
+    scale : int
+        The scale of numeric columns, None if not defined
+
+    Returns
+    -------
+    function
+        The conversion function, or None if the values are loaded as strings.
+    """
+    data_type = TYPE_MODIFIER_PATTERN.sub("", data_type.lower()).strip()
+    if data_type in INTEGER_TYPES or (data_type in DECIMAL_TYPES and scale == 0):
+        return to_int
+    elif data_type in DECIMAL_TYPES:
+        return to_decimal
+    elif data_type in FLOAT_TYPES:
+        return to_float
+    elif data_type == "date":
+        return to_oracle_date if db_type is DBType.ORACLE else to_date
+    elif data_type in TIMESTAMP_TYPES:
+        return to_datetime
+    return None
+
+
+def get_converters(db_type, columns):
+    """Returns the conversion functions of the columns to load the data into.
+
+    Parameters
+    ----------
+    db_type : constants.DBType
+        The database type
+    columns : [metadata.TableColumn,]
+        The table columns to load the data into
+
+    Returns
+    -------
+    [function,]
+        The conversion function of each column, None for the columns loaded as strings.
+    """
+    return [get_converter(db_type, column.data_type, column.scale) for column in columns]
+
+
+def convert_column(converter, values):
+    """Converts all values of a column.
+
+    Parameters
+    ----------
+    converter : function
+        The conversion function
+    values : (str,)
+        The values to convert
+
+    Returns
+    -------
+    [object,]
+        The converted values. Invalid values are left unconverted, so that the database rejects them.
+    """
+    try:
+        return list(map(converter, values))
+    except CONVERSION_ERRORS:
+        return [convert_value(converter, value) for value in values]
+
+
+def convert_value(converter, value):
+    """Converts a single value, leaving invalid values unconverted.
+
+    Parameters
+    ----------
+    converter : function
+        The conversion function
+    value : str
+        The value to convert
+
+    Returns
+    -------
+    object
+        The converted value, or the value itself if it is invalid.
+    """
+    try:
+        return converter(value)
+    except CONVERSION_ERRORS:
+        return value
+
+
+def convert_records(converters, records):
+    """Converts the values of a batch of records, column by column.
+
+    Parameters
+    ----------
+    converters : [function,]
+        The conversion function of each column, None for the columns loaded as strings
+    records : [(str,),]
+        The records to convert
+
+    Returns
+    -------
+    [tuple,]
+        The converted records.
+    """
+    if not records or all(converter is None for converter in converters):
+        return records
+    # Records with a different number of values than columns are left to the database to reject
+    if any(length != len(converters) for length in map(len, records)):
+        return [tuple(convert_value(converter, value) if converter is not None else value
+                      for converter, value in zip(converters, record))
+                if len(record) == len(converters) else record
+                for record in records]
+    columns = list(zip(*records))
+    for idx, converter in enumerate(converters):
+        if converter is not None:
+            columns[idx] = convert_column(converter, columns[idx])
+    return list(zip(*columns))
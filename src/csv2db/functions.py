@@ -20,31 +20,55 @@
 # limitations under the License.
 #
 
+import codecs
 import datetime
+import fnmatch
 import glob
-import gzip
 import os
 import platform
+import stat
 import io
+import itertools
+import mmap
+import tarfile
 import zipfile
 import sys
 import traceback
 import csv
 
+import csv2db.compression as compression
 import csv2db.config as cfg
 import csv2db.constants as cons
+import csv2db.readers as readers
 from csv2db.constants import DBType, TerminalColor
 
+# The file name to read from stdin
+STDIN = "-"
+# The extensions of CSV files within directories, uncompressed, compressed or archived
+CSV_FILE_EXTENSIONS = tuple(".csv" + extension for extension in
+                            ["", ".zip"] + list(compression.DECOMPRESSORS) + list(compression.TAR_EXTENSIONS))
+# The extension of the files the bad records of a file are logged in
+BAD_FILE_EXTENSION = ".bad"
+# The pattern of CSV files within archives, which are read as they are
+CSV_MEMBER_PATTERN = "*.csv"
+# The number of bytes of a memory mapped file decoded at once, small enough to stay in the CPU cache
+MMAP_BLOCK_SIZE = 64 * 1024
+# The size from which reading all rows of a file outweighs starting a worker process to scan it
+PARALLEL_SCAN_MIN_SIZE = 64 * 1024 * 1024
+
 
 def open_file(file):
     """Opens a CSV file.
 
-    The file can either be in plain text (.csv), zipped (.csv.zip), or gzipped (.csv.gz)
+    The file can either be in plain text (.csv), zipped (.csv.zip), or compressed with gzip (.csv.gz),
+    bzip2 (.csv.bz2), xz (.csv.xz) or zstd (.csv.zst), see open_stream().
+    The file is read as a stream, it is never rewound, so that it can also be stdin or a named pipe.
+    Plain text files are read via a memory map instead, if enabled.
 
     Parameters
     ----------
     file : str
-        The file to open
+        The file to open, "-" for stdin
 
     Returns
     -------
@@ -56,24 +80,427 @@ def open_file(file):
     UnicodeDecodeError
         If the file cannot be read in UTF-8 or the encoding provided
     """
-    return_file = None
+    if cfg.mmap and cfg.reader == "csv" and is_splittable(file) and os.path.getsize(file) > 0:
+        return MmapFile(file)
+    stream = open_stream(file)
+    # Test whether the first buffered block of the file can be decoded,
+    # so that the file doesn't have to be rewound or decompressed twice
+    # If not, this will throw UnicodeDecodeError
+    try:
+        codecs.getincrementaldecoder(cfg.file_encoding)().decode(stream.peek())
+    except UnicodeDecodeError:
+        stream.close()
+        raise
+    return io.TextIOWrapper(stream, encoding=cfg.file_encoding)
+
 
-    if file.endswith(".zip"):
-        zip_file = zipfile.ZipFile(file, mode="r")
-        zfile = zip_file.open(zip_file.infolist()[0], mode="r")
-        return_file = io.TextIOWrapper(zfile, encoding=cfg.file_encoding)
-    elif file.endswith(".gz"):
-        return_file = gzip.open(file, mode="rt", encoding=cfg.file_encoding)
+def open_stream(file):
+    """Opens the binary stream of a CSV file.
+
+    Compressed files are decompressed by an external command, if installed,
+    otherwise by the Python module of the compression.
+    A member of a ZIP or tar archive is opened via its name "<archive>/<member>",
+    otherwise the first member of the archive is opened.
+
+    Parameters
+    ----------
+    file : str
+        The file to open, "-" for stdin
+
+    Returns
+    -------
+    io.BufferedIOBase
+        A buffered binary stream of the data of the file, supporting peek().
+    """
+    if file == STDIN:
+        return io.BufferedReader(compression.NamedStream("stdin", io.FileIO(sys.stdin.fileno(), mode="r",
+                                                                             closefd=False)))
+    archive, member = split_archive_member(file)
+    if archive.endswith(".zip"):
+        zip_file = zipfile.ZipFile(archive, mode="r")
+        return zip_file.open(member if member is not None else zip_file.infolist()[0], mode="r")
+    elif compression.is_tar(archive):
+        return io.BufferedReader(compression.open_tar_member(archive, member))
     else:
-        return_file = open(file, mode='r', encoding=cfg.file_encoding)
+        return io.BufferedReader(compression.open_decompressed(file))
 
-    # Test whether file can be read
-    # If not, this will throw UnicodeDecodeError
-    return_file.read(1)
-    # Reset file position to the beginning of the file
-    return_file.seek(0, 0)
 
-    return return_file
+def is_stream(file_name):
+    """Returns whether a file is stdin or a named pipe, which can only be read once.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    bool
+        True if the file is stdin or a named pipe, otherwise False.
+    """
+    if file_name == STDIN:
+        return True
+    try:
+        return stat.S_ISFIFO(os.stat(split_archive_member(file_name)[0]).st_mode)
+    except OSError:
+        return False
+
+
+def is_archive(file_name):
+    """Returns whether a file is a ZIP or tar archive, based on its file extension.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    bool
+        True if the file is an archive, otherwise False.
+    """
+    return file_name.endswith(".zip") or compression.is_tar(file_name)
+
+
+def split_archive_member(file_name):
+    """Splits the name of an archive member into the archive and the member name.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name, either a file or a member of a ZIP or tar archive named "<archive>/<member>"
+
+    Returns
+    -------
+    (str, str)
+        The archive file name and the member name, or the file name and None if it is not an archive member.
+    """
+    if os.path.exists(file_name):
+        return file_name, None
+    idx = file_name.find("/")
+    while idx != -1:
+        if is_archive(file_name[:idx]) and os.path.isfile(file_name[:idx]):
+            return file_name[:idx], file_name[idx + 1:]
+        idx = file_name.find("/", idx + 1)
+    return file_name, None
+
+
+def get_archive_members(file_name):
+    """Returns the file names of all members of a ZIP or tar archive to load.
+
+    Every member is named "<archive>/<member>", so that it can be opened and loaded on its own.
+    Only the members matching the archive member pattern are loaded, by default the CSV files.
+    Archives with only one member keep their name, unless it doesn't match a given pattern.
+    Directories and macOS resource forks are skipped.
+    Compressed tar archives are not listed here, as that would decompress them entirely,
+    their members are listed while they are read instead, see compression.iter_tar_members().
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    [str,]
+        The file names of the archive members, or the file name itself if it is not an archive.
+    """
+    try:
+        if file_name.endswith(".zip"):
+            with zipfile.ZipFile(file_name, mode="r") as zip_file:
+                infolist = zip_file.infolist()
+            members = [info.filename for info in infolist if not info.is_dir()]
+            total = len(infolist)
+        elif compression.is_tar(file_name) and not is_compressed_tar(file_name):
+            members, total = compression.get_tar_members(file_name)
+        else:
+            return [file_name]
+    # Leave the error reporting of invalid archives to opening the file
+    except (zipfile.BadZipFile, tarfile.TarError, OSError, ImportError):
+        return [file_name]
+    members = [member for member in members if not member.startswith("__MACOSX/")]
+    matching = [member for member in members if is_member_to_load(member)]
+    # The only member of an archive is loaded whatever its name, as before archive members were supported
+    if total == 1 and len(members) == 1 and (matching or cfg.zip_members is None):
+        return [file_name]
+    return [file_name + "/" + member for member in matching]
+
+
+def is_member_to_load(member_name):
+    """Returns whether a member of an archive is to be loaded.
+
+    Parameters
+    ----------
+    member_name : str
+        The name of the file within the archive
+
+    Returns
+    -------
+    bool
+        True if the member matches the archive member pattern and is not a macOS resource fork, otherwise False.
+    """
+    return (not member_name.startswith("__MACOSX/")
+            and fnmatch.fnmatch(member_name, cfg.zip_members if cfg.zip_members is not None else CSV_MEMBER_PATTERN))
+
+
+def is_compressed_tar(file_name):
+    """Returns whether a file is a compressed tar archive itself, not a member of it.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    bool
+        True if the file is a compressed tar archive, otherwise False.
+    """
+    return (compression.is_tar(file_name) and compression.get_compression(file_name) is not None
+            and os.path.isfile(file_name))
+
+
+class FileRange(io.RawIOBase):
+    """This class provides a read-only raw stream over a byte range of a file."""
+
+    def __init__(self, file_name, start, end, name):
+        """Initializes a FileRange object.
+
+        Parameters
+        ----------
+        file_name : str
+            The file to read from
+        start : int
+            The byte offset to start reading from
+        end : int
+            The byte offset to stop reading at (exclusive)
+        name : str
+            The name of the file range
+        """
+        self.name = name
+        self._file = open(file_name, mode="rb", buffering=0)
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        """Returns whether the stream is readable."""
+        return True
+
+    def readinto(self, buffer):
+        """Reads bytes up to the end of the range into a pre-allocated buffer.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            The buffer to read into
+
+        Returns
+        -------
+        int
+            The number of bytes read, 0 at the end of the range.
+        """
+        if self._remaining <= 0:
+            return 0
+        read = self._file.readinto(memoryview(buffer)[:self._remaining])
+        self._remaining -= read
+        return read
+
+    def close(self):
+        """Close file."""
+        self._file.close()
+        super().close()
+
+
+class MmapFile:
+    """This class reads the lines of a plain text file, or a byte range of it, via a memory map.
+
+    The mapped data is decoded block by block, each block ending at a new line, only when the lines are iterated.
+    Read system calls and the copying into a read buffer are avoided,
+    and parallel workers reading chunks of the same file share the pages of the file.
+    New lines are translated like in text mode, so that the lines are the same as read via open().
+    """
+
+    def __init__(self, file_name, start=0, end=None, name=None):
+        """Initializes a MmapFile object.
+
+        Parameters
+        ----------
+        file_name : str
+            The file to map, must not be empty
+        start : int
+            The byte offset to start reading from, must be at a record boundary
+        end : int
+            The byte offset to stop reading at (exclusive), must be at a record boundary, None for the end of the file
+        name : str
+            The name of the file, by default the file name
+
+        Raises
+        ------
+        UnicodeDecodeError
+            If the first block cannot be read in UTF-8 or the encoding provided
+        """
+        self.name = name if name is not None else file_name
+        self._file = open(file_name, mode="rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        if hasattr(self._mmap, "madvise"):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+        self._start = start
+        self._end = end if end is not None else len(self._mmap)
+        # Test whether the file can be read, if not, this will throw UnicodeDecodeError
+        try:
+            codecs.getincrementaldecoder(cfg.file_encoding)().decode(
+                self._mmap[start:min(start + io.DEFAULT_BUFFER_SIZE, self._end)])
+        except UnicodeDecodeError:
+            self.close()
+            raise
+
+    def read_blocks(self):
+        """Reads the decoded blocks of the file.
+
+        Returns
+        -------
+        iterator
+            The decoded blocks, each ending at a new line, except for the last one.
+        """
+        decoder = codecs.getincrementaldecoder(cfg.file_encoding)()
+        start = self._start
+        while start < self._end:
+            stop = min(start + MMAP_BLOCK_SIZE, self._end)
+            newline = self._mmap.find(b"\n", stop, self._end)
+            stop = newline + 1 if newline != -1 else self._end
+            yield decoder.decode(self._mmap[start:stop], final=stop == self._end)
+            start = stop
+
+    def __iter__(self):
+        """Iterates over the lines of the file."""
+        return itertools.chain.from_iterable(io.StringIO(block, newline=None) for block in self.read_blocks())
+
+    def close(self):
+        """Close the memory map and the file."""
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        """Create context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, trace_back):
+        """Destroy context manager."""
+        self.close()
+
+
+def open_file_range(file_name, part, start, end):
+    """Opens a byte range of a plain text CSV file.
+
+    Parameters
+    ----------
+    file_name : str
+        The file to open
+    part : int
+        The number of the file part, used to name the file range
+    start : int
+        The byte offset at which the range starts, must be at a record boundary
+    end : int
+        The byte offset at which the range ends (exclusive), must be at a record boundary
+
+    Returns
+    -------
+    file-object
+        A file object
+    """
+    if cfg.mmap and cfg.reader == "csv":
+        return MmapFile(file_name, start, end, "{0}.part{1}".format(file_name, part))
+    file_range = FileRange(file_name, start, end, "{0}.part{1}".format(file_name, part))
+    return io.TextIOWrapper(io.BufferedReader(file_range), encoding=cfg.file_encoding)
+
+
+def is_splittable(file_name):
+    """Returns whether a file can be split into byte ranges at record boundaries.
+
+    Only uncompressed regular files in an encoding that represents the new line
+    and the quote character as single bytes can be split.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    bool
+        True if the file can be split, otherwise False.
+    """
+    if (is_archive(file_name) or compression.get_compression(file_name) is not None
+            or not os.path.isfile(file_name)):
+        return False
+    try:
+        return ("\n".encode(cfg.file_encoding) == b"\n"
+                and len(cfg.quote_char.encode(cfg.file_encoding)) <= 1)
+    except LookupError:
+        return False
+
+
+def split_file(file_name, chunk_size):
+    """Splits a plain text CSV file into byte ranges at record boundaries.
+
+    A new line is only considered a record boundary if it is not within a quoted field,
+    i.e. if an even number of quote characters precedes it.
+    The first record (the header) is not part of any byte range.
+
+    Parameters
+    ----------
+    file_name : str
+        The file to split
+    chunk_size : int
+        The approximate size of a byte range in bytes
+
+    Returns
+    -------
+    [(int, int),]
+        A list of (start, end) byte offsets, end being exclusive.
+    """
+    quote = cfg.quote_char.encode(cfg.file_encoding)
+    block_size = 1024 * 1024
+    boundaries = []
+    # Search for the first boundary right away, which is the end of the header
+    target = 0
+    quotes = 0
+    offset = 0
+    with open(file_name, mode="rb") as file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            pos = max(target - offset, 0)
+            # The quote characters are counted up to here, carrying the count forward as the scan advances
+            counted = 0
+            while pos < len(block):
+                new_line = block.find(b"\n", pos)
+                if new_line == -1:
+                    break
+                if quote:
+                    quotes += block.count(quote, counted, new_line)
+                    counted = new_line
+                    if quotes % 2 != 0:
+                        pos = new_line + 1
+                        continue
+                boundaries.append(offset + new_line + 1)
+                target = boundaries[-1] + chunk_size
+                pos = target - offset
+            if quote:
+                quotes += block.count(quote, counted)
+            offset += len(block)
+
+    if not boundaries:
+        return []
+    # The end of the file is the end of the last range
+    if boundaries[-1] < offset:
+        boundaries.append(offset)
+    return list(zip(boundaries[:-1], boundaries[1:]))
 
 
 def read_header(reader):
@@ -86,13 +513,29 @@ def read_header(reader):
     reader : _csv.reader
         The CSV Reader object to read the header from
 
+    Returns
+    -------
+    [str,]
+        A list with all the column names.
+    """
+    return parse_header(next(reader))
+
+
+def parse_header(row):
+    """Parses the header row and returns the column list.
+
+    Parameters
+    ----------
+    row : [str,]
+        The header row as read from the CSV file
+
     Returns
     -------
     [str,]
         A list with all the column names.
     """
     header = []
-    for idx, col in enumerate(next(reader), start=1):
+    for idx, col in enumerate(row, start=1):
         # Bug #56: if a file contains an emtpy column name (i.e id,,name,date,...), raise an error
         if col == "":
             raise NameError("The header column name is empty for column at position {0}.".format(idx))
@@ -113,10 +556,33 @@ def find_all_files(pattern):
     []
         List of files.
     """
+    if pattern == STDIN:
+        return [pattern]
     if os.path.isdir(pattern):
         # If path is directory find all CSV files, compressed or uncompressed
-        pattern += "/*.csv*"
-    return sorted(glob.glob(pattern))
+        file_names = [file_name for file_name in glob.glob(os.path.join(pattern, "*")) if is_csv_file(file_name)]
+    else:
+        file_names = glob.glob(pattern)
+    all_files = []
+    for file_name in sorted(file_names):
+        all_files.extend(get_archive_members(file_name))
+    return all_files
+
+
+def is_csv_file(file_name):
+    """Returns whether a file is a CSV file to load from a directory, based on its file extension.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name
+
+    Returns
+    -------
+    bool
+        True if the file is an uncompressed, compressed or archived CSV file, otherwise False.
+    """
+    return file_name.endswith(CSV_FILE_EXTENSIONS) and not os.path.isdir(file_name)
 
 
 def print_color(color, output):
@@ -194,6 +660,35 @@ def get_exception_details():
     return "{0}: {1}".format(exception_type.__name__, exception_message), traceback_str
 
 
+def get_config():
+    """Returns a snapshot of the global configuration.
+
+    The snapshot excludes the database connections and all per file load state,
+    so that it can be handed over to worker processes.
+
+    Returns
+    -------
+    dict
+        The global configuration settings by name.
+    """
+    return {key: value for key, value in vars(cfg).items()
+            if not key.startswith("_")
+            and key not in ("conn", "async_loop", "async_conns", "input_data", "bad_records_logger", "checkpoint",
+                            "manifest", "tar_reader")}
+
+
+def set_config(config):
+    """Sets the global configuration from a snapshot.
+
+    Parameters
+    ----------
+    config : dict
+        The global configuration settings by name, as returned by get_config()
+    """
+    for key, value in config.items():
+        setattr(cfg, key, value)
+
+
 def get_db_connection(db_type, user, password, host, port, db_name):
     """ Connects to the database.
 
@@ -238,7 +733,8 @@ def get_db_connection(db_type, user, password, host, port, db_name):
                                        password=password,
                                        host=host,
                                        port=int(port),
-                                       database=db_name)
+                                       database=db_name,
+                                       allow_local_infile=cfg.bulk_load)
         elif db_type is DBType.POSTGRES:
             import psycopg
             conn = psycopg.connect("""user='{0}' 
@@ -274,6 +770,81 @@ def get_db_connection(db_type, user, password, host, port, db_name):
         raise ConnectionError("Database driver module is not installed: {0}. Please install it first.".format(str(err)))
 
 
+def is_connection_error(exception):
+    """Returns whether a database error means that the connection has been lost.
+
+    The PEP 249 drivers raise an OperationalError or InterfaceError if the connection is lost,
+    python-oracledb additionally flags the errors of dead sessions.
+
+    Parameters
+    ----------
+    exception : Exception
+        The error raised by the database driver
+
+    Returns
+    -------
+    bool
+        True if the connection should be opened again, otherwise False.
+    """
+    error = exception.args[0] if exception.args else None
+    if getattr(error, "is_session_dead", False):
+        return True
+    return type(exception).__name__ in ("OperationalError", "InterfaceError")
+
+
+async def get_async_db_connection(db_type, user, password, host, port, db_name):
+    """ Connects to the database asynchronously.
+
+    Parameters
+    ----------
+    db_type : constants.DBType
+        The database type
+    user : str
+        The database user
+    password : str
+        The database user password
+    host : str
+        The database host or ip address
+    port : str
+        The port to connect to
+    db_name : str
+        The database or service name
+
+    Returns
+    -------
+    conn
+        An asynchronous database connection
+
+    Raises
+    ------
+    ValueError
+        If the database type is not supported for asynchronous connections
+    ConnectionError
+        If the database driver is not found/installed
+    """
+
+    # Autocommit is off by default for asynchronous connections of all supported database types
+    try:
+        if db_type is DBType.ORACLE:
+            import oracledb
+            return await oracledb.connect_async(user=user,
+                                                password=password,
+                                                dsn=host + ":" + port + "/" + db_name)
+        elif db_type is DBType.POSTGRES:
+            import psycopg
+            return await psycopg.AsyncConnection.connect("""user='{0}' 
+                                                            password='{1}' 
+                                                            host='{2}' 
+                                                            port='{3}' 
+                                                            dbname='{4}'""".format(user, password, host, port, db_name)
+                                                         )
+        else:
+            raise ValueError("Database type '{0}' is not supported for asynchronous loading.".format(db_type))
+
+    except ModuleNotFoundError as err:
+        raise ConnectionError("Database driver module is not installed: {0}. Please install it first.".format(str(err)))
+
+
 def get_default_db_port(db_type):
     """Returns the default port for a database.
 
@@ -310,8 +881,10 @@ def get_csv_reader(file):
     Returns
     -------
     object
-        The csv reader object
+        The csv reader object, or the pyarrow reader if selected
     """
+    if cfg.reader == "arrow":
+        return readers.ArrowReader(file)
     return csv.reader(file, delimiter=cfg.column_separator, quotechar=cfg.quote_char)
 
 
@@ -343,6 +916,256 @@ def truncate_table(db_type, conn, table_name):
         conn.commit()
 
 
+def split_table_name(table_name):
+    """Splits a table name into the schema and table name, as stored in the data dictionary.
+
+    Parameters
+    ----------
+    table_name : str
+        The table name, optionally qualified by the schema name
+
+    Returns
+    -------
+    (str, str)
+        The schema name, None if the table name is not qualified, and the table name.
+    """
+    quote = get_identifier_quote(cfg.db_type)
+    names = []
+    for name in table_name.split(".", 1):
+        if name.startswith(quote) and name.endswith(quote):
+            names.append(name.strip(quote))
+        # Unquoted identifiers are stored in upper case in Oracle and Db2 and in lower case in Postgres
+        elif cfg.db_type in (DBType.ORACLE, DBType.DB2):
+            names.append(name.upper())
+        elif cfg.db_type is DBType.POSTGRES:
+            names.append(name.lower())
+        else:
+            names.append(name)
+    return (None, names[0]) if len(names) == 1 else (names[0], names[1])
+
+
+def parse_size(size):
+    """Parses a size in bytes with an optional K, M or G suffix.
+
+    Parameters
+    ----------
+    size : str
+        The size, e.g. "1024", "64K", "256M" or "1G"
+
+    Returns
+    -------
+    int
+        The size in bytes.
+
+    Raises
+    ------
+    ValueError
+        If the size is not a valid size
+    """
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    size = size.strip().upper()
+    if size.endswith("B"):
+        size = size[:-1]
+    if size[-1:] in units:
+        return int(float(size[:-1]) * units[size[-1]])
+    return int(size)
+
+
+def get_record_size(record):
+    """Returns the estimated in-memory size of a record.
+
+    Parameters
+    ----------
+    record : (str,)
+        The record
+
+    Returns
+    -------
+    int
+        The estimated size in bytes of the record and all its values.
+    """
+    return sys.getsizeof(record) + sum(sys.getsizeof(value) for value in record)
+
+
+def get_batch_size_estimate(data):
+    """Returns the estimated in-memory size of a batch, based on a sample of its records.
+
+    Parameters
+    ----------
+    data : [(str,),]
+        The records of the batch
+
+    Returns
+    -------
+    int
+        The estimated size in bytes of the batch.
+    """
+    if len(data) == 0:
+        return 0
+    step = max(len(data) // 100, 1)
+    sample = data[::step]
+    return sum(get_record_size(record) for record in sample) * len(data) // len(sample)
+
+
+class BatchSizeTuner:
+    """This class tunes the batch size based on the observed throughput."""
+
+    def __init__(self, batch_size=1000, min_size=100, max_size=500000, max_bytes=64 * 1024 * 1024):
+        """Initializes a BatchSizeTuner object.
+
+        Parameters
+        ----------
+        batch_size : int
+            The batch size to start with
+        min_size : int
+            The minimum batch size
+        max_size : int
+            The maximum batch size
+        max_bytes : int
+            The maximum estimated in-memory size of a batch in bytes
+        """
+        self.batch_size = batch_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.factor = 2.0
+        self.last_throughput = None
+
+    def record(self, rows, size, seconds, full=True):
+        """Records the throughput of a batch and adjusts the batch size.
+
+        The batch size keeps moving in the same direction as long as the throughput improves.
+        When the throughput gets worse, the direction is reversed with a smaller step,
+        so that the batch size settles where the throughput is the highest.
+
+        Parameters
+        ----------
+        rows : int
+            The number of rows of the batch
+        size : int
+            The estimated in-memory size of the batch in bytes
+        seconds : float
+            The time it took to load the batch
+        full : bool
+            Whether the batch has been loaded because it reached the batch size or memory limit.
+            The last, partial batch of a file is not full.
+
+        Returns
+        -------
+        int
+            The new batch size.
+        """
+        # Ignore partial batches, i.e. the last one of a file
+        if not full or seconds <= 0:
+            return self.batch_size
+        throughput = rows / seconds
+        if self.last_throughput is not None:
+            if throughput < self.last_throughput * 0.95:
+                # Worse, go back with a smaller step
+                self.factor = 1 / (self.factor ** 0.5)
+            elif throughput <= self.last_throughput * 1.05:
+                # No significant change, stay
+                self.last_throughput = throughput
+                return self.batch_size
+        self.last_throughput = throughput
+        new_size = int(rows * self.factor)
+        # Stay within the memory limit
+        if size > 0:
+            new_size = min(new_size, int(self.max_bytes * rows / size))
+        new_size = max(self.min_size, min(self.max_size, new_size))
+        # Stop moving once the steps become insignificant
+        if abs(self.factor - 1) < 0.05:
+            self.factor = 1.0
+        debug("Batch size: {0} rows, {1} bytes, {2:.0f} rows/s, new batch size: {3}"
+              .format(rows, size, throughput, new_size))
+        self.batch_size = new_size
+        return self.batch_size
+
+
+class BatchBuffer:
+    """This class holds the records of a batch in reusable slots.
+
+    The slots are kept between batches and overwritten in place, so that
+    loading a file does not allocate a new list for every batch.
+    """
+
+    def __init__(self, capacity=0):
+        """Initializes a BatchBuffer object.
+
+        Parameters
+        ----------
+        capacity : int
+            The number of slots to preallocate
+        """
+        self.slots = [None] * capacity
+        self.length = 0
+        self.size = 0
+        # The number of rows read from the file up to the end of the batch
+        self.end_row = 0
+        # Whether the batch is full, i.e. not the last, partial batch of a file
+        self.full = False
+
+    def append(self, record, size=0):
+        """Appends a record, reusing a free slot if there is one.
+
+        Parameters
+        ----------
+        record : (str,)
+            The record to append
+        size : int
+            The estimated in-memory size of the record in bytes
+        """
+        if self.length < len(self.slots):
+            self.slots[self.length] = record
+        else:
+            self.slots.append(record)
+        self.length += 1
+        self.size += size
+
+    def records(self):
+        """Returns the records of the batch.
+
+        A full batch returns the slots themselves, so that they can be passed to the database drivers
+        without copying the records, and the list is only valid until the buffer is cleared.
+        A shorter batch, i.e. the last one of a file, returns a copy of the used slots
+        and keeps the free slots for the next batch.
+
+        Returns
+        -------
+        [(str,),]
+            The records of the batch.
+        """
+        if len(self.slots) > self.length:
+            return self.slots[:self.length]
+        return self.slots
+
+    def extend(self, records):
+        """Appends multiple records to the batch at once.
+
+        Parameters
+        ----------
+        records : [tuple,]
+            The records to append
+        """
+        end = self.length + len(records)
+        # Overwrites the free slots and grows the list only if needed
+        self.slots[self.length:end] = records
+        self.length = end
+
+    def clear(self):
+        """Clears the batch in place, keeping the slots for the next batch."""
+        self.length = 0
+        self.size = 0
+
+    def __len__(self):
+        """Returns the number of records of the batch."""
+        return self.length
+
+    def __iter__(self):
+        """Iterates over the records of the batch."""
+        return itertools.islice(self.slots, self.length)
+
+
 class BadRecordLogger:
     """This class logs bad records into a file."""
 
@@ -371,7 +1194,9 @@ class BadRecordLogger:
 
     def close(self):
         """Close file."""
-        self.file.close()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
 
     def __enter__(self):
         """Create context manager."""
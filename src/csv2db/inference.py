@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+#
+# Since: October, 2026
+# Author: gvenzl
+# Name: inference.py
+# Description: Column data type inference for csv2db
+#
+# Copyright 2026 Gerald Venzl
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import datetime
+import re
+
+from csv2db.constants import DataType, DBConfig, DBConfigKeys
+
+# Only ISO 8601 dates and timestamps are recognized, databases that don't accept them as they are keep them as strings
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+TIMESTAMP_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}(?::\d{2})?)(?:\.(\d{1,9}))?$")
+NUMBER_PATTERN = re.compile(r"^[+-]?(0|[1-9]\d*)?(?:\.(\d*))?$")
+BOOLEAN_VALUES = ("true", "false")
+
+INTEGER_MAX = 2 ** 31 - 1
+BIGINT_MAX = 2 ** 63 - 1
+
+
+class ColumnStats:
+    """This class collects statistics about the values of a column to infer its data type.
+
+    Every data type starts out as a candidate and is ruled out by the first value that doesn't fit it.
+    Empty values are treated as NULL and don't rule out any data type.
+    """
+
+    def __init__(self):
+        """Initializes a ColumnStats object."""
+        self.values = 0
+        self.max_length = 0
+        self.max_bytes = 0
+        self.is_boolean = True
+        self.is_integer = True
+        self.is_decimal = True
+        self.is_date = True
+        self.is_timestamp = True
+        self.max_integer = 0
+        self.max_digits = 0
+        self.max_scale = 0
+        self.max_fraction = 0
+        self.timestamp_separators = ""
+
+    def add(self, value):
+        """Adds a value of the column.
+
+        Parameters
+        ----------
+        value : str
+            The value to add
+        """
+        if value == "":
+            return
+        self.values += 1
+        self.max_length = max(self.max_length, len(value))
+        self.max_bytes = max(self.max_bytes, len(value.encode("utf-8")))
+        if self.is_boolean and value.lower() not in BOOLEAN_VALUES:
+            self.is_boolean = False
+        if self.is_decimal:
+            self.add_number(value)
+        if self.is_date and not is_date(value):
+            self.is_date = False
+        if self.is_timestamp:
+            self.add_timestamp(value)
+
+    def add_number(self, value):
+        """Adds a value to the integer and decimal statistics.
+
+        Parameters
+        ----------
+        value : str
+            The value to add
+        """
+        match = NUMBER_PATTERN.match(value)
+        integral, fraction = (match.group(1) or "", match.group(2)) if match else ("", None)
+        # Require at least one digit, leading zeros (e.g. zip codes) keep the value a string
+        if integral == "" and not fraction:
+            self.is_integer = self.is_decimal = False
+            return
+        if fraction is None:
+            self.max_integer = max(self.max_integer, abs(int(value)))
+        else:
+            self.is_integer = False
+            self.max_scale = max(self.max_scale, len(fraction))
+        self.max_digits = max(self.max_digits, len(integral.lstrip("0")))
+
+    def add_timestamp(self, value):
+        """Adds a value to the timestamp statistics.
+
+        Parameters
+        ----------
+        value : str
+            The value to add
+        """
+        match = TIMESTAMP_PATTERN.match(value)
+        if match is None or not is_date(match.group(1)) or not is_time(match.group(2)):
+            self.is_timestamp = False
+            return
+        if match.group(3) is not None:
+            self.max_fraction = max(self.max_fraction, len(match.group(3)))
+        separator = value[len(match.group(1))]
+        if separator not in self.timestamp_separators:
+            self.timestamp_separators += separator
+
+    def merge(self, other):
+        """Merges the statistics of another ColumnStats object of the same column, i.e. from another file.
+
+        Parameters
+        ----------
+        other : ColumnStats
+            The statistics to merge
+        """
+        self.values += other.values
+        self.max_length = max(self.max_length, other.max_length)
+        self.max_bytes = max(self.max_bytes, other.max_bytes)
+        self.is_boolean = self.is_boolean and other.is_boolean
+        self.is_integer = self.is_integer and other.is_integer
+        self.is_decimal = self.is_decimal and other.is_decimal
+        self.is_date = self.is_date and other.is_date
+        self.is_timestamp = self.is_timestamp and other.is_timestamp
+        self.max_integer = max(self.max_integer, other.max_integer)
+        self.max_digits = max(self.max_digits, other.max_digits)
+        self.max_scale = max(self.max_scale, other.max_scale)
+        self.max_fraction = max(self.max_fraction, other.max_fraction)
+        self.timestamp_separators += "".join(separator for separator in other.timestamp_separators
+                                             if separator not in self.timestamp_separators)
+
+    def to_dict(self):
+        """Returns the statistics as dictionary, i.e. to store them.
+
+        Returns
+        -------
+        dict
+            The statistics.
+        """
+        return dict(vars(self))
+
+    @staticmethod
+    def from_dict(values):
+        """Returns a ColumnStats object with the statistics of a dictionary returned by to_dict().
+
+        Parameters
+        ----------
+        values : dict
+            The statistics
+
+        Returns
+        -------
+        ColumnStats
+            The column statistics.
+        """
+        stats = ColumnStats()
+        for key, value in values.items():
+            if hasattr(stats, key):
+                setattr(stats, key, value)
+        return stats
+
+    def get_data_type(self, db_type, default_data_type):
+        """Returns the data type of the column for a database.
+
+        Parameters
+        ----------
+        db_type : constants.DBType
+            The database type
+        default_data_type : str
+            The data type to use if the column has no values
+
+        Returns
+        -------
+        str
+            The data type of the column.
+        """
+        if self.values == 0:
+            return default_data_type
+        data_types = DBConfig[DBConfigKeys.DATA_TYPES][db_type]
+        precision = self.max_digits + self.max_scale
+        if self.is_boolean and data_types[DataType.BOOLEAN] is not None:
+            return data_types[DataType.BOOLEAN]
+        elif self.is_integer and self.max_integer <= INTEGER_MAX:
+            return data_types[DataType.INTEGER]
+        elif self.is_integer and self.max_integer <= BIGINT_MAX:
+            return data_types[DataType.BIGINT]
+        elif self.is_decimal and precision <= DBConfig[DBConfigKeys.MAX_DECIMAL_PRECISION][db_type]:
+            return data_types[DataType.DECIMAL].format(precision=max(precision, 1), scale=self.max_scale)
+        elif self.is_date and data_types[DataType.DATE] is not None:
+            return data_types[DataType.DATE]
+        elif (self.is_timestamp and data_types[DataType.TIMESTAMP] is not None
+              and all(separator in DBConfig[DBConfigKeys.TIMESTAMP_SEPARATORS][db_type]
+                      for separator in self.timestamp_separators)):
+            max_precision = DBConfig[DBConfigKeys.MAX_TIMESTAMP_PRECISION][db_type]
+            return data_types[DataType.TIMESTAMP].format(precision=min(self.max_fraction, max_precision))
+        # Leave room for longer values that were not part of the sample
+        length = get_next_power_of_two(self.max_length)
+        byte_length = get_next_power_of_two(self.max_bytes)
+        if byte_length > DBConfig[DBConfigKeys.MAX_VARCHAR_LENGTH][db_type]:
+            # Use the maximum length, if the values fit into it
+            if self.max_bytes > DBConfig[DBConfigKeys.MAX_VARCHAR_LENGTH][db_type]:
+                return data_types[DataType.CLOB]
+            length = byte_length = DBConfig[DBConfigKeys.MAX_VARCHAR_LENGTH][db_type]
+        return data_types[DataType.VARCHAR].format(length=length, bytes=byte_length)
+
+
+def is_date(value):
+    """Returns whether a value is a valid ISO 8601 date (YYYY-MM-DD).
+
+    Parameters
+    ----------
+    value : str
+        The value to check
+
+    Returns
+    -------
+    bool
+        True if the value is a valid date, otherwise False.
+    """
+    if DATE_PATTERN.match(value) is None:
+        return False
+    try:
+        datetime.datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def is_time(value):
+    """Returns whether a value is a valid time (HH:MM or HH:MM:SS).
+
+    Parameters
+    ----------
+    value : str
+        The value to check
+
+    Returns
+    -------
+    bool
+        True if the value is a valid time, otherwise False.
+    """
+    try:
+        datetime.datetime.strptime(value, "%H:%M:%S" if len(value) > 5 else "%H:%M")
+        return True
+    except ValueError:
+        return False
+
+
+def get_next_power_of_two(value):
+    """Returns the next power of two greater than or equal to a value.
+
+    Parameters
+    ----------
+    value : int
+        The value
+
+    Returns
+    -------
+    int
+        The next power of two.
+    """
+    return 1 << max(value - 1, 0).bit_length()
+
+
+def infer_column_stats(reader, col_list, sample_rows=0):
+    """Collects the statistics of all columns by reading the data rows of a file.
+
+    Parameters
+    ----------
+    reader : _csv.reader
+        The CSV Reader object to read the data rows from, positioned after the header
+    col_list : [str,]
+        The columns of the file
+    sample_rows : int
+        The number of data rows to read, 0 to read all data rows
+
+    Returns
+    -------
+    [ColumnStats,]
+        The statistics of each column, in the order of the columns.
+    """
+    stats = [ColumnStats() for col in col_list]
+    for row_count, row in enumerate(reader, start=1):
+        for column, value in zip(stats, row):
+            column.add(value)
+        if row_count == sample_rows:
+            break
+    return stats
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+#
+# Since: October, 2026
+# Author: gvenzl
+# Name: manifest.py
+# Description: Manifest of loaded files for incremental loads of csv2db
+#
+# Copyright 2026 Gerald Venzl
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import hashlib
+import json
+import os
+
+import csv2db.functions as f
+
+# Size of the blocks read to calculate the checksum of a file
+CHECKSUM_BLOCK_SIZE = 1024 * 1024
+
+
+class LoadManifest:
+    """This class keeps a manifest of the files that have been loaded.
+
+    The manifest is a JSON lines file with the path, size, modification time and checksum
+    of every loaded file. A line is appended for every loaded file, the last line of a file wins.
+    """
+
+    def __init__(self, file_name):
+        """Initializes a LoadManifest object.
+
+        Parameters
+        ----------
+        file_name : str
+            The manifest file name, it is created if it doesn't exist yet
+        """
+        self.file_name = file_name
+        self.files = {}
+        # Checksums by archive path, size and modification time, members of an archive share its checksum
+        self.checksums = {}
+        # Entries of the files to load, taken before loading them and recorded once they are loaded
+        self.pending = {}
+        self.read()
+        self.file = open(file_name, mode="a", encoding="utf-8")
+
+    def read(self):
+        """Reads the loaded files from the manifest."""
+        try:
+            with open(self.file_name, mode="r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    # The last line may be incomplete if a previous load has been killed
+                    except ValueError:
+                        continue
+                    self.files[entry["path"]] = entry
+        except FileNotFoundError:
+            pass
+
+    def is_loaded(self, file_name):
+        """Returns whether a file has already been loaded and not changed since.
+
+        Unchanged files are not read at all. The checksum of all other files is calculated
+        before they are loaded, and kept to record them once they are loaded.
+        Named pipes are never recorded, as they cannot be read twice.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+
+        Returns
+        -------
+        bool
+            True if the file has already been loaded, otherwise False.
+        """
+        if f.is_stream(file_name):
+            return False
+        loaded = self.files.get(os.path.abspath(file_name))
+        entry = self.get_entry(file_name, checksum=False)
+        if loaded is not None and loaded["size"] == entry["size"] and loaded["mtime"] == entry["mtime"]:
+            return True
+        entry["checksum"] = self.get_checksum(file_name, entry["size"], entry["mtime"])
+        self.pending[entry["path"]] = entry
+        # Same size but touched, only a different content counts as a change
+        if loaded is not None and loaded["checksum"] == entry["checksum"]:
+            self.record(file_name)
+            return True
+        return False
+
+    def get_entry(self, file_name, checksum=True):
+        """Returns the manifest entry of a file, as it is now.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+        checksum : bool
+            Whether to calculate the checksum of the file
+
+        Returns
+        -------
+        dict
+            The path, size, modification time and, if requested, checksum of the file.
+        """
+        stat = os.stat(f.split_archive_member(file_name)[0])
+        entry = {"path": os.path.abspath(file_name), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+        if checksum:
+            entry["checksum"] = self.get_checksum(file_name, stat.st_size, stat.st_mtime_ns)
+        return entry
+
+    def get_checksum(self, file_name, size, mtime):
+        """Returns the checksum of a file.
+
+        The checksum is remembered for the size and modification time of the file, so that every file
+        is read only once. Members of an archive have the checksum of the archive.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+        size : int
+            The size of the file
+        mtime : int
+            The modification time of the file in nanoseconds
+
+        Returns
+        -------
+        str
+            The SHA-256 checksum of the file.
+        """
+        archive_name = f.split_archive_member(file_name)[0]
+        key = (os.path.abspath(archive_name), size, mtime)
+        if key not in self.checksums:
+            checksum = hashlib.sha256()
+            with open(archive_name, mode="rb") as file:
+                for block in iter(lambda: file.read(CHECKSUM_BLOCK_SIZE), b""):
+                    checksum.update(block)
+            self.checksums[key] = checksum.hexdigest()
+        return self.checksums[key]
+
+    def record(self, file_name):
+        """Records a file as loaded.
+
+        The entry taken before the file has been loaded is recorded, so that the file is not read again.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+        """
+        entry = self.pending.pop(os.path.abspath(file_name), None)
+        if entry is None:
+            entry = self.get_entry(file_name)
+        self.files[entry["path"]] = entry
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        """Close the manifest file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+#
+# Since: October, 2026
+# Author: gvenzl
+# Name: metadata.py
+# Description: Metadata of the target table for csv2db
+#
+# Copyright 2026 Gerald Venzl
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import csv2db.config as cfg
+import csv2db.conversion as conversion
+import csv2db.functions as f
+from csv2db.constants import DBType
+
+# Values of the nullable column of the data dictionaries meaning that a column is nullable
+NULLABLE_VALUES = ("Y", "YES", 1, True)
+
+
+class TableColumn:
+    """This class describes a column of the target table, as stored in the data dictionary."""
+
+    def __init__(self, name, position, data_type, size, scale, nullable):
+        """Initializes a TableColumn object.
+
+        Parameters
+        ----------
+        name : str
+            The column name
+        position : int
+            The (1-based) position of the column within the table
+        data_type : str
+            The data type of the column
+        size : int
+            The maximum length of character columns, None if not defined
+        scale : int
+            The scale of numeric columns, None if not defined
+        nullable : bool
+            Whether the column is nullable
+        """
+        self.name = name
+        self.position = position
+        self.data_type = data_type
+        self.size = size
+        self.scale = scale
+        self.nullable = nullable
+
+
+class TableMetadata:
+    """This class holds the metadata of the target table for the entire load.
+
+    The data dictionary is queried only once per load and the metadata is handed over to the workers
+    with the global configuration. Everything derived from the columns to load the data into,
+    i.e. the INSERT statement or the bind types, is derived once per column map and then reused for every batch.
+    """
+
+    def __init__(self, table_name, columns):
+        """Initializes a TableMetadata object.
+
+        Parameters
+        ----------
+        table_name : str
+            The table name
+        columns : [TableColumn,]
+            The columns of the table, empty if the table is not found in the data dictionary
+        """
+        self.table_name = table_name
+        self.columns = {column.name.lower(): column for column in columns}
+        # Column map -> INSERT statement, conversion functions and bind types
+        self.statements = {}
+        self.converters = {}
+        self.input_sizes = {}
+
+    def get_column(self, col):
+        """Returns the table column of a column to load the data into.
+
+        Parameters
+        ----------
+        col : str
+            The column name, as used in the statements
+
+        Returns
+        -------
+        TableColumn
+            The table column, or None if the column does not exist.
+        """
+        return self.columns.get(col.strip(f.get_identifier_quote(cfg.db_type)).lower())
+
+    def get_columns(self, col_map):
+        """Returns the table columns of the columns to load the data into.
+
+        Parameters
+        ----------
+        col_map : [str,]
+            The columns to load the data into
+
+        Returns
+        -------
+        [TableColumn,]
+            The table columns in the order of the columns to load the data into.
+
+        Raises
+        ------
+        NameError
+            If the table or a column does not exist
+        """
+        if not self.columns:
+            raise NameError("The table {0} does not exist.".format(self.table_name))
+        columns = []
+        for col in col_map:
+            column = self.get_column(col)
+            if column is None:
+                raise NameError("The column {0} does not exist in table {1}.".format(col, self.table_name))
+            columns.append(column)
+        return columns
+
+    def validate_header(self, col_map):
+        """Validates the columns of a file header against the table, before any data is loaded.
+
+        Tables that are not found in the data dictionary, i.e. synonyms, are not validated.
+
+        Parameters
+        ----------
+        col_map : [str,]
+            The columns to load the data into
+
+        Raises
+        ------
+        NameError
+            If a column does not exist in the table
+        """
+        if not self.columns:
+            return
+        missing = [col for col in col_map if self.get_column(col) is None]
+        if missing:
+            raise NameError("The column(s) {0} do not exist in table {1}."
+                            .format(", ".join(missing), self.table_name))
+        loaded = {self.get_column(col).name.lower() for col in col_map}
+        for name, column in self.columns.items():
+            if not column.nullable and name not in loaded:
+                f.verbose("Column {0} is NOT NULL but not in the file, it has to have a default value."
+                          .format(column.name))
+
+    def get_column_ids(self, col_map):
+        """Returns the column ids of the columns to load the data into (SQL Server only).
+
+        Parameters
+        ----------
+        col_map : [str,]
+            The columns to load the data into
+
+        Returns
+        -------
+        [int,]
+            The (1-based) column ids in the order of the columns to load the data into.
+        """
+        return [column.position for column in self.get_columns(col_map)]
+
+    def get_converters(self, col_map):
+        """Returns the conversion functions of the columns to load the data into.
+
+        Parameters
+        ----------
+        col_map : [str,]
+            The columns to load the data into
+
+        Returns
+        -------
+        [function,]
+            The conversion function of each column, None for the columns loaded as strings.
+        """
+        key = tuple(col_map)
+        if key not in self.converters:
+            self.converters[key] = conversion.get_converters(cfg.db_type, self.get_columns(col_map))
+        return self.converters[key]
+
+    def get_input_sizes(self, col_map):
+        """Returns the bind types and sizes of the columns to load the data into (Oracle only).
+
+        Setting them up front saves the driver from guessing them from the values of every batch
+        and from rebinding once a longer value than in the first rows is found.
+
+        Parameters
+        ----------
+        col_map : [str,]
+            The columns to load the data into
+
+        Returns
+        -------
+        [object,]
+            The bind type or maximum string length of each column, None if left to the driver.
+            An empty list if the table is not found in the data dictionary.
+        """
+        key = tuple(col_map)
+        if key not in self.input_sizes:
+            if not self.columns:
+                self.input_sizes[key] = []
+            else:
+                self.input_sizes[key] = get_oracle_input_sizes(
+                    self.get_columns(col_map),
+                    self.get_converters(col_map) if cfg.convert_types else [None] * len(col_map))
+        return self.input_sizes[key]
+
+
+def get_oracle_input_sizes(columns, converters):
+    """Returns the bind types and sizes of the columns for the Oracle driver.
+
+    Parameters
+    ----------
+    columns : [TableColumn,]
+        The table columns
+    converters : [function,]
+        The conversion function of each column, None for the columns loaded as strings
+
+    Returns
+    -------
+    [object,]
+        The bind type or maximum string length of each column, None if left to the driver.
+    """
+    import oracledb
+    input_sizes = []
+    for column, converter in zip(columns, converters):
+        if converter in (conversion.to_int, conversion.to_decimal):
+            input_sizes.append(oracledb.DB_TYPE_NUMBER)
+        elif converter is conversion.to_float:
+            input_sizes.append(oracledb.DB_TYPE_BINARY_DOUBLE if column.data_type.upper().startswith("BINARY_")
+                               else oracledb.DB_TYPE_NUMBER)
+        elif converter is conversion.to_oracle_date:
+            input_sizes.append(oracledb.DB_TYPE_DATE)
+        elif converter is conversion.to_datetime:
+            input_sizes.append(oracledb.DB_TYPE_TIMESTAMP)
+        # Strings are bound with the maximum length of character columns
+        elif column.size:
+            input_sizes.append(column.size)
+        else:
+            input_sizes.append(None)
+    return input_sizes
+
+
+def get_table_metadata(conn, table_name):
+    """Queries the metadata of a table from the data dictionary.
+
+    Parameters
+    ----------
+    conn
+        The database connection to use
+    table_name : str
+        The table name
+
+    Returns
+    -------
+    TableMetadata
+        The metadata of the table, without columns if the table is not found in the data dictionary.
+    """
+    schema, table = f.split_table_name(table_name)
+    cur = conn.cursor()
+    if cfg.db_type is DBType.ORACLE:
+        cur.execute("SELECT column_name, column_id, data_type, char_length, data_scale, nullable "
+                    "FROM all_tab_columns WHERE owner = NVL(:1, USER) AND table_name = :2 ORDER BY column_id",
+                    (schema, table))
+    elif cfg.db_type is DBType.POSTGRES:
+        cur.execute("SELECT column_name, ordinal_position, data_type, character_maximum_length, numeric_scale, "
+                    "is_nullable FROM information_schema.columns "
+                    "WHERE table_schema = COALESCE(%s::text, current_schema()) AND table_name = %s "
+                    "ORDER BY ordinal_position", (schema, table))
+    elif cfg.db_type is DBType.MYSQL:
+        cur.execute("SELECT column_name, ordinal_position, data_type, character_maximum_length, numeric_scale, "
+                    "is_nullable FROM information_schema.columns "
+                    "WHERE table_schema = COALESCE(%s, DATABASE()) AND table_name = %s "
+                    "ORDER BY ordinal_position", (schema, table))
+    elif cfg.db_type is DBType.SQLSERVER:
+        cur.execute("SELECT c.name, c.column_id, t.name, c.max_length, c.scale, c.is_nullable FROM sys.columns c "
+                    "JOIN sys.types t ON c.user_type_id = t.user_type_id "
+                    "WHERE c.object_id = OBJECT_ID(%s) ORDER BY c.column_id", (table_name,))
+    elif cfg.db_type is DBType.DB2:
+        cur.execute("SELECT colname, colno + 1, typename, length, scale, nulls FROM syscat.columns "
+                    "WHERE tabschema = COALESCE(CAST(? AS VARCHAR(128)), CURRENT SCHEMA) AND tabname = ? "
+                    "ORDER BY colno", (schema, table))
+    columns = [TableColumn(name, position, data_type, size, scale, nullable in NULLABLE_VALUES)
+               for name, position, data_type, size, scale, nullable in cur.fetchall()]
+    cur.close()
+    # End the read transaction, so that the connection doesn't hold it open for the entire load
+    conn.commit()
+    return TableMetadata(table_name, columns)
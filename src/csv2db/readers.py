@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+#
+# Since: October, 2026
+# Author: gvenzl
+# Name: readers.py
+# Description: Block based CSV reader engines for csv2db
+#
+# Copyright 2026 Gerald Venzl
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import csv
+
+import csv2db.config as cfg
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.csv
+except ImportError:
+    pyarrow = None
+
+# The number of bytes parsed at once by the pyarrow reader
+ARROW_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+class ArrowReader:
+    """This class reads a CSV file via the multi-threaded CSV parser of pyarrow.
+
+    The file is parsed in blocks of many rows at once outside the Python interpreter.
+    Like the csv reader, it iterates over the rows of the file, including the header,
+    but it also hands out the parsed rows block by block via read_block().
+    All values are read as strings, empty values as empty strings.
+    Line breaks within values are translated into newlines, like the csv reader does on text files.
+    """
+
+    def __init__(self, file):
+        """Initializes an ArrowReader object.
+
+        The first row is parsed via the csv module, as it defines the number of columns
+        that all values are read as strings for.
+
+        Parameters
+        ----------
+        file : file-object
+            The text file object to read from, only its underlying binary stream is used
+        """
+        stream = file.buffer
+        lines = (line.decode(cfg.file_encoding) for line in iter(stream.readline, b""))
+        first_row = next(csv.reader(lines, delimiter=cfg.column_separator, quotechar=cfg.quote_char))
+        column_names = ["f{0}".format(idx) for idx in range(len(first_row))]
+        self.batch_reader = pyarrow.csv.open_csv(
+            stream,
+            read_options=pyarrow.csv.ReadOptions(column_names=column_names, block_size=ARROW_BLOCK_SIZE,
+                                                 use_threads=True, encoding=cfg.file_encoding),
+            parse_options=pyarrow.csv.ParseOptions(delimiter=cfg.column_separator,
+                                                   quote_char=cfg.quote_char or False,
+                                                   newlines_in_values=True,
+                                                   invalid_row_handler=handle_invalid_row),
+            convert_options=pyarrow.csv.ConvertOptions(column_types={name: pyarrow.string() for name in column_names},
+                                                       strings_can_be_null=False,
+                                                       quoted_strings_can_be_null=False))
+        self.rows = [tuple(first_row)]
+        self.position = 0
+
+    def read_block(self):
+        """Returns the next block of rows that have not been read yet.
+
+        Returns
+        -------
+        [(str,),]
+            The rows of the block, or None at the end of the file.
+        """
+        if self.position < len(self.rows):
+            block = self.rows[self.position:] if self.position > 0 else self.rows
+        else:
+            try:
+                batch = self.batch_reader.read_next_batch()
+            except StopIteration:
+                return None
+            # Convert the values column by column, then transpose them into rows
+            block = list(zip(*[translate_newlines(column).to_pylist() for column in batch.columns]))
+        self.rows = []
+        self.position = 0
+        return block
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while self.position >= len(self.rows):
+            block = self.read_block()
+            if block is None:
+                raise StopIteration
+            self.rows = block
+        row = self.rows[self.position]
+        self.position += 1
+        # Return a list, like the csv reader
+        return list(row)
+
+
+def translate_newlines(column):
+    """Translates the line breaks within the values of a column into newlines.
+
+    Parameters
+    ----------
+    column : pyarrow.StringArray
+        The values of the column
+
+    Returns
+    -------
+    pyarrow.StringArray
+        The values with newlines as line breaks, or the column itself if it contains no carriage returns.
+    """
+    # Most columns contain no carriage return at all, a plain substring search is much cheaper than the regex
+    if not pyarrow.compute.any(pyarrow.compute.match_substring(column, "\r")).as_py():
+        return column
+    return pyarrow.compute.replace_substring_regex(column, pattern="\r\n?", replacement="\n")
+
+
+def handle_invalid_row(row):
+    """Handles a row with a different number of values than the first row of the file.
+
+    Parameters
+    ----------
+    row : pyarrow.csv.InvalidRow
+        The invalid row
+
+    Returns
+    -------
+    str
+        "skip" to skip the row, if errors are ignored, otherwise "error" to fail the load.
+    """
+    if not cfg.ignore_errors:
+        return "error"
+    if cfg.log_bad_records and cfg.bad_records_logger is not None:
+        cfg.bad_records_logger.write_bad_record([row.text])
+    return "skip"
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+#
+# Since: October, 2026
+# Author: gvenzl
+# Name: watcher.py
+# Description: Directory watcher for the continuous loading of csv2db
+#
+# Copyright 2026 Gerald Venzl
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+
+import csv2db.functions as f
+
+# inotify event flags, see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+# struct inotify_event: int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[];
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class DirectoryWatcher:
+    """This class watches a directory for files that are ready to be loaded.
+
+    On Linux, inotify is used to get notified once a file has been closed after writing or moved into the directory.
+    Otherwise, the directory is polled and a file is ready once its size and modification time
+    have not changed for the settle time.
+    Files already in the directory when the watching starts are always checked via the settle time.
+    """
+
+    def __init__(self, pattern, interval=1.0, settle=2.0, polling=False):
+        """Initializes a DirectoryWatcher object.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern of the files to watch for, either a directory or a file name pattern within a directory.
+            Bad records files are never loaded, even if they match the pattern.
+        interval : float
+            The number of seconds between two polls of the directory
+        settle : float
+            The number of seconds the size and modification time of a file must not change
+            before it is considered to be completely written
+        polling : bool
+            Whether to poll the directory even if inotify is available
+
+        Raises
+        ------
+        ValueError
+            If the pattern matches more than one directory
+        """
+        if os.path.isdir(pattern):
+            # If path is directory watch for all CSV files, compressed or uncompressed
+            self.directory = pattern
+            self.file_pattern = None
+        else:
+            self.directory = os.path.dirname(pattern) or "."
+            self.file_pattern = os.path.basename(pattern)
+        if any(char in self.directory for char in "*?["):
+            raise ValueError("Only a single directory can be watched: {0}".format(self.directory))
+        self.interval = interval
+        self.settle = settle
+        # File name -> (size, modification time) of the files handed out
+        self.loaded = {}
+        # File name -> (size, modification time, time of the last change) of the files not yet ready
+        self.pending = {}
+        self.inotify_fd = None
+        if not polling:
+            self.inotify_fd = get_inotify_fd(self.directory)
+        f.debug("Watching directory '{0}' for '{1}' using {2}".format(self.directory,
+                                                                       self.file_pattern or "CSV files",
+                                                                       "polling" if self.inotify_fd is None
+                                                                       else "inotify"))
+
+    def watch(self):
+        """Yields the files that are ready to be loaded, forever.
+
+        Returns
+        -------
+        iterator
+            The file names ready to be loaded, in the order they became ready.
+        """
+        self.scan()
+        while True:
+            if self.inotify_fd is not None:
+                ready_files = self.read_events()
+            else:
+                time.sleep(self.interval)
+                self.scan()
+                ready_files = []
+            ready_files.extend(self.get_settled_files())
+            for file_name in ready_files:
+                self.pending.pop(file_name, None)
+                try:
+                    stat = os.stat(file_name)
+                except FileNotFoundError:
+                    continue
+                # A file may be ready via inotify and the settle time at once
+                if self.loaded.get(file_name) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                self.loaded[file_name] = (stat.st_size, stat.st_mtime_ns)
+                yield file_name
+
+    def scan(self):
+        """Adds all new and changed files of the directory to the pending files."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in sorted(names):
+            if self.matches(name):
+                file_name = os.path.join(self.directory, name)
+                if file_name not in self.pending and self.is_new(file_name):
+                    self.pending[file_name] = None
+
+    def get_settled_files(self):
+        """Returns the pending files that have not changed for the settle time.
+
+        Returns
+        -------
+        [str,]
+            The file names that are ready to be loaded.
+        """
+        settled_files = []
+        now = time.monotonic()
+        for file_name, state in list(self.pending.items()):
+            try:
+                stat = os.stat(file_name)
+            except FileNotFoundError:
+                del self.pending[file_name]
+                continue
+            if state is None or state[:2] != (stat.st_size, stat.st_mtime_ns):
+                self.pending[file_name] = (stat.st_size, stat.st_mtime_ns, now)
+            elif now - state[2] >= self.settle:
+                settled_files.append(file_name)
+        return settled_files
+
+    def read_events(self):
+        """Waits for inotify events up to the poll interval and returns the files that are ready.
+
+        Returns
+        -------
+        [str,]
+            The file names that have been closed after writing or moved into the directory.
+        """
+        ready, _, _ = select.select([self.inotify_fd], [], [], self.interval)
+        if not ready:
+            return []
+        data = os.read(self.inotify_fd, 64 * 1024)
+        file_names = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events have been lost, fall back to checking all files
+                self.scan()
+            elif self.matches(name):
+                file_name = os.path.join(self.directory, name)
+                if file_name not in file_names:
+                    file_names.append(file_name)
+        return file_names
+
+    def matches(self, name):
+        """Returns whether a file of the directory is to be loaded.
+
+        The bad records files written into the directory while loading are never loaded.
+
+        Parameters
+        ----------
+        name : str
+            The file name within the directory
+
+        Returns
+        -------
+        bool
+            True if the file matches the pattern and is not a bad records file, otherwise False.
+        """
+        if name.endswith(f.BAD_FILE_EXTENSION):
+            return False
+        if self.file_pattern is None:
+            return f.is_csv_file(os.path.join(self.directory, name))
+        return fnmatch.fnmatch(name, self.file_pattern)
+
+    def is_new(self, file_name):
+        """Returns whether a file is new or has changed since it was handed out.
+
+        Parameters
+        ----------
+        file_name : str
+            The file name
+
+        Returns
+        -------
+        bool
+            True if the file is new or has changed, otherwise False.
+        """
+        try:
+            stat = os.stat(file_name)
+        except FileNotFoundError:
+            return False
+        return self.loaded.get(file_name) != (stat.st_size, stat.st_mtime_ns)
+
+    def close(self):
+        """Stops watching the directory."""
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+
+def get_inotify_fd(directory):
+    """Returns an inotify file descriptor watching a directory for closed and moved in files.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to watch
+
+    Returns
+    -------
+    int
+        The inotify file descriptor, or None if inotify is not available.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        f.debug("Cannot watch directory via inotify: {0}".format(os.strerror(ctypes.get_errno())))
+        os.close(fd)
+        return None
+    return fd
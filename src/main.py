@@ -60,12 +60,34 @@
 #
 
 import argparse
+import asyncio
+import atexit
+import concurrent.futures
+import csv
 import getpass
+import inspect
+import itertools
+import multiprocessing
+import os
+import queue
 import sys
-
+import tarfile
+import tempfile
+import threading
+import time
+
+import csv2db.cache as cache
+import csv2db.checkpoint as checkpoint
+import csv2db.compression as compression
 import csv2db.config as cfg
 import csv2db.constants as cons
+import csv2db.conversion as conversion
 import csv2db.functions as f
+import csv2db.inference as inference
+import csv2db.manifest as manifest
+import csv2db.metadata as metadata
+import csv2db.readers as readers
+import csv2db.watcher as watcher
 
 
 def set_global_config(args):
@@ -111,6 +133,29 @@ def set_global_config(args):
     cfg.file_encoding = args.encoding
     f.debug("File encoding: {0}".format(cfg.file_encoding))
 
+    # Set ZIP archive member pattern
+    cfg.zip_members = args.zip_members
+    f.debug("ZIP archive members: {0}".format(cfg.zip_members))
+
+    # Set decompressor of compressed files
+    cfg.decompressor = args.decompressor
+    f.debug("Decompressor: {0}".format(cfg.decompressor))
+
+    # Set CSV reader, falling back to the csv module if pyarrow is not installed
+    cfg.reader = args.reader
+    if cfg.reader == "arrow" and readers.pyarrow is None:
+        print("The pyarrow package is not installed, using the csv reader instead.")
+        cfg.reader = "csv"
+    f.debug("CSV reader: {0}".format(cfg.reader))
+
+    # Set memory mapped reading of plain text files
+    cfg.mmap = args.mmap
+    f.debug("Memory mapped files: {0}".format(cfg.mmap))
+
+    # Set number of parallel workers, 0 to only scan several large files in parallel
+    cfg.parallel = args.parallel if args.parallel is not None else 0
+    f.debug("Parallel workers: {0}".format(cfg.parallel))
+
 
 def run(cmd):
     """Runs csv2db.
@@ -131,20 +176,31 @@ def run(cmd):
 
     set_global_config(args)
 
-    # Find all files
-    f.verbose("Finding file(s).")
-    file_names = f.find_all_files(args.file)
-    f.verbose("Found {0} file(s).".format(len(file_names)))
-    # Exit program if no files found.
-    if len(file_names) == 0:
-        return cons.ExitCodes.SUCCESS.value
-    f.debug(file_names)
+    # Set up the header cache of generate
+    if args.command.startswith("gen"):
+        cache_dir = args.cache_dir if args.cache_dir is not None else cache.get_default_cache_dir()
+        if args.clear_cache:
+            f.verbose("Clearing header cache '{0}'.".format(cache_dir))
+            f.debug("Removed {0} cache entries.".format(cache.HeaderCache(cache_dir).clear()))
+        cfg.cache_dir = cache_dir if not args.no_cache else None
+        f.debug("Cache directory: {0}".format(cfg.cache_dir))
+
+    # Find all files, the watch command finds the files itself
+    file_names = []
+    if args.command != "watch":
+        f.verbose("Finding file(s).")
+        file_names = f.find_all_files(args.file)
+        f.verbose("Found {0} file(s).".format(len(file_names)))
+        # Exit program if no files found.
+        if len(file_names) == 0:
+            return cons.ExitCodes.SUCCESS.value
+        f.debug(file_names)
 
     # Generate CREATE TABLE SQL
     if args.command.startswith("gen"):
         f.verbose("Generating CREATE TABLE statement.")
         try:
-            generate_table_sql(file_names, f.get_identifier(args.column_type, True))
+            generate_table_sql(file_names, f.get_identifier(args.column_type, True), args.infer_types, args.sample_rows)
             return cons.ExitCodes.SUCCESS.value
         except Exception:
             exception, tb_str = f.get_exception_details()
@@ -162,15 +218,38 @@ def run(cmd):
             cfg.truncate_before_load = args.truncate
             f.debug("'TRUNCATE TABLE' option set by user")
 
+        if args.bulk:
+            cfg.bulk_load = args.bulk
+            f.debug("'BULK' loading option set by user")
+
+        if args.convert_types:
+            cfg.convert_types = args.convert_types
+            f.debug("'CONVERT TYPES' option set by user")
+        cfg.date_format = args.date_format
+        cfg.timestamp_format = args.timestamp_format
+
         # Set DB default port, if needed
         if args.port is None:
             args.port = f.get_default_db_port(cfg.db_type)
             f.debug("Using default port {0}".format(args.port))
 
         # Set batch size
-        cfg.batch_size = int(args.batch)
+        if args.batch == "auto":
+            # Start with a small batch size and tune it based on the observed throughput
+            cfg.batch_tuner = f.BatchSizeTuner(batch_size=10000 if cfg.direct_path else 1000,
+                                               min_size=10000 if cfg.direct_path else 100)
+            cfg.batch_size = cfg.batch_tuner.batch_size
+        else:
+            cfg.batch_tuner = None
+            cfg.batch_size = int(args.batch)
         f.debug("Batch size: {0}".format(cfg.batch_size))
 
+        # Set batch memory limit
+        cfg.batch_bytes = args.batch_bytes
+        f.debug("Batch memory limit: {0}".format(cfg.batch_bytes))
+        if cfg.batch_tuner is not None and cfg.batch_bytes > 0:
+            cfg.batch_tuner.max_bytes = cfg.batch_bytes
+
         # If direct path has been specified and batch size is lower than 10k, overwrite batch size to 10k.
         if cfg.direct_path and cfg.batch_size < 10000:
             f.debug("Direct path was specified but batch size is less than 10000.")
@@ -189,12 +268,32 @@ def run(cmd):
         f.debug("Ignore errors: {0}".format(cfg.ignore_errors))
         f.debug("Log errors: {0}".format(cfg.log_bad_records))
 
+        # Only the csv reader keeps rows with more values than the header, which are truncated when ignoring errors
+        if cfg.reader == "arrow" and cfg.ignore_errors and not cfg.log_bad_records:
+            print("The pyarrow reader cannot truncate rows with additional values, using the csv reader instead.")
+            cfg.reader = "csv"
+
+        # Set pipeline depth
+        cfg.pipeline_depth = args.pipeline
+        f.debug("Pipeline depth: {0}".format(cfg.pipeline_depth))
+
+        # Set number of asynchronous connections
+        cfg.async_connections = args.async_connections
+        f.debug("Asynchronous connections: {0}".format(cfg.async_connections))
+
+        # Set chunk size (in MB) for splitting plain text files
+        cfg.chunk_size = args.chunk_size * 1024 * 1024
+        f.debug("Chunk size: {0}".format(cfg.chunk_size))
+
         f.verbose("Establishing database connection.")
         f.debug("Database details:")
         f.debug({"dbtype": args.dbtype, "user": args.user, "host": args.host, "port": args.port, "dbname": args.dbname})
 
+        # Keep the connection details for workers that need to open their own connection
+        cfg.db_connection_details = {"user": args.user, "password": args.password, "host": args.host,
+                                     "port": args.port, "db_name": args.dbname}
         try:
-            cfg.conn = f.get_db_connection(cfg.db_type, args.user, args.password, args.host, args.port, args.dbname)
+            cfg.conn = f.get_db_connection(cfg.db_type, **cfg.db_connection_details)
         except Exception:
             exception, tb_str = f.get_exception_details()
             f.error("Error connecting to the database: {0}".format(exception))
@@ -202,28 +301,59 @@ def run(cmd):
             return cons.ExitCodes.DATABASE_ERROR.value
 
         try:
+            if args.checkpoint is not None:
+                f.verbose("{0} checkpoint journal '{1}'.".format("Resuming from" if args.resume else "Writing",
+                                                                 args.checkpoint))
+                cfg.checkpoint = checkpoint.CheckpointJournal(args.checkpoint, args.resume)
+
+            if args.incremental is not None:
+                f.verbose("Loading new and changed files only, using manifest '{0}'.".format(args.incremental))
+                cfg.manifest = manifest.LoadManifest(args.incremental)
+
+            # Query the table metadata once per load, so that neither the batches nor the workers have to
+            f.verbose("Reading metadata of table {0}.".format(cfg.table_name))
+            cfg.table_metadata = metadata.get_table_metadata(cfg.conn, cfg.table_name)
+            if cfg.table_metadata.columns:
+                f.debug("Table columns: {0}".format([column.name for column in cfg.table_metadata.columns.values()]))
+            elif cfg.convert_types and not cfg.bulk_load:
+                raise NameError("The table {0} does not exist.".format(cfg.table_name))
+            else:
+                f.verbose("Table {0} not found in the data dictionary, not validating the file headers."
+                          .format(cfg.table_name))
+
             if cfg.truncate_before_load:
                 f.verbose("Truncating table before load.")
                 f.truncate_table(cfg.db_type, cfg.conn, cfg.table_name)
 
-            load_files(file_names)
+            if args.command == "watch":
+                watch_files(args.file, args.interval, args.settle, args.polling)
+            else:
+                load_files(file_names)
 
             f.verbose("Closing database connection.")
-            cfg.conn.close()
+            close_connection()
             return cons.ExitCodes.SUCCESS.value if not cfg.data_loading_error else cons.ExitCodes.DATA_LOADING_ERROR.value
         except KeyboardInterrupt:
             print("Exiting program")
-            cfg.conn.close()
+            close_connection()
             return cons.ExitCodes.GENERIC_ERROR.value
         except Exception:
             exception, tb_str = f.get_exception_details()
             f.error("Error loading file(s): {0}".format(exception))
             f.debug(tb_str)
-            cfg.conn.close()
+            close_connection()
             return cons.ExitCodes.GENERIC_ERROR.value
+        finally:
+            close_async_connections()
+            if cfg.checkpoint is not None:
+                cfg.checkpoint.close()
+                cfg.checkpoint = None
+            if cfg.manifest is not None:
+                cfg.manifest.close()
+                cfg.manifest = None
 
 
-def generate_table_sql(file_names, column_data_type):
+def generate_table_sql(file_names, column_data_type, infer_types=False, sample_rows=0):
     """Generates SQL for the table to load data.
 
     Parameters
@@ -232,20 +362,172 @@ def generate_table_sql(file_names, column_data_type):
         The file_names to scan for columns
     column_data_type : str
         The column data type to use
+    infer_types : bool
+        Whether to infer the data type of each column from the data rows
+    sample_rows : int
+        The number of data rows per file to infer the data types from, 0 to read all data rows
+    """
+    # Columns in order of appearance, dictionaries keep the insertion order
+    col_stats = {}
+    for columns_to_add, stats in scan_files(file_names, infer_types, sample_rows):
+        f.debug("Columns to add {0}".format(columns_to_add))
+        # Add columns implicitly removing duplicates for when going over multiple files
+        for col, column_stats in zip(columns_to_add, stats):
+            if col not in col_stats:
+                col_stats[col] = column_stats
+            elif column_stats is not None:
+                col_stats[col].merge(column_stats)
+    col_list = list(col_stats)
+    col_types = None
+    if infer_types:
+        col_types = {col: col_stats[col].get_data_type(cfg.db_type, column_data_type) for col in col_list}
+        f.debug("Column types: {0}".format(col_types))
+    print_table_and_columns(col_list, column_data_type, col_types)
+
+
+def scan_files(file_names, infer_types=False, sample_rows=0):
+    """Scans the header and, if requested, the column statistics of all files.
+
+    With --parallel, multiple files are scanned in parallel by a pool of worker processes.
+    Otherwise, only several large files whose data rows are all read are scanned in parallel,
+    one worker per CPU, as starting the workers takes longer than scanning a few or small files.
+    The members of a compressed tar archive are scanned together, in one pass over the archive.
+
+    Parameters
+    ----------
+    file_names : [str,]
+        The file names to scan
+    infer_types : bool
+        Whether to collect the column statistics from the data rows
+    sample_rows : int
+        The number of data rows per file to collect the statistics from, 0 to read all data rows
+
+    Returns
+    -------
+    [([str,], [inference.ColumnStats,]),]
+        The columns and the column statistics of each file, in the order of the file names.
     """
-    col_list = []
+    workers = min(get_scan_workers(file_names, infer_types, sample_rows), len(file_names))
+    if workers <= 1:
+        return [result for file_name in file_names for result in scan_entry(file_name, infer_types, sample_rows)]
+    f.verbose("Scanning {0} file(s) with {1} parallel workers.".format(len(file_names), workers))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=f.set_config,
+                                                initargs=(f.get_config(),)) as executor:
+        # Hand out the files in chunks to keep the overhead low for many small files
+        results = executor.map(scan_entry, file_names, itertools.repeat(infer_types),
+                               itertools.repeat(sample_rows), chunksize=max(len(file_names) // (workers * 4), 1))
+        return [result for entry_results in results for result in entry_results]
+
+
+def get_scan_workers(file_names, infer_types=False, sample_rows=0):
+    """Returns the number of worker processes to scan the files with.
+
+    Parameters
+    ----------
+    file_names : [str,]
+        The file names to scan
+    infer_types : bool
+        Whether to collect the column statistics from the data rows
+    sample_rows : int
+        The number of data rows per file to collect the statistics from, 0 to read all data rows
+
+    Returns
+    -------
+    int
+        The number of worker processes, 1 to scan the files in this process.
+    """
+    if cfg.parallel > 0:
+        return cfg.parallel
+    # Only the header and the sample rows are read otherwise, regardless of the size of a file
+    if not infer_types or sample_rows > 0:
+        return 1
+    large_files = 0
     for file_name in file_names:
+        if f.is_stream(file_name):
+            continue
+        try:
+            if os.path.getsize(f.split_archive_member(file_name)[0]) >= f.PARALLEL_SCAN_MIN_SIZE:
+                large_files += 1
+        # Leave the error reporting to scanning the file
+        except OSError:
+            pass
+    return (os.cpu_count() or 1) if large_files > 1 else 1
+
+
+def scan_entry(file_name, infer_types=False, sample_rows=0):
+    """Scans a file or, for a compressed tar archive, all members to load in one pass over the archive.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name to scan
+    infer_types : bool
+        Whether to collect the column statistics from the data rows
+    sample_rows : int
+        The number of data rows per file to collect the statistics from, 0 to read all data rows
+
+    Returns
+    -------
+    [([str,], [inference.ColumnStats,]),]
+        The columns and the column statistics of the file or of each member of the archive.
+    """
+    if not f.is_compressed_tar(file_name):
+        return [scan_file(file_name, infer_types, sample_rows)]
+    return [scan_file(file_name + "/" + member_name, infer_types, sample_rows)
+            for member_name in compression.iter_tar_members(file_name) if f.is_member_to_load(member_name)]
+
+
+def scan_file(file_name, infer_types=False, sample_rows=0):
+    """Scans the header and, if requested, the column statistics of a file.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name to scan
+    infer_types : bool
+        Whether to collect the column statistics from the data rows
+    sample_rows : int
+        The number of data rows to collect the statistics from, 0 to read all data rows
+
+    Returns
+    -------
+    ([str,], [inference.ColumnStats,])
+        The columns of the file and their statistics, the statistics are None if types are not inferred.
+
+    Raises
+    ------
+    ValueError
+        If the file is empty
+    """
+    header_cache = None
+    # Streams have no fingerprint to detect a change
+    if cfg.cache_dir is not None and not f.is_stream(file_name):
+        header_cache = cache.HeaderCache(cfg.cache_dir)
+    header, stats = None, None
+    if header_cache is not None:
+        header, stats = header_cache.get(file_name, sample_rows if infer_types else None)
+    if header is not None:
+        f.debug("Using cached header of file {0}".format(file_name))
+        columns = f.parse_header(header)
+    else:
         f.debug("Reading file {0}".format(file_name))
         with f.open_file(file_name) as file:
             reader = f.get_csv_reader(file)
-            columns_to_add = f.read_header(reader)
-            f.debug("Columns to add {0}".format(columns_to_add))
-            # Add columns to list implicitly removing duplicates for when going over multiple files
-            col_list.extend(col for col in columns_to_add if col not in col_list)
-    print_table_and_columns(col_list, column_data_type)
-
-
-def print_table_and_columns(col_list, column_data_type):
+            # A StopIteration would silently end the iteration over the scanned files
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("File is empty: {0}".format(file_name))
+            columns = f.parse_header(header)
+            if infer_types:
+                stats = inference.infer_column_stats(reader, columns, sample_rows)
+        if header_cache is not None:
+            header_cache.put(file_name, header, stats, sample_rows)
+    return columns, stats if stats is not None else [None] * len(columns)
+
+
+def print_table_and_columns(col_list, column_data_type, col_types=None):
     """Prints the SQL CREATE TABLE statement to stdout.
 
     Parameters
@@ -254,6 +536,8 @@ def print_table_and_columns(col_list, column_data_type):
         The column list for the table
     column_data_type : str
         The data type to use for all columns
+    col_types : {str: str}
+        The data type to use per column, overriding column_data_type
     """
     if cfg.table_name is not None:
         print("CREATE TABLE {0}".format(cfg.table_name))
@@ -262,65 +546,911 @@ def print_table_and_columns(col_list, column_data_type):
     print("(")
     cols = ""
     for col in col_list:
-        cols += "  " + col + " " + column_data_type + ",\n"
+        cols += "  " + col + " " + (col_types[col] if col_types is not None else column_data_type) + ",\n"
     cols = cols[:-2]
     print(cols)
     print(");")
     print()
 
 
-def load_files(file_names):
+def watch_files(pattern, interval, settle, polling):
+    """Watches a directory and loads every file once it has been written, until interrupted.
+
+    All files are loaded over the same database connection, which is reopened if it has been lost.
+    With --parallel, the pool of worker processes is kept for the whole watch session.
+
+    Parameters
+    ----------
+    pattern : str
+        The directory or file pattern within a directory to watch
+    interval : float
+        The number of seconds between two checks of the directory
+    settle : float
+        The number of seconds the size of a file must not change before it is loaded,
+        if it is not known whether the file has been closed
+    polling : bool
+        Whether to poll the directory even if inotify is available
+    """
+    directory_watcher = watcher.DirectoryWatcher(pattern, interval, settle, polling)
+    if directory_watcher.file_pattern is None:
+        print("Watching for CSV files in '{0}', press Ctrl+C to stop.".format(directory_watcher.directory))
+    else:
+        print("Watching for files '{0}', press Ctrl+C to stop.".format(
+            os.path.join(directory_watcher.directory, directory_watcher.file_pattern)))
+    executor = get_load_executor(cfg.parallel) if cfg.parallel > 1 else None
+    try:
+        for file_name in directory_watcher.watch():
+            file_names = f.get_archive_members(file_name)
+            try:
+                load_files(file_names, executor)
+            except concurrent.futures.process.BrokenProcessPool:
+                f.error("The worker processes have terminated unexpectedly, starting new ones.")
+                executor.shutdown(wait=False)
+                executor = get_load_executor(cfg.parallel)
+                load_files(file_names, executor)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    finally:
+        directory_watcher.close()
+        if executor is not None:
+            executor.shutdown()
+
+
+def load_files(file_names, executor=None):
     """Loads all files into the database.
 
     file_names : str
         All the file names to load into the database
+    executor : concurrent.futures.ProcessPoolExecutor
+        The pool of worker processes to load the files in parallel with, if it is kept between loads
     """
-    for file_name in file_names:
-        print()
-        print("Loading file {0}".format(file_name))
-        f.debug("Opening file handler for '{0}'".format(file_name))
+    if cfg.checkpoint is not None or cfg.manifest is not None:
+        file_names = skip_loaded_files(file_names)
+    if cfg.parallel > 1 and (len(file_names) > 1 or cfg.chunk_size > 0):
+        load_files_parallel(file_names, executor)
+    else:
         try:
-            # Open file (will check whether file can be read)
-            with f.open_file(file_name) as file:
-                try:
-                    read_and_load_file(file)
-                    print("File loaded.")
-                except StopIteration:
-                    print("File is empty: {0}".format(file_name))
-                # Catch any unanticipated exceptions and report stack trace
-                except Exception:
-                    f.error("Error while loading file into table: {0}".format(file.name))
-                    exception, traceback = f.get_exception_details()
-                    f.error(exception)
-                    f.debug(traceback)
+            for file_name in file_names:
+                if not load_file(file_name):
                     cfg.data_loading_error = True
-                    print("Skipping file.")
-        except UnicodeDecodeError:
-            f.error("File is not UTF-8 encoded or in a UTF-8 compatible encoding: {0}".format(file_name))
-            f.error("Please specify the encoding that should be used via the '--encoding' parameter.")
-            cfg.data_loading_error = True
-            print("Skipping file.")
-        print()
+                else:
+                    record_loaded_file(file_name)
+        finally:
+            # The members of a tar archive are read in one pass, keeping the archive open in between
+            compression.close_tar_reader()
+
+
+def skip_loaded_files(file_names):
+    """Returns the files that have not been loaded yet according to the checkpoint journal and the manifest.
+
+    Parameters
+    ----------
+    file_names : [str,]
+        All the file names to load into the database
+
+    Returns
+    -------
+    [str,]
+        The file names still to load.
+    """
+    files_to_load = []
+    for file_name in file_names:
+        if cfg.checkpoint is not None and cfg.checkpoint.is_done(file_name):
+            print("Skipping file {0}, it has already been loaded.".format(file_name))
+        elif cfg.manifest is not None and cfg.manifest.is_loaded(file_name):
+            print("Skipping file {0}, it has not changed since it has been loaded.".format(file_name))
+        else:
+            files_to_load.append(file_name)
+    return files_to_load
+
+
+def record_loaded_file(file_name):
+    """Records a completely loaded file in the checkpoint journal and the manifest.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name that has been loaded
+    """
+    if cfg.checkpoint is not None:
+        cfg.checkpoint.record(file_name, cfg.rows_read, done=True)
+    # Named pipes cannot be read again to calculate their checksum
+    if cfg.manifest is not None and not f.is_stream(file_name):
+        cfg.manifest.record(file_name)
+
+
+def load_file(file_name, chunk=None, col_map=None):
+    """Loads a file into the database.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name to load into the database
+    chunk : (int, int, int)
+        The part number, start and end byte offset, if only a chunk of the file should be loaded
+    col_map : [str,]
+        The columns to load the data into, if the header has already been read
+
+    Returns
+    -------
+    bool
+        True if the file has been loaded without errors, otherwise False.
+    """
+    if chunk is None and f.is_compressed_tar(file_name):
+        return load_tar_archive(file_name)
+    loaded = True
+    print()
+    if chunk is None:
+        print("Loading file {0}".format(file_name))
+    else:
+        print("Loading file {0} part {1}".format(file_name, chunk[0]))
+    f.debug("Opening file handler for '{0}'".format(file_name))
+    cfg.current_file = file_name
+    cfg.rows_read = 0
+    try:
+        # Open file (will check whether file can be read)
+        with f.open_file(file_name) if chunk is None else f.open_file_range(file_name, *chunk) as file:
+            try:
+                read_and_load_file(file, col_map)
+                print("File loaded.")
+            except StopIteration:
+                print("File is empty: {0}".format(file_name))
+            # Catch any unanticipated exceptions and report stack trace
+            except Exception as err:
+                f.error("Error while loading file into table: {0}".format(file.name))
+                exception, traceback = f.get_exception_details()
+                f.error(exception)
+                f.debug(traceback)
+                loaded = False
+                print("Skipping file.")
+                if f.is_connection_error(err):
+                    reset_connections()
+    except UnicodeDecodeError:
+        f.error("File is not UTF-8 encoded or in a UTF-8 compatible encoding: {0}".format(file_name))
+        f.error("Please specify the encoding that should be used via the '--encoding' parameter.")
+        loaded = False
+        print("Skipping file.")
+    print()
+    return loaded
+
+
+def load_tar_archive(file_name):
+    """Loads the members of a compressed tar archive into the database.
+
+    The members are listed in the same pass they are read in, so the archive is decompressed only once.
+
+    Parameters
+    ----------
+    file_name : str
+        The compressed tar archive to load into the database
+
+    Returns
+    -------
+    bool
+        True if all members have been loaded without errors, otherwise False.
+    """
+    loaded = True
+    try:
+        for member_name in compression.iter_tar_members(file_name):
+            if not f.is_member_to_load(member_name):
+                continue
+            member_file_name = file_name + "/" + member_name
+            if cfg.checkpoint is not None or cfg.manifest is not None:
+                if not skip_loaded_files([member_file_name]):
+                    continue
+            if load_file(member_file_name):
+                record_loaded_file(member_file_name)
+            else:
+                loaded = False
+    except (tarfile.TarError, OSError, ImportError) as err:
+        f.error("Error while reading archive {0}: {1}".format(file_name, err))
+        loaded = False
+    return loaded
+
+
+def get_load_tasks(file_names):
+    """Returns the tasks to load all files.
+
+    A task either loads an entire file or, if chunk size is set, a chunk of a plain text file.
+    All chunks of a file share the header which is read only once.
+
+    Parameters
+    ----------
+    file_names : [str,]
+        All the file names to load into the database
+
+    Returns
+    -------
+    [(str, (int, int, int), [str,]),]
+        A list of tasks consisting of file name, chunk and column map.
+    """
+    tasks = []
+    for file_name in file_names:
+        chunks = []
+        col_map = None
+        if cfg.chunk_size > 0 and f.is_splittable(file_name) and os.path.getsize(file_name) > cfg.chunk_size:
+            try:
+                with f.open_file(file_name) as file:
+                    col_map = f.read_header(f.get_csv_reader(file))
+                chunks = f.split_file(file_name, cfg.chunk_size)
+            # Leave the error reporting of unreadable files to the loading of the entire file
+            except (UnicodeDecodeError, StopIteration, NameError):
+                chunks = []
+        if len(chunks) > 1:
+            f.debug("Splitting file '{0}' into {1} chunks".format(file_name, len(chunks)))
+            tasks.extend((file_name, (part, start, end), col_map)
+                         for part, (start, end) in enumerate(chunks, start=1))
+        else:
+            tasks.append((file_name, None, None))
+    return tasks
+
+
+def load_files_parallel(file_names, executor=None):
+    """Loads all files into the database using a pool of worker processes.
+
+    Every worker process opens its own database connection once and reuses it for all its tasks.
+
+    Parameters
+    ----------
+    file_names : [str,]
+        All the file names to load into the database
+    executor : concurrent.futures.ProcessPoolExecutor
+        The pool of worker processes to use, if None a pool is started for these files only
+    """
+    tasks = get_load_tasks(file_names)
+    workers = min(cfg.parallel, len(tasks))
+    f.verbose("Loading {0} file(s) in {1} task(s) with {2} parallel workers.".format(len(file_names),
+                                                                                     len(tasks), workers))
+    if executor is None:
+        with get_load_executor(workers) as executor:
+            load_tasks_parallel(file_names, tasks, executor)
+    else:
+        load_tasks_parallel(file_names, tasks, executor)
+
+
+def get_load_executor(workers):
+    """Returns a pool of worker processes for loading files.
+
+    Parameters
+    ----------
+    workers : int
+        The number of worker processes
 
+    Returns
+    -------
+    concurrent.futures.ProcessPoolExecutor
+        The pool of worker processes.
+    """
+    # Always spawn fresh worker processes, forked processes would share the socket of the main connection
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                  mp_context=multiprocessing.get_context("spawn"),
+                                                  initializer=init_load_worker,
+                                                  initargs=(f.get_config(),))
+
+
+def load_tasks_parallel(file_names, tasks, executor):
+    """Loads the tasks of all files in a pool of worker processes and reports the result per file.
+
+    Parameters
+    ----------
+    file_names : [str,]
+        All the file names to load into the database
+    tasks : [(str, (int, int, int), [str,]),]
+        The tasks to load all files, as returned by get_load_tasks()
+    executor : concurrent.futures.ProcessPoolExecutor
+        The pool of worker processes to use
+    """
+    # Remember the outstanding tasks of every file to report the result per file
+    tasks_left = {file_name: 0 for file_name in file_names}
+    failed_files = set()
+    for file_name, chunk, col_map in tasks:
+        tasks_left[file_name] += 1
+    futures = {executor.submit(load_file_worker, file_name, chunk, col_map): file_name
+               for file_name, chunk, col_map in tasks}
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            file_name = futures[future]
+            try:
+                loaded = future.result()
+            except Exception:
+                exception, tb_str = f.get_exception_details()
+                f.error("Error in worker loading file {0}: {1}".format(file_name, exception))
+                f.debug(tb_str)
+                loaded = False
+            if not loaded:
+                failed_files.add(file_name)
+            tasks_left[file_name] -= 1
+            if tasks_left[file_name] > 0:
+                continue
+            if file_name not in failed_files:
+                print("Finished loading file {0}".format(file_name))
+                record_loaded_file(file_name)
+            else:
+                f.error("Failed loading file {0}".format(file_name))
+                cfg.data_loading_error = True
+    except KeyboardInterrupt:
+        for future in futures:
+            future.cancel()
+        raise
+
+
+def init_load_worker(config):
+    """Initializes a worker process for loading files.
+
+    The worker opens its database connection, or its asynchronous connections with --async, once
+    and reuses them for all the files or chunks it loads. They are closed when the worker process exits.
 
-def read_and_load_file(file):
+    Parameters
+    ----------
+    config : dict
+        The snapshot of the global configuration
+    """
+    f.set_config(config)
+    atexit.register(close_load_worker)
+    if cfg.async_connections > 0:
+        open_async_connections()
+    else:
+        cfg.conn = f.get_db_connection(cfg.db_type, **cfg.db_connection_details)
+
+
+def close_load_worker():
+    """Closes the database connections of a worker process."""
+    close_async_connections()
+    close_connection()
+
+
+def load_file_worker(file_name, chunk=None, col_map=None):
+    """Loads a file or a chunk of a file into the database within a worker process.
+
+    The worker uses the database connection opened by init_load_worker.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name to load into the database
+    chunk : (int, int, int)
+        The part number, start and end byte offset, if only a chunk of the file should be loaded
+    col_map : [str,]
+        The columns to load the data into, if the header has already been read
+
+    Returns
+    -------
+    bool
+        True if the file has been loaded without errors, otherwise False.
+    """
+    return load_file(file_name, chunk, col_map)
+
+
+def read_and_load_file(file, col_map=None):
     """Reads and loads file.
 
     Parameters
     ----------
     file : file_object
         The file to load
+    col_map : [str,]
+        The columns to load the data into. If None, the columns are read from the header of the file.
     """
+    # The pyarrow reader may already log invalid rows while opening the file
+    if cfg.log_bad_records:
+        cfg.bad_records_logger = f.BadRecordLogger(file.name + f.BAD_FILE_EXTENSION)
     reader = f.get_csv_reader(file)
-    col_map = f.read_header(reader)
+    if col_map is None:
+        col_map = f.read_header(reader)
     f.debug("Column map: {0}".format(col_map))
-    if cfg.log_bad_records:
-        cfg.bad_records_logger = f.BadRecordLogger(file.name + ".bad")
-    for line in reader:
-        load_data(col_map, line)
-    load_data(col_map, None)
+    # Fail before loading any data if the columns don't match the table
+    cfg.table_metadata.validate_header(col_map)
+    if cfg.checkpoint is not None:
+        skip_loaded_rows(reader)
+    cfg.input_data = f.BatchBuffer(cfg.batch_size)
+    # Reopen the connection if it has been lost while loading a previous file
+    if cfg.async_connections == 0:
+        open_connection()
+    if cfg.async_connections > 0:
+        open_async_connections()
+        cfg.async_loop.run_until_complete(load_data_async(col_map, reader))
+    elif cfg.pipeline_depth > 0:
+        load_data_pipelined(col_map, reader)
+    elif isinstance(reader, readers.ArrowReader) and cfg.batch_bytes == 0:
+        load_blocks(col_map, reader)
+    else:
+        for line in reader:
+            cfg.rows_read += 1
+            load_data(col_map, line)
+        load_data(col_map, None)
+    cfg.input_data = None
     if cfg.log_bad_records:
         cfg.bad_records_logger.close()
+    if cfg.batch_tuner is not None:
+        f.verbose("Batch size settled at {0} rows.".format(cfg.batch_size))
+
+
+def load_blocks(col_map, reader):
+    """Loads the data block by block, as parsed by the pyarrow reader.
+
+    The rows of a block are added to the batch at once, instead of row by row.
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    reader : csv2db.readers.ArrowReader
+        The pyarrow reader to read the data from
+    """
+    block = reader.read_block()
+    while block is not None:
+        start = 0
+        while start < len(block):
+            end = min(start + cfg.batch_size - len(cfg.input_data), len(block))
+            cfg.input_data.extend(block[start:end])
+            cfg.rows_read += end - start
+            start = end
+            if is_batch_full(len(cfg.input_data), 0):
+                flush_data(col_map, True)
+        block = reader.read_block()
+    if len(cfg.input_data) > 0:
+        flush_data(col_map, False)
+
+
+def skip_loaded_rows(reader):
+    """Skips the data rows of the current file that have already been committed according to the checkpoint journal.
+
+    Parameters
+    ----------
+    reader : _csv.reader
+        The CSV Reader object to read the data from, positioned after the header
+    """
+    rows = cfg.checkpoint.get_rows(cfg.current_file)
+    if rows > 0:
+        f.verbose("Skipping {0} rows already loaded.".format(rows))
+        cfg.rows_read = sum(1 for line in itertools.islice(reader, rows))
+
+
+def load_data_pipelined(col_map, reader):
+    """Loads the data into the database while the next batches are parsed in a separate thread.
+
+    The parser thread puts the parsed batches into a queue of the configured pipeline depth.
+    Once the queue is full, the parser thread waits until a batch has been loaded.
+    Loaded batch buffers are handed back to the parser thread to be filled again.
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    reader : _csv.reader
+        The CSV Reader object to read the data from
+    """
+    batches = queue.Queue(maxsize=cfg.pipeline_depth)
+    # One buffer per queue slot, plus the ones being filled and loaded
+    buffers = queue.Queue()
+    for i in range(cfg.pipeline_depth + 2):
+        buffers.put(f.BatchBuffer(cfg.batch_size))
+    stop = threading.Event()
+    parser = threading.Thread(target=parse_batches, args=(col_map, reader, batches, buffers, stop), daemon=True)
+    parser.start()
+    try:
+        while True:
+            batch = batches.get()
+            # End of file
+            if batch is None:
+                break
+            # Parsing error
+            if isinstance(batch, Exception):
+                raise batch
+            cfg.input_data = batch
+            cfg.rows_read = batch.end_row
+            flush_data(col_map, batch.full)
+            buffers.put(batch)
+    finally:
+        stop.set()
+        parser.join()
+
+
+def parse_batches(col_map, reader, batches, buffers, stop):
+    """Parses the data into batches and puts them into the queue.
+
+    The end of the data is signaled by putting None into the queue, a parsing error by putting the exception.
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    reader : _csv.reader
+        The CSV Reader object to read the data from
+    batches : queue.Queue
+        The queue to put the batches into
+    buffers : queue.Queue
+        The queue of the free batch buffers to fill
+    stop : threading.Event
+        The event signaling the parser to stop, i.e. when loading failed
+    """
+    batch = buffers.get()
+    rows_read = cfg.rows_read
+    try:
+        for line in reader:
+            if stop.is_set():
+                return
+            rows_read += 1
+            if len(line) > 0:
+                append_record(batch, prepare_record(col_map, line))
+            if is_batch_full(len(batch), batch.size):
+                batch.end_row = rows_read
+                batch.full = True
+                put_batch(batches, batch, stop)
+                batch = get_buffer(buffers, stop)
+                if batch is None:
+                    return
+        if len(batch) > 0:
+            batch.end_row = rows_read
+            batch.full = False
+            put_batch(batches, batch, stop)
+        put_batch(batches, None, stop)
+    except Exception as err:
+        put_batch(batches, err, stop)
+
+
+def put_batch(batches, batch, stop):
+    """Puts a batch into the queue, waiting for a free slot unless the parser is stopped.
+
+    Parameters
+    ----------
+    batches : queue.Queue
+        The queue to put the batch into
+    batch : csv2db.functions.BatchBuffer
+        The batch to put into the queue
+    stop : threading.Event
+        The event signaling the parser to stop
+    """
+    while not stop.is_set():
+        try:
+            batches.put(batch, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def get_buffer(buffers, stop):
+    """Gets a free batch buffer, waiting for a loaded one to be handed back unless the parser is stopped.
+
+    Parameters
+    ----------
+    buffers : queue.Queue
+        The queue of the free batch buffers
+    stop : threading.Event
+        The event signaling the parser to stop
+
+    Returns
+    -------
+    csv2db.functions.BatchBuffer
+        The cleared batch buffer, or None if the parser has been stopped.
+    """
+    while not stop.is_set():
+        try:
+            return buffers.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return None
+
+
+def open_connection():
+    """Opens the database connection, if it is not open, i.e. after it has been lost."""
+    if cfg.conn is None:
+        f.verbose("Establishing database connection.")
+        cfg.conn = f.get_db_connection(cfg.db_type, **cfg.db_connection_details)
+
+
+def close_connection():
+    """Closes the database connection, if it is open."""
+    if cfg.conn is not None:
+        cfg.conn.close()
+        cfg.conn = None
+
+
+def reset_connections():
+    """Drops the database connections after the connection has been lost.
+
+    The connections are opened again for the next file, so that a long-running load,
+    i.e. watching a directory, survives a database restart or network outage.
+    """
+    f.verbose("Database connection lost, reconnecting for the next file.")
+    try:
+        close_async_connections()
+    except Exception:
+        cfg.async_loop = None
+        cfg.async_conns = []
+    try:
+        close_connection()
+    except Exception:
+        cfg.conn = None
+
+
+def open_async_connections():
+    """Opens the asynchronous database connections, if they are not open yet.
+
+    The connections are opened once per process and reused for all files.
+    As they are bound to the event loop they are opened in, the event loop is kept along with them.
+    """
+    if cfg.async_loop is not None:
+        return
+    f.verbose("Establishing {0} asynchronous database connection(s).".format(cfg.async_connections))
+    cfg.async_loop = asyncio.new_event_loop()
+    try:
+        for _ in range(cfg.async_connections):
+            cfg.async_conns.append(cfg.async_loop.run_until_complete(
+                f.get_async_db_connection(cfg.db_type, **cfg.db_connection_details)))
+    except Exception:
+        close_async_connections()
+        raise
+
+
+def close_async_connections():
+    """Closes the asynchronous database connections and their event loop, if they are open."""
+    if cfg.async_loop is None:
+        return
+    f.verbose("Closing asynchronous database connection(s).")
+    try:
+        for conn in cfg.async_conns:
+            cfg.async_loop.run_until_complete(conn.close())
+    finally:
+        cfg.async_loop.close()
+        cfg.async_loop = None
+        cfg.async_conns = []
+
+
+async def load_data_async(col_map, reader):
+    """Loads the data into the database asynchronously.
+
+    The batches are loaded over the asynchronous connections at the same time,
+    while the next batch is parsed in a separate thread.
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    reader : _csv.reader
+        The CSV Reader object to read the data from
+    """
+    stmt = get_statement(col_map)
+    loop = asyncio.get_running_loop()
+    # Keep at most one parsed batch per connection waiting
+    batches = asyncio.Queue(maxsize=cfg.async_connections)
+    errors = []
+    loaders = [asyncio.ensure_future(load_batches_async(conn, stmt, col_map, batches, errors))
+               for conn in cfg.async_conns]
+    while not errors:
+        batch = await loop.run_in_executor(None, read_batch, col_map, reader)
+        if len(batch[0]) == 0:
+            break
+        await batches.put(batch)
+    for _ in loaders:
+        await batches.put(None)
+    await asyncio.gather(*loaders)
+    if errors:
+        raise errors[0]
+
+
+def read_batch(col_map, reader):
+    """Reads the next batch of records.
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    reader : _csv.reader
+        The CSV Reader object to read the data from
+
+    Returns
+    -------
+    ([tuple,], [(str,),], bool)
+        The converted records of the batch, the records as read from the file, empty lists at the end of the file,
+        and whether the batch is full, i.e. not the last, partial batch of the file.
+    """
+    batch = f.BatchBuffer(cfg.batch_size)
+    for line in reader:
+        if len(line) > 0:
+            append_record(batch, prepare_record(col_map, line))
+        if is_batch_full(len(batch), batch.size):
+            batch.full = True
+            break
+    raw_data = batch.records()
+    # Convert the batch in the parser thread, while the previous batches are loaded
+    return convert_data(col_map, raw_data), raw_data, batch.full
+
+
+async def load_batches_async(conn, stmt, col_map, batches, errors):
+    """Loads the batches of the queue over an asynchronous connection until None is received.
+
+    Once a batch has failed, all further batches are discarded.
+
+    Parameters
+    ----------
+    conn
+        The asynchronous database connection to use
+    stmt : str
+        The INSERT statement
+    col_map : [str,]
+        The columns to load the data into
+    batches : asyncio.Queue
+        The queue to take the batches from
+    errors : [Exception,]
+        The list to add the error of a failed batch to
+    """
+    while True:
+        batch = await batches.get()
+        if batch is None:
+            return
+        if errors:
+            continue
+        try:
+            await flush_data_async(conn, stmt, col_map, *batch)
+        except Exception as err:
+            errors.append(err)
+
+
+async def flush_data_async(conn, stmt, col_map, data, raw_data, full):
+    """Loads a batch of records into the database over an asynchronous connection.
+
+    Parameters
+    ----------
+    conn
+        The asynchronous database connection to use
+    stmt : str
+        The INSERT statement
+    col_map : [str,]
+        The columns to load the data into
+    data : [tuple,]
+        The records to load
+    raw_data : [(str,),]
+        The records as read from the file, to log the invalid records as they are
+    full : bool
+        Whether the batch is full, i.e. not the last, partial batch of a file
+    """
+    start = time.perf_counter()
+    cur = conn.cursor()
+    records_ignored = 0
+    try:
+        # Oracle can skip invalid records within the batch itself, unless direct path is used
+        if cfg.ignore_errors and cfg.db_type is cons.DBType.ORACLE and not cfg.direct_path:
+            set_input_sizes(cur, col_map)
+            await cur.executemany(stmt, data, batcherrors=True)
+            records_ignored = handle_batch_errors(raw_data, cur.getbatcherrors())
+        else:
+            await execute_batch_async(cur, stmt, col_map, data)
+        await close_async(cur)
+        f.debug("Commit")
+        await conn.commit()
+        f.verbose("{0} rows loaded.".format(len(data) - records_ignored))
+        if records_ignored > 0:
+            f.verbose("{0} rows ignored.".format(records_ignored))
+        if cfg.batch_tuner is not None:
+            cfg.batch_size = cfg.batch_tuner.record(len(data),
+                                                    f.get_batch_size_estimate(data),
+                                                    time.perf_counter() - start,
+                                                    full)
+    except Exception as err:
+        f.verbose("Error executing batch.")
+        f.debug("Rollback current batch.")
+        await close_async(cur)
+        await conn.rollback()
+        # If neither ignore nor debug output is enabled, raise error
+        if not cfg.ignore_errors and not cfg.debug:
+            raise err
+        f.verbose("Isolating invalid records in batch.")
+        records_loaded, records_ignored = await load_records_bisect_async(conn, stmt, col_map, data, raw_data)
+        f.debug("Commit")
+        await conn.commit()
+        f.verbose("{0} rows loaded.".format(records_loaded))
+        f.verbose("{0} rows ignored.".format(records_ignored))
+
+
+async def load_records_bisect_async(conn, stmt, col_map, data, raw_data):
+    """Loads records of a failed batch and isolates the invalid records over an asynchronous connection.
+
+    See load_records_bisect() for details.
+
+    Parameters
+    ----------
+    conn
+        The asynchronous database connection to use
+    stmt : str
+        The INSERT statement
+    col_map : [str,]
+        The columns to load the data into
+    data : [tuple,]
+        The records to load
+    raw_data : [(str,),]
+        The records as read from the file, to log the invalid records as they are
+
+    Returns
+    -------
+    (int, int)
+        The number of records loaded and ignored.
+
+    Raises
+    ------
+    Exception
+        The error of the first invalid record, if ignore errors is not set.
+    """
+    savepoint, rollback_to_savepoint = get_savepoint_statements()
+    records_loaded = 0
+    records_ignored = 0
+    pending = [(0, len(data))]
+    while pending:
+        start, end = pending.pop()
+        records = data[start:end]
+        cur = conn.cursor()
+        try:
+            if savepoint is not None:
+                await cur.execute(savepoint)
+            await execute_batch_async(cur, stmt, col_map, records)
+            await close_async(cur)
+            if savepoint is None:
+                f.debug("Commit")
+                await conn.commit()
+            records_loaded += len(records)
+        except Exception as err:
+            await close_async(cur)
+            if savepoint is not None:
+                f.debug("Rollback to savepoint")
+                cur = conn.cursor()
+                await cur.execute(rollback_to_savepoint)
+                await close_async(cur)
+            else:
+                f.debug("Rollback")
+                await conn.rollback()
+            if len(records) > 1:
+                middle = (start + end) // 2
+                pending.append((middle, end))
+                pending.append((start, middle))
+                continue
+            if not cfg.ignore_errors:
+                f.debug("Error with record: {0}".format(raw_data[start]))
+                f.debug("Error: {0}".format(err))
+                await conn.rollback()
+                raise err
+            handle_bad_record(raw_data[start], err)
+            records_ignored += 1
+    return records_loaded, records_ignored
+
+
+async def execute_batch_async(cur, stmt, col_map, data):
+    """Executes a batch of records over an asynchronous cursor.
+
+    Parameters
+    ----------
+    cur
+        The asynchronous database cursor to use
+    stmt : str
+        The INSERT statement
+    col_map : [str,]
+        The columns to load the data into
+    data : [(str,),]
+        The records to load
+    """
+    if cfg.bulk_load and cfg.db_type is cons.DBType.POSTGRES:
+        copy_stmt = generate_copy_statement(col_map)
+        f.debug(copy_stmt)
+        async with cur.copy(copy_stmt) as copy:
+            for record in data:
+                await copy.write_row(record)
+    else:
+        set_input_sizes(cur, col_map)
+        await cur.executemany(stmt, data)
+
+
+async def close_async(cur):
+    """Closes an asynchronous cursor.
+
+    Depending on the database driver, closing a cursor is either a coroutine or a regular method.
+
+    Parameters
+    ----------
+    cur
+        The asynchronous database cursor to close
+    """
+    result = cur.close()
+    if inspect.isawaitable(result):
+        await result
 
 
 def load_data(col_map, data):
@@ -334,98 +1464,477 @@ def load_data(col_map, data):
         The data to load. If data is None the array will be loaded and flushed.
     """
     if data is not None and len(data) > 0:
-        # If ignore errors is set and log bad records is not
-        # check whether the row has more values than the header
-        # If just ignore errors is set, ignore the additional records
-        # If log errors is set, leave the additional values so that the row will be logged as an invalid one
-        if cfg.ignore_errors and not cfg.log_bad_records:
-            while len(data) > len(col_map):
-                f.debug("Removing extra row value entry not present in the header.")
-                data.pop()
-        # tuple or dictionary only for SQL Server
-        cfg.input_data.append(tuple(data))
+        append_record(cfg.input_data, prepare_record(col_map, data))
 
     # If batch size has been reached or input array should be flushed
-    if (len(cfg.input_data) == cfg.batch_size) or (data is None and len(cfg.input_data) > 0):
-        f.debug("Executing statement:")
-        stmt = generate_statement(col_map)
-        f.debug(stmt)
+    full = is_batch_full(len(cfg.input_data), cfg.input_data.size)
+    if full or (data is None and len(cfg.input_data) > 0):
+        flush_data(col_map, full)
+
+
+def append_record(batch, record):
+    """Appends a record to a batch, estimating its size only if a batch memory limit is set.
+
+    Parameters
+    ----------
+    batch : csv2db.functions.BatchBuffer
+        The batch to append the record to
+    record : (str,)
+        The record to append
+    """
+    if cfg.batch_bytes > 0:
+        batch.append(record, f.get_record_size(record))
+    else:
+        batch.append(record)
+
+
+def is_batch_full(batch_rows, batch_bytes):
+    """Returns whether a batch is full and should be loaded.
+
+    A batch is full once it reached the batch size or, if set, the batch memory limit.
+
+    Parameters
+    ----------
+    batch_rows : int
+        The number of records in the batch
+    batch_bytes : int
+        The estimated in-memory size of the records in the batch
+
+    Returns
+    -------
+    bool
+        True if the batch is full, otherwise False.
+    """
+    return batch_rows >= cfg.batch_size or (cfg.batch_bytes > 0 and batch_bytes >= cfg.batch_bytes)
+
+
+def prepare_record(col_map, data):
+    """Prepares a record for loading.
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    data : [str,]
+        The values of the record
+
+    Returns
+    -------
+    (str,)
+        The record to load.
+    """
+    # If ignore errors is set and log bad records is not
+    # check whether the row has more values than the header
+    # If just ignore errors is set, ignore the additional records
+    # If log errors is set, leave the additional values so that the row will be logged as an invalid one
+    if cfg.ignore_errors and not cfg.log_bad_records:
+        while len(data) > len(col_map):
+            f.debug("Removing extra row value entry not present in the header.")
+            data.pop()
+    # tuple or dictionary only for SQL Server
+    return tuple(data)
+
+
+def flush_data(col_map, full):
+    """Loads all records of the input array into the database and clears the array.
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    full : bool
+        Whether the batch is full, i.e. not the last, partial batch of a file
+    """
+    stmt = get_statement(col_map)
+    # Invalid records are logged as they have been read from the file, not as converted
+    raw_data = cfg.input_data.records()
+    data = convert_data(col_map, raw_data)
+    start = time.perf_counter()
+    cur = cfg.conn.cursor()
+    errors = False
+    records_ignored = 0
+    try:
+        # Oracle can skip invalid records within the batch itself, unless direct path is used
+        if cfg.ignore_errors and cfg.db_type is cons.DBType.ORACLE and not cfg.direct_path:
+            records_ignored = execute_batch_with_batch_errors(cur, stmt, col_map, data, raw_data)
+        else:
+            execute_batch(cur, stmt, col_map, data)
+        cur.close()
+    # Catch batch execution exception
+    except Exception as err:
+        f.verbose("Error executing batch.")
+        errors = True
+        # Rollback old batch (needed for at least Postgres to finish transaction)
+        # Previous successful batches would have already been committed.
+        f.debug("Rollback current batch.")
+        cfg.conn.rollback()
+        cur.close()
+        # If neither ignore nor debug output is enabled, raise error
+        if not cfg.ignore_errors and not cfg.debug:
+            cfg.input_data.clear()
+            raise err
+        # If ignore errors or debug output is enabled, find failing record
+        # Avoid "else" for future maintainability
+        if cfg.ignore_errors or cfg.debug:
+            f.verbose("Isolating invalid records in batch.")
+            try:
+                records_loaded, records_ignored = load_records_bisect(stmt, col_map, data, raw_data)
+            except Exception as err:
+                cfg.input_data.clear()
+                raise err
+            f.verbose("{0} rows loaded.".format(records_loaded))
+            f.verbose("{0} rows ignored.".format(records_ignored))
+    f.debug("Commit")
+    cfg.conn.commit()
+    if cfg.checkpoint is not None:
+        cfg.checkpoint.record(cfg.current_file, cfg.rows_read)
+    # In the error case, we already printed how many rows were loaded and ignored
+    if not errors:
+        f.verbose("{0} rows loaded.".format(len(data) - records_ignored))
+        if records_ignored > 0:
+            f.verbose("{0} rows ignored.".format(records_ignored))
+        if cfg.batch_tuner is not None:
+            cfg.batch_size = cfg.batch_tuner.record(len(data),
+                                                    f.get_batch_size_estimate(data),
+                                                    time.perf_counter() - start,
+                                                    full)
+    # Always clear input array when errors or success
+    cfg.input_data.clear()
+
+
+def convert_data(col_map, data):
+    """Converts the values of a batch into the data types of the table columns, if requested.
+
+    The conversion functions are derived from the table metadata once per column map.
+    Bulk loads are not converted, as they transfer the data as text.
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    data : [(str,),]
+        The records to convert
+
+    Returns
+    -------
+    [tuple,]
+        The converted records, or the records themselves if they are not converted.
+    """
+    if not cfg.convert_types or cfg.bulk_load:
+        return data
+    return conversion.convert_records(cfg.table_metadata.get_converters(col_map), data)
+
+
+def load_records_bisect(stmt, col_map, data, raw_data):
+    """Loads records of a failed batch and isolates the invalid records.
+
+    The records are split in halves and each half is loaded at once.
+    Only the halves that fail are split further, until the invalid records are found.
+    Hence, a batch of n records with k invalid records only needs O(k log n) round trips.
+
+    A failed half is rolled back to a savepoint, if the database supports it.
+    Otherwise, every successful half is committed right away.
+
+    Parameters
+    ----------
+    stmt : str
+        The INSERT statement
+    col_map : [str,]
+        The columns to load the data into
+    data : [tuple,]
+        The records to load
+    raw_data : [(str,),]
+        The records as read from the file, to log the invalid records as they are
+
+    Returns
+    -------
+    (int, int)
+        The number of records loaded and ignored.
+
+    Raises
+    ------
+    Exception
+        The error of the first invalid record, if ignore errors is not set.
+    """
+    savepoint, rollback_to_savepoint = get_savepoint_statements()
+    records_loaded = 0
+    records_ignored = 0
+    # Process halves from left to right, so that the first invalid record is found first
+    pending = [(0, len(data))]
+    while pending:
+        start, end = pending.pop()
+        records = data[start:end]
+        # Get new cursor for every execution to avoid previous row variables name/number caching.
         cur = cfg.conn.cursor()
-        errors = False
         try:
-            cur.executemany(stmt, cfg.input_data)
+            if savepoint is not None:
+                cur.execute(savepoint)
+            execute_batch(cur, stmt, col_map, records)
             cur.close()
-        # Catch batch execution exception
+            if savepoint is None:
+                f.debug("Commit")
+                cfg.conn.commit()
+            records_loaded += len(records)
         except Exception as err:
-            f.verbose("Error executing batch.")
-            errors = True
-            # Rollback old batch (needed for at least Postgres to finish transaction)
-            # Previous successful batches would have already been committed.
-            f.debug("Rollback current batch.")
-            cfg.conn.rollback()
             cur.close()
-            # If neither ignore nor debug output is enabled, raise error
-            if not cfg.ignore_errors and not cfg.debug:
-                cfg.input_data.clear()
+            if savepoint is not None:
+                f.debug("Rollback to savepoint")
+                cur = cfg.conn.cursor()
+                cur.execute(rollback_to_savepoint)
+                cur.close()
+            else:
+                f.debug("Rollback")
+                cfg.conn.rollback()
+            if len(records) > 1:
+                middle = (start + end) // 2
+                pending.append((middle, end))
+                pending.append((start, middle))
+                continue
+            # If only DEBUG output is set, we are done.
+            # We found the bad record, told the user, time to rollback the batch and raise the error
+            if not cfg.ignore_errors:
+                f.debug("Error with record: {0}".format(raw_data[start]))
+                f.debug("Error: {0}".format(err))
+                cfg.conn.rollback()
                 raise err
-            # If ignore errors or debug output is enabled, find failing record
-            # Avoid "else" for future maintainability
-            if cfg.ignore_errors or cfg.debug:
-                f.verbose("Executing batch row by row.")
-                records_loaded = 0
-                records_ignored = 0
-                for record in cfg.input_data:
-                    try:
-                        # Get new cursor for every row to avoid previous row variables name/number caching.
-                        cur_err = cfg.conn.cursor()
-                        cur_err.execute(stmt, record)
-                        # Postgres doesn't support errors within transaction boundaries
-                        # Once there is an error in a transaction, that transaction needs to be ended
-                        # Hence, to get all the other successful rows into Postgres before an error
-                        # we commit here every successful row.
-                        # Likewise, it seems that SQL Server aborts any erroneous transaction implicitly,
-                        # so we want to commit every row that was successful.
-                        if cfg.db_type is cons.DBType.POSTGRES or cfg.db_type is cons.DBType.SQLSERVER:
-                            f.debug("Commit")
-                            cfg.conn.commit()
-                        cur_err.close()
-                        records_loaded += 1
-                    except Exception as err:
-                        cur_err.close()
-                        f.debug("Error with record: {0}".format(record))
-                        f.debug("Error: {0}".format(err))
-                        # If only DEBUG output is set, we are done.
-                        # We found the bad record, told the user, time to clear the batch and raise the error
-                        if not cfg.ignore_errors:
-                            cfg.input_data.clear()
-                            raise err
-                        else:
-                            f.verbose("Ignoring invalid record.")
-                            records_ignored += 1
-                            # Rollback the broken transaction for Postgres
-                            if cfg.db_type is cons.DBType.POSTGRES or cfg.db_type is cons.DBType.SQLSERVER:
-                                f.debug("Rollback")
-                                cfg.conn.rollback()
-                            # Ignore errors is implied with log bad errors
-                            # (there is no point logging bad errors if the program is about
-                            #  to abort on a bad error because ignore errors isn't set)
-                            if cfg.log_bad_records:
-                                f.verbose("Logging invalid record.")
-                                cfg.bad_records_logger.write_bad_record(record)
-                f.debug("Commit")
-                cfg.conn.commit()
-                f.verbose("{0} rows loaded.".format(records_loaded))
-                f.verbose("{0} rows ignored.".format(records_ignored))
-        # If errors occurred for Postgres or SQL Server, do not commit at end as all rows have already been
-        # committed one by one. SQL Server will throw an error when issuing a commit and no transaction is running
-        if not errors or (errors and cfg.db_type is not cons.DBType.POSTGRES and cfg.db_type is not cons.DBType.SQLSERVER):
-            f.debug("Commit")
-            cfg.conn.commit()
-        # In the error case, we already printed how many rows were loaded and ignored
-        if not errors:
-            f.verbose("{0} rows loaded.".format(len(cfg.input_data)))
-        # Always clear input array when errors or success
-        cfg.input_data.clear()
+            handle_bad_record(raw_data[start], err)
+            records_ignored += 1
+    return records_loaded, records_ignored
+
+
+def get_savepoint_statements():
+    """Returns the statements to set and to roll back to a savepoint.
+
+    SQL Server aborts erroneous transactions implicitly and Oracle doesn't allow
+    any further DML after a direct path INSERT within the same transaction,
+    so no savepoints are used for either.
+
+    Returns
+    -------
+    (str, str)
+        The SAVEPOINT and ROLLBACK TO SAVEPOINT statements, or (None, None) if savepoints shall not be used.
+    """
+    if cfg.db_type is cons.DBType.SQLSERVER or (cfg.db_type is cons.DBType.ORACLE and cfg.direct_path):
+        return None, None
+    elif cfg.db_type is cons.DBType.DB2:
+        return "SAVEPOINT csv2db ON ROLLBACK RETAIN CURSORS", "ROLLBACK TO SAVEPOINT csv2db"
+    else:
+        return "SAVEPOINT csv2db", "ROLLBACK TO SAVEPOINT csv2db"
+
+
+def execute_batch(cur, stmt, col_map, data):
+    """Executes a batch of records.
+
+    If bulk loading has been requested and is supported by the database,
+    the bulk loading interface of the database is used instead of the INSERT statement.
+
+    Parameters
+    ----------
+    cur
+        The database cursor to use
+    stmt : str
+        The INSERT statement
+    col_map : [str,]
+        The columns to load the data into
+    data : [(str,),]
+        The records to load
+    """
+    if cfg.bulk_load and cfg.db_type is cons.DBType.POSTGRES:
+        copy_stmt = generate_copy_statement(col_map)
+        f.debug(copy_stmt)
+        with cur.copy(copy_stmt) as copy:
+            for record in data:
+                copy.write_row(record)
+    elif cfg.bulk_load and cfg.db_type is cons.DBType.MYSQL:
+        execute_load_data(cur, col_map, data)
+    elif cfg.bulk_load and cfg.db_type is cons.DBType.SQLSERVER:
+        column_ids = cfg.table_metadata.get_column_ids(col_map)
+        f.debug("Bulk copy into columns: {0}".format(column_ids))
+        # Load the records as one bulk copy batch to keep the commit boundaries of the batch
+        cfg.conn.bulk_copy(cfg.table_name, data, column_ids=column_ids, batch_size=len(data))
+    else:
+        set_input_sizes(cur, col_map)
+        cur.executemany(stmt, data)
+
+
+def execute_load_data(cur, col_map, data):
+    """Loads a batch of records via LOAD DATA LOCAL INFILE (MySQL only).
+
+    The records are written into a temporary file first, using the column separator and quote character.
+    As MySQL turns data errors into warnings for LOCAL loads, any warning is raised as an error,
+    so that the batch can be rolled back and the invalid records be isolated.
+
+    Parameters
+    ----------
+    cur
+        The database cursor to use
+    col_map : [str,]
+        The columns to load the data into
+    data : [(str,),]
+        The records to load
+
+    Raises
+    ------
+    ValueError
+        If MySQL raised warnings while loading the data
+    """
+    with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", newline="", suffix=".csv", delete=False) as file:
+        writer = csv.writer(file, delimiter=cfg.column_separator, quotechar=cfg.quote_char,
+                            quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerows(data)
+    try:
+        load_stmt = generate_load_data_statement(col_map, file.name)
+        f.debug(load_stmt)
+        cur.execute(load_stmt)
+        if cur.warning_count > 0:
+            cur.execute("SHOW WARNINGS")
+            warnings = cur.fetchall()
+            raise ValueError("LOAD DATA raised {0} warning(s), first warning: {1}"
+                             .format(len(warnings), warnings[0][2] if warnings else ""))
+    finally:
+        os.remove(file.name)
+
+
+def generate_load_data_statement(col_map, file_name):
+    """Generates the LOAD DATA LOCAL INFILE statement (MySQL only)
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    file_name : str
+        The file to load the data from
+    """
+    def literal(value):
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    stmt = ("LOAD DATA LOCAL INFILE {0} INTO TABLE {1} CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY {2} OPTIONALLY ENCLOSED BY {3} ESCAPED BY '' "
+            "LINES TERMINATED BY '\\n' ({4})")
+    return stmt.format(literal(file_name),
+                       cfg.table_name,
+                       literal(cfg.column_separator),
+                       literal(cfg.quote_char),
+                       ", ".join(col_map))
+
+
+def execute_batch_with_batch_errors(cur, stmt, col_map, data, raw_data):
+    """Executes a batch of records and ignores invalid records (Oracle only).
+
+    The batch errors mode of Oracle loads all valid records of the batch in one round trip
+    and returns the offsets of the invalid records, which are then ignored and logged.
+
+    Parameters
+    ----------
+    cur
+        The database cursor to use
+    stmt : str
+        The INSERT statement
+    col_map : [str,]
+        The columns to load the data into
+    data : [tuple,]
+        The records to load
+    raw_data : [(str,),]
+        The records as read from the file, to log the invalid records as they are
+
+    Returns
+    -------
+    int
+        The number of ignored records.
+    """
+    set_input_sizes(cur, col_map)
+    cur.executemany(stmt, data, batcherrors=True)
+    return handle_batch_errors(raw_data, cur.getbatcherrors())
+
+
+def handle_batch_errors(raw_data, batch_errors):
+    """Ignores and logs the invalid records reported by the batch errors mode (Oracle only).
+
+    Parameters
+    ----------
+    raw_data : [(str,),]
+        The records of the batch as read from the file
+    batch_errors : [oracledb._Error,]
+        The batch errors returned by getbatcherrors()
+
+    Returns
+    -------
+    int
+        The number of ignored records.
+    """
+    for batch_error in batch_errors:
+        handle_bad_record(raw_data[batch_error.offset], batch_error.message)
+    return len(batch_errors)
+
+
+def handle_bad_record(record, err):
+    """Ignores and, if requested, logs an invalid record.
+
+    Parameters
+    ----------
+    record : (str,)
+        The invalid record
+    err : Any
+        The error of the record
+    """
+    f.debug("Error with record: {0}".format(record))
+    f.debug("Error: {0}".format(err))
+    f.verbose("Ignoring invalid record.")
+    # Ignore errors is implied with log bad errors
+    # (there is no point logging bad errors if the program is about
+    #  to abort on a bad error because ignore errors isn't set)
+    if cfg.log_bad_records:
+        f.verbose("Logging invalid record.")
+        cfg.bad_records_logger.write_bad_record(record)
+
+
+def generate_copy_statement(col_map):
+    """Generates the COPY statement (Postgres only)
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+    """
+    return "COPY {0} ({1}) FROM STDIN".format(cfg.table_name, ", ".join(col_map))
+
+
+def get_statement(col_map):
+    """Returns the INSERT statement, which is generated only once per column map.
+
+    Parameters
+    ----------
+    col_map : [str,]
+        The columns to load the data into
+
+    Returns
+    -------
+    str
+        The INSERT statement.
+    """
+    key = tuple(col_map)
+    if key not in cfg.table_metadata.statements:
+        cfg.table_metadata.statements[key] = generate_statement(col_map)
+        f.debug("Generated statement:")
+        f.debug(cfg.table_metadata.statements[key])
+    return cfg.table_metadata.statements[key]
+
+
+def set_input_sizes(cur, col_map):
+    """Sets the bind types and sizes of the columns on a cursor before executing a batch (Oracle only).
+
+    Parameters
+    ----------
+    cur
+        The database cursor to use
+    col_map : [str,]
+        The columns to load the data into
+    """
+    if cfg.db_type is not cons.DBType.ORACLE:
+        return
+    input_sizes = cfg.table_metadata.get_input_sizes(col_map)
+    if input_sizes:
+        cur.setinputsizes(*input_sizes)
 
 
 def generate_statement(col_map):
@@ -478,11 +1987,24 @@ def parse_arguments(cmd):
                                             help="Prints a CREATE TABLE SQL statement to create the table " +
                                                  "and columns based on the header row of the CSV file(s).")
     parser_generate.add_argument("-f", "--file", default="*.csv.zip",
-                                 help="The file to read the header from, by default all *.csv.zip files")
+                                 help="The file to read the header from, '-' to read from stdin, " +
+                                      "by default all *.csv.zip files")
     parser_generate.add_argument("-e", "--encoding", default="utf-8",
                                  help="The file encoding to be used to read the file, " +
                                       "see https://docs.python.org/3/library/codecs.html#standard-encodings " +
                                       "for a list of all allowed encodings.")
+    parser_generate.add_argument("--zip-members",
+                                 help="The pattern of the members of ZIP and tar archives to read, " +
+                                      "by default the CSV files ('*.csv').")
+    parser_generate.add_argument("--reader", default="csv", choices=["csv", "arrow"],
+                                 help="The CSV reader to use: 'csv' uses the Python csv module, " +
+                                      "'arrow' the multi-threaded block parser of pyarrow, if installed.")
+    parser_generate.add_argument("--mmap", action="store_true", default=False,
+                                 help="Read plain text files via a memory map (csv reader only).")
+    parser_generate.add_argument("--decompressor", default="auto", choices=["auto", "python"],
+                                 help="How to decompress compressed files: 'auto' uses an external command " +
+                                      "(pigz, lbzip2, pbzip2, xz, zstd) if installed, " +
+                                      "'python' always uses the Python modules.")
     parser_generate.add_argument("-v", "--verbose", action="store_true", default=False,
                                  help="Verbose output.")
     parser_generate.add_argument("--debug", action="store_true", default=False,
@@ -493,6 +2015,22 @@ def parse_arguments(cmd):
                                  help="The table name to use.")
     parser_generate.add_argument("-c", "--column-type", default="varchar(1000)",
                                  help="The column type to use for the table generation.")
+    parser_generate.add_argument("--infer-types", action="store_true", default=False,
+                                 help="If set, the column types are inferred from the data rows of the file(s), " +
+                                      "using the column type only for columns without any values.")
+    parser_generate.add_argument("--sample-rows", type=int, default=1000,
+                                 help="The number of data rows per file to infer the column types from, " +
+                                      "0 to read all data rows.")
+    parser_generate.add_argument("--parallel", type=int,
+                                 help="How many files should be scanned in parallel, by default " +
+                                      "one per CPU if several large files are read entirely, otherwise one.")
+    parser_generate.add_argument("--cache-dir",
+                                 help="The directory to cache the headers and column statistics of the files in, " +
+                                      "by default $XDG_CACHE_HOME/csv2db or ~/.cache/csv2db.")
+    parser_generate.add_argument("--no-cache", action="store_true", default=False,
+                                 help="If set, the cache is neither used nor updated.")
+    parser_generate.add_argument("--clear-cache", action="store_true", default=False,
+                                 help="If set, the cache is cleared before the files are scanned.")
     parser_generate.add_argument("-s", "--separator", default=",",
                                  help="The columns separator character(s).")
     parser_generate.add_argument("-q", "--quote", default='"',
@@ -506,53 +2044,156 @@ def parse_arguments(cmd):
     parser_load = subparsers.add_parser("load", aliases=["lo"],
                                         help="Loads the data from the CSV file(s) into the database.")
     parser_load.add_argument("-f", "--file", default="*.csv.zip",
-                             help="The file to load, by default all *.csv.zip files")
-    parser_load.add_argument("-e", "--encoding", default="utf-8",
-                             help="The file encoding to be used to read the file, " +
-                                  "see https://docs.python.org/3/library/codecs.html#standard-encodings " +
-                                  "for a list of all allowed encodings.")
-    parser_load.add_argument("-v", "--verbose", action="store_true", default=False,
-                             help="Verbose output.")
-    parser_load.add_argument("--debug", action="store_true", default=False,
-                             help="Debug output.")
-    parser_load.add_argument("-t", "--table", required=True,
-                             help="The table name to use.")
-    parser_load.add_argument("-o", "--dbtype", default="oracle", choices=[e.value for e in cons.DBType],
-                             help="The database type.")
-    parser_load.add_argument("-u", "--user", required=True,
-                             help="The database user to load data into.")
-    parser_load.add_argument("-p", "--password",
-                             help="The database schema password. csv2db will prompt for the password " +
-                                  "if the parameter is missing which is a more secure method of providing a password.")
-    parser_load.add_argument("-m", "--host", default="localhost",
-                             help="The host name on which the database is running on.")
-    parser_load.add_argument("-n", "--port",
-                             help="The port on which the database is listening. " +
-                                  "If not passed on the default port will be used " +
-                                  "(Oracle: 1521, MySQL: 3306, PostgreSQL: 5432, SQL Server: 1433, DB2: 50000).")
-    parser_load.add_argument("-d", "--dbname", default="ORCLPDB1",
-                             help="The name of the database.")
-    parser_load.add_argument("-b", "--batch", default="10000",
-                             help="How many rows should be loaded at once.")
-    parser_load.add_argument("-s", "--separator", default=",",
-                             help="The columns separator character(s).")
-    parser_load.add_argument("-q", "--quote", default='"',
-                             help="The quote character on which a string won't be split.")
-    parser_load.add_argument("-a", "--directpath", action="store_true", default=False,
-                             help="Execute a direct path INSERT load operation (Oracle only).")
-    parser_load.add_argument("--truncate", action="store_true", default=False,
-                             help="Truncate/empty table before loading.")
-    parser_load.add_argument("-i", "--ignore", action="store_true", default=False,
-                             help="Ignore erroneous/invalid lines in files and continue the load.")
-    parser_load.add_argument("-l", "--log", action="store_true", default=False,
-                             help="Log erroneous/invalid lines in *.bad file of the same name as the input file " +
-                                  "(this implies the --ignore option).")
-    parser_load.add_argument("--case-insensitive-identifiers", action="store_true", default=False,
-                             help="If set, all identifiers will be upper-cased.")
-    parser_load.add_argument("--quote-identifiers", action="store_true", default=False,
-                             help="If set, all table and column identifiers will be quoted.")
-
-    return parser.parse_args(cmd)
+                             help="The file to load, '-' to load from stdin, by default all *.csv.zip files")
+    add_load_arguments(parser_load)
+
+    # Sub Parser watch
+    parser_watch = subparsers.add_parser("watch",
+                                         help="Watches a directory and loads new CSV files into the database " +
+                                              "as soon as they have been written.")
+    parser_watch.add_argument("-f", "--file", default=".",
+                              help="The directory or file pattern within a directory to watch, " +
+                                   "by default all CSV files in the current directory, " +
+                                   "uncompressed, compressed or archived (*.csv, *.csv.gz, *.csv.zip, ...). " +
+                                   "Bad records files (*.bad) are never loaded.")
+    add_load_arguments(parser_watch)
+    parser_watch.add_argument("--interval", type=float, default=1.0,
+                              help="The number of seconds between two checks of the directory.")
+    parser_watch.add_argument("--settle", type=float, default=2.0,
+                              help="The number of seconds the size of a file that is not known to be closed " +
+                                   "must not change before it is loaded, i.e. for files already in the directory " +
+                                   "or when polling.")
+    parser_watch.add_argument("--polling", action="store_true", default=False,
+                              help="Poll the directory instead of using inotify (Linux), " +
+                                   "i.e. for network file systems.")
+
+    args = parser.parse_args(cmd)
+    if args.command in ("load", "lo", "watch"):
+        if args.resume and args.checkpoint is None:
+            parser.error("--resume requires --checkpoint")
+        if args.resume and args.truncate:
+            parser.error("--resume cannot be used with --truncate")
+        if args.incremental is not None and args.truncate:
+            parser.error("--incremental cannot be used with --truncate")
+        if args.async_connections > 0 and args.dbtype not in (cons.DBType.ORACLE.value, cons.DBType.POSTGRES.value):
+            parser.error("--async is only supported for Oracle and PostgreSQL")
+    # Streams can only be read once and have no fingerprint to identify them
+    if args.command in ("load", "lo") and f.is_stream(args.file):
+        for option, value in (("--checkpoint", args.checkpoint), ("--resume", args.resume),
+                              ("--incremental", args.incremental), ("--chunk-size", args.chunk_size)):
+            if value:
+                parser.error("{0} cannot be used when loading from stdin or a named pipe".format(option))
+    return args
+
+
+def add_load_arguments(parser):
+    """Adds the arguments to load data, shared by the load and watch commands.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        The parser to add the arguments to
+    """
+    parser.add_argument("-e", "--encoding", default="utf-8",
+                        help="The file encoding to be used to read the file, " +
+                             "see https://docs.python.org/3/library/codecs.html#standard-encodings " +
+                             "for a list of all allowed encodings.")
+    parser.add_argument("--zip-members",
+                        help="The pattern of the members of ZIP and tar archives to load, " +
+                             "by default the CSV files ('*.csv').")
+    parser.add_argument("--reader", default="csv", choices=["csv", "arrow"],
+                        help="The CSV reader to use: 'csv' uses the Python csv module, " +
+                             "'arrow' the multi-threaded block parser of pyarrow, if installed, " +
+                             "which parses and loads the data in blocks of rows " +
+                             "(not used with --ignore unless --log is set).")
+    parser.add_argument("--mmap", action="store_true", default=False,
+                        help="Read plain text files via a memory map instead of buffered reads (csv reader only), " +
+                             "the parallel workers loading chunks of a file share its pages.")
+    parser.add_argument("--decompressor", default="auto", choices=["auto", "python"],
+                        help="How to decompress compressed files: 'auto' uses an external command " +
+                             "(pigz, lbzip2, pbzip2, xz, zstd) if installed, " +
+                             "'python' always uses the Python modules.")
+    parser.add_argument("-v", "--verbose", action="store_true", default=False,
+                        help="Verbose output.")
+    parser.add_argument("--debug", action="store_true", default=False,
+                        help="Debug output.")
+    parser.add_argument("-t", "--table", required=True,
+                        help="The table name to use.")
+    parser.add_argument("-o", "--dbtype", default="oracle", choices=[e.value for e in cons.DBType],
+                        help="The database type.")
+    parser.add_argument("-u", "--user", required=True,
+                        help="The database user to load data into.")
+    parser.add_argument("-p", "--password",
+                        help="The database schema password. csv2db will prompt for the password " +
+                             "if the parameter is missing which is a more secure method of providing a password.")
+    parser.add_argument("-m", "--host", default="localhost",
+                        help="The host name on which the database is running on.")
+    parser.add_argument("-n", "--port",
+                        help="The port on which the database is listening. " +
+                             "If not passed on the default port will be used " +
+                             "(Oracle: 1521, MySQL: 3306, PostgreSQL: 5432, SQL Server: 1433, DB2: 50000).")
+    parser.add_argument("-d", "--dbname", default="ORCLPDB1",
+                        help="The name of the database.")
+    parser.add_argument("-b", "--batch", default="10000",
+                        help="How many rows should be loaded at once, or 'auto' to tune the batch size " +
+                             "based on the observed throughput.")
+    parser.add_argument("--batch-bytes", type=f.parse_size, default=0,
+                        help="The maximum estimated memory of the rows loaded at once, " +
+                             "in bytes or with a K, M or G suffix (e.g. 256M). " +
+                             "A batch is loaded once either the batch size or this limit is reached.")
+    parser.add_argument("-s", "--separator", default=",",
+                        help="The columns separator character(s).")
+    parser.add_argument("-q", "--quote", default='"',
+                        help="The quote character on which a string won't be split.")
+    parser.add_argument("-a", "--directpath", action="store_true", default=False,
+                        help="Execute a direct path INSERT load operation (Oracle only).")
+    parser.add_argument("--truncate", action="store_true", default=False,
+                        help="Truncate/empty table before loading.")
+    parser.add_argument("--bulk", action="store_true", default=False,
+                        help="Use the bulk loading interface of the database instead of INSERT statements " +
+                             "(PostgreSQL: COPY, MySQL: LOAD DATA LOCAL INFILE, SQL Server: bulk copy).")
+    parser.add_argument("--convert-types", action="store_true", default=False,
+                        help="Convert the values into the data types of the table columns before binding them " +
+                             "(integers, decimals, floats, dates and timestamps), empty values into NULL. " +
+                             "The data types are queried from the data dictionary once per load.")
+    parser.add_argument("--date-format",
+                        help="The format of date values for --convert-types, e.g. '%%d/%%m/%%Y', " +
+                             "by default ISO 8601 (YYYY-MM-DD).")
+    parser.add_argument("--timestamp-format",
+                        help="The format of timestamp values for --convert-types, e.g. '%%d/%%m/%%Y %%H:%%M:%%S', " +
+                             "by default ISO 8601 (YYYY-MM-DD HH:MM:SS[.ffffff]).")
+    parser.add_argument("-i", "--ignore", action="store_true", default=False,
+                        help="Ignore erroneous/invalid lines in files and continue the load.")
+    parser.add_argument("-l", "--log", action="store_true", default=False,
+                        help="Log erroneous/invalid lines in *.bad file of the same name as the input file " +
+                             "(this implies the --ignore option).")
+    parser.add_argument("--case-insensitive-identifiers", action="store_true", default=False,
+                        help="If set, all identifiers will be upper-cased.")
+    parser.add_argument("--quote-identifiers", action="store_true", default=False,
+                        help="If set, all table and column identifiers will be quoted.")
+    parser.add_argument("--pipeline", type=int, default=0,
+                        help="Parse the next batches in a separate thread while the current batch is loaded, " +
+                             "keeping at most the given number of parsed batches in memory (0 disables it).")
+    parser.add_argument("--async", type=int, default=0, dest="async_connections",
+                        help="Load the batches asynchronously over the given number of connections " +
+                             "(Oracle and PostgreSQL only, 0 disables it).")
+    parser.add_argument("--parallel", type=int, default=1,
+                        help="How many files should be loaded in parallel, " +
+                             "each parallel worker uses its own database connection.")
+    parser.add_argument("--chunk-size", type=int, default=0,
+                        help="Split uncompressed files larger than the given size (in MB) into chunks " +
+                             "that are loaded in parallel (requires --parallel).")
+    parser.add_argument("--checkpoint",
+                        help="Record the progress of the load in the given journal file, " +
+                             "i.e. the loaded files and the rows of the last committed batch of a file. " +
+                             "Rows are only recorded when loading files sequentially, with or without " +
+                             "--pipeline, otherwise only completely loaded files are.")
+    parser.add_argument("--incremental", metavar="MANIFEST",
+                        help="Only load new and changed files, keeping the path, size, modification time " +
+                             "and checksum of all loaded files in the given manifest file.")
+    parser.add_argument("--resume", action="store_true", default=False,
+                        help="Resume a previous load from the --checkpoint journal, " +
+                             "skipping the files and rows that have already been loaded.")
 
 
 def entrypoint():
@@ -39,12 +39,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import csv2db.cache as cache
+import csv2db.checkpoint as checkpoint
+import csv2db.compression as compression
 import csv2db.constants as cons
+import csv2db.conversion as conversion
+import csv2db.metadata as metadata
 import csv2db.functions as f
 import csv2db.config as cfg
+import csv2db.inference as inference
+import csv2db.manifest as manifest
+import csv2db.readers as readers
+import csv2db.watcher as watcher
 import main as csv2db
 import unittest
+import bz2
+import datetime
+import decimal
+import gzip
+import io
+import lzma
 import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import zipfile
 
 
 class FunctionalTestCaseSuite(unittest.TestCase):
@@ -187,6 +208,666 @@ class FunctionalTestCaseSuite(unittest.TestCase):
         os.remove(file_name)
         self.assertEqual(record, line)
 
+    def test_get_and_set_config(self):
+        print("test_get_and_set_config")
+        cfg.column_separator = "|"
+        config = f.get_config()
+        self.assertNotIn("conn", config)
+        self.assertNotIn("input_data", config)
+        self.assertNotIn("bad_records_logger", config)
+        cfg.column_separator = ","
+        f.set_config(config)
+        self.assertEqual("|", cfg.column_separator)
+
+    def test_split_file(self):
+        print("test_split_file")
+        file_name = "resources/test_files/201811-citibike-tripdata.csv"
+        with f.open_file(file_name) as file:
+            reader = f.get_csv_reader(file)
+            f.read_header(reader)
+            expected = list(reader)
+        chunks = f.split_file(file_name, 500)
+        self.assertGreater(len(chunks), 1)
+        actual = []
+        for part, (start, end) in enumerate(chunks, start=1):
+            with f.open_file_range(file_name, part, start, end) as file:
+                actual.extend(f.get_csv_reader(file))
+        self.assertListEqual(expected, actual)
+
+    def test_batch_size_tuner(self):
+        print("test_batch_size_tuner")
+        tuner = f.BatchSizeTuner(batch_size=1000, max_bytes=1024 * 1024)
+        # Throughput improves with bigger batches, keep growing
+        self.assertEqual(2000, tuner.record(1000, 1000, 1.0))
+        self.assertEqual(4000, tuner.record(2000, 2000, 1.0))
+        # Throughput gets worse, go back
+        self.assertLess(tuner.record(4000, 4000, 4.0), 4000)
+        # The last, partial batch of a file is ignored
+        self.assertEqual(tuner.batch_size, tuner.record(10, 10, 1.0, full=False))
+        # Memory limit caps the batch size
+        tuner = f.BatchSizeTuner(batch_size=1000, max_bytes=1024 * 1024)
+        self.assertEqual(1024, tuner.record(1000, 1000 * 1024, 1.0))
+        # Batches loaded early because of the memory limit are tuned as well
+        tuner = f.BatchSizeTuner(batch_size=1000, max_bytes=1024 * 1024)
+        self.assertEqual(1000, tuner.record(500, 512 * 1024, 1.0))
+        self.assertIsNotNone(tuner.last_throughput)
+
+    def test_parse_size(self):
+        print("test_parse_size")
+        self.assertEqual(1000, f.parse_size("1000"))
+        self.assertEqual(64 * 1024, f.parse_size("64K"))
+        self.assertEqual(256 * 1024 * 1024, f.parse_size("256m"))
+        self.assertEqual(1024 ** 3, f.parse_size("1GB"))
+        self.assertRaises(ValueError, f.parse_size, "lots")
+
+    def test_batch_buffer(self):
+        print("test_batch_buffer")
+        batch = f.BatchBuffer(3)
+        batch.append(("1", "a"), 10)
+        batch.append(("2", "b"), 10)
+        self.assertEqual(2, len(batch))
+        self.assertEqual(20, batch.size)
+        self.assertListEqual([("1", "a"), ("2", "b")], batch.records())
+        # The free slots are kept when returning the records of a shorter batch
+        self.assertEqual(3, len(batch.slots))
+        # Slots are reused after clearing the batch
+        slots = batch.slots
+        batch.clear()
+        self.assertEqual(0, len(batch))
+        self.assertEqual(0, batch.size)
+        batch.append(("3", "c"))
+        self.assertIs(slots, batch.slots)
+        self.assertListEqual([("3", "c")], list(batch))
+        batch.extend([("4", "d"), ("5", "e"), ("6", "f")])
+        self.assertListEqual([("3", "c"), ("4", "d"), ("5", "e"), ("6", "f")], batch.records())
+
+    def test_infer_column_types(self):
+        print("test_infer_column_types")
+        values = {
+            "BOOLEAN": ["true", "FALSE", ""],
+            "INTEGER": ["1", "-25", ""],
+            "BIGINT": ["1", "9999999999"],
+            "NUMERIC(5,3)": ["12.5", "-1.125", "7"],
+            "DATE": ["2018-11-01", ""],
+            "TIMESTAMP(4)": ["2018-11-01 00:00:12.9100", "2018-11-01T23:59:59"],
+            "VARCHAR(4)": ["007", "12"],
+            "VARCHAR(16)": ["2018-13-01", "some text"],
+            "varchar(1000)": ["", ""]
+        }
+        for expected, column_values in values.items():
+            stats = inference.ColumnStats()
+            for value in column_values:
+                stats.add(value)
+            self.assertEqual(expected, stats.get_data_type(cons.DBType.POSTGRES, "varchar(1000)"))
+        # Dates and timestamps are kept as strings if the database doesn't accept them as they are
+        values = {
+            cons.DBType.ORACLE: {
+                "VARCHAR2(16)": ["2018-11-01", ""],
+                "VARCHAR2(32)": ["2018-11-01 00:00:12.9100"]
+            },
+            cons.DBType.DB2: {
+                "DATE": ["2018-11-01", ""],
+                "TIMESTAMP(4)": ["2018-11-01 00:00:12.9100"],
+                "VARCHAR(32)": ["2018-11-01 00:00:12.9100", "2018-11-01T23:59:59"]
+            }
+        }
+        for db_type, db_values in values.items():
+            for expected, column_values in db_values.items():
+                stats = inference.ColumnStats()
+                for value in column_values:
+                    stats.add(value)
+                self.assertEqual(expected, stats.get_data_type(db_type, "varchar(1000)"))
+        # The separators of timestamps in another file are merged
+        stats = inference.ColumnStats()
+        stats.add("2018-11-01 00:00:12")
+        other = inference.ColumnStats()
+        other.add("2018-11-01T00:00:12")
+        stats.merge(other)
+        self.assertEqual("VARCHAR(32)", stats.get_data_type(cons.DBType.DB2, "varchar(1000)"))
+        # Merging the statistics of another file widens the type
+        stats = inference.ColumnStats()
+        stats.add("1")
+        other = inference.ColumnStats()
+        other.add("1.25")
+        stats.merge(other)
+        self.assertEqual("NUMBER(3,2)", stats.get_data_type(cons.DBType.ORACLE, "varchar(1000)"))
+
+    def test_generate_infer_types(self):
+        print("test_generate_infer_types")
+        self.assertEqual(cons.ExitCodes.SUCCESS.value,
+                         csv2db.run(["gen", "-f", "resources/test_files/201811-citibike-tripdata.csv.gz", "-t", "STAGING",
+                                     "--infer-types", "--sample-rows", "0"]))
+
+    def test_scan_files_in_parallel(self):
+        print("test_scan_files_in_parallel")
+        file_names = ["resources/test_files/201811-citibike-tripdata.csv",
+                      "resources/test_files/201811-citibike-tripdata.csv.gz",
+                      "resources/test_files/201811-citibike-tripdata.csv.zip"]
+        cfg.parallel = 1
+        expected = [columns for columns, stats in csv2db.scan_files(file_names)]
+        cfg.parallel = 3
+        actual = [columns for columns, stats in csv2db.scan_files(file_names)]
+        self.assertListEqual(expected, actual)
+
+    def test_scan_workers(self):
+        print("test_scan_workers")
+        directory = tempfile.mkdtemp()
+        try:
+            file_names = [os.path.join(directory, "small.csv"), os.path.join(directory, "large.csv")]
+            for file_name in file_names:
+                with open(file_name, "w") as file:
+                    file.write("id,name\n1,one\n")
+            # Without --parallel, few or small files are scanned in this process
+            cfg.parallel = 0
+            self.assertEqual(1, csv2db.get_scan_workers(file_names, True, 0))
+            cfg.parallel = 3
+            self.assertEqual(3, csv2db.get_scan_workers(file_names))
+            # Several large files are scanned in parallel, if all their data rows are read
+            cfg.parallel = 0
+            for file_name in file_names:
+                os.truncate(file_name, f.PARALLEL_SCAN_MIN_SIZE)
+            self.assertEqual(os.cpu_count() or 1, csv2db.get_scan_workers(file_names, True, 0))
+            self.assertEqual(1, csv2db.get_scan_workers(file_names, True, 1000))
+            self.assertEqual(1, csv2db.get_scan_workers(file_names))
+            self.assertEqual(1, csv2db.get_scan_workers(file_names[:1], True, 0))
+        finally:
+            cfg.parallel = 1
+            shutil.rmtree(directory)
+
+    def test_generate_empty_file(self):
+        print("test_generate_empty_file")
+        file_names = ["resources/test_files/bad/201811-citibike-tripdata-empty.csv",
+                      "resources/test_files/201811-citibike-tripdata.csv"]
+        for parallel in (1, 2):
+            cfg.parallel = parallel
+            with self.assertRaises(ValueError) as context:
+                csv2db.scan_files(file_names)
+            self.assertIn("201811-citibike-tripdata-empty.csv", str(context.exception))
+        cfg.parallel = 1
+        self.assertEqual(cons.ExitCodes.GENERIC_ERROR.value,
+                         csv2db.run(["gen", "-f", "resources/test_files/bad/201811-citibike-tripdata-empty.csv",
+                                     "-t", "STAGING"]))
+
+    def test_header_cache(self):
+        print("test_header_cache")
+        cache_dir = tempfile.mkdtemp()
+        file_name = os.path.join(cache_dir, "test.csv")
+        try:
+            with open(file_name, "w") as file:
+                file.write("id,name\n1,a\n")
+            header_cache = cache.HeaderCache(cache_dir)
+            self.assertEqual((None, None), header_cache.get(file_name))
+            stats = [inference.ColumnStats(), inference.ColumnStats()]
+            stats[0].add("1")
+            header_cache.put(file_name, ["id", "name"], stats, 100)
+            self.assertEqual(["id", "name"], header_cache.get(file_name)[0])
+            header, cached_stats = header_cache.get(file_name, 100)
+            self.assertEqual(stats[0].to_dict(), cached_stats[0].to_dict())
+            # Statistics of another sample size are not cached
+            self.assertEqual((None, None), header_cache.get(file_name, 0))
+            # Statistics cached before the timestamp separators were collected are collected again
+            entry = header_cache.read_entry(file_name, cache.get_file_fingerprint(file_name))
+            del entry["stats"]["100"][0]["timestamp_separators"]
+            header_cache.write_entry(file_name, entry)
+            self.assertEqual((None, None), header_cache.get(file_name, 100))
+            # A changed file invalidates the entry
+            with open(file_name, "a") as file:
+                file.write("2,b\n")
+            self.assertEqual((None, None), header_cache.get(file_name))
+            header_cache.put(file_name, ["id", "name"])
+            self.assertEqual(1, header_cache.clear())
+            self.assertEqual((None, None), header_cache.get(file_name))
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_checkpoint_journal(self):
+        print("test_checkpoint_journal")
+        journal_file = "test_checkpoint_journal.journal"
+        file_name = "resources/test_files/201811-citibike-tripdata.csv"
+        other_file_name = "resources/test_files/201811-citibike-tripdata.csv.gz"
+        try:
+            journal = checkpoint.CheckpointJournal(journal_file)
+            journal.record(file_name, 5)
+            journal.record(other_file_name, 16, done=True)
+            journal.close()
+            # A load killed while writing leaves an incomplete line behind
+            with open(journal_file, "a") as file:
+                file.write('{"file": "')
+            journal = checkpoint.CheckpointJournal(journal_file, resume=True)
+            self.assertEqual(5, journal.get_rows(file_name))
+            self.assertFalse(journal.is_done(file_name))
+            self.assertTrue(journal.is_done(other_file_name))
+            journal.close()
+            # Without resume, the journal is started over
+            journal = checkpoint.CheckpointJournal(journal_file)
+            self.assertEqual(0, journal.get_rows(file_name))
+            journal.close()
+        finally:
+            os.remove(journal_file)
+
+    def test_resume_requires_checkpoint(self):
+        print("test_resume_requires_checkpoint")
+        with self.assertRaises(SystemExit) as cm:
+            csv2db.run(["load", "-f", "resources/test_files/201811-citibike-tripdata.csv", "-t", "STAGING",
+                        "-u", "test", "-p", "test", "--resume"])
+        self.assertEqual(cm.exception.code, 2)
+
+    def test_async_requires_supported_database(self):
+        print("test_async_requires_supported_database")
+        with self.assertRaises(SystemExit) as cm:
+            csv2db.run(["load", "-f", "resources/test_files/201811-citibike-tripdata.csv", "-t", "STAGING",
+                        "-o", "mysql", "-u", "test", "-p", "test", "--async", "2"])
+        self.assertEqual(cm.exception.code, 2)
+
+    def test_load_manifest(self):
+        print("test_load_manifest")
+        directory = tempfile.mkdtemp()
+        file_name = os.path.join(directory, "test.csv")
+        manifest_file = os.path.join(directory, "manifest.json")
+        try:
+            with open(file_name, "w") as file:
+                file.write("id,name\n1,a\n")
+            load_manifest = manifest.LoadManifest(manifest_file)
+            self.assertFalse(load_manifest.is_loaded(file_name))
+            load_manifest.record(file_name)
+            load_manifest.close()
+            load_manifest = manifest.LoadManifest(manifest_file)
+            self.assertTrue(load_manifest.is_loaded(file_name))
+            # Touching the file doesn't change its content
+            os.utime(file_name, ns=(0, 0))
+            self.assertTrue(load_manifest.is_loaded(file_name))
+            # Changing the content does
+            with open(file_name, "w") as file:
+                file.write("id,name\n2,b\n")
+            os.utime(file_name, ns=(1, 1))
+            self.assertFalse(load_manifest.is_loaded(file_name))
+            # The checksum taken before the load is recorded, without reading the file again
+            os.remove(file_name)
+            load_manifest.record(file_name)
+            self.assertEqual(1, load_manifest.files[os.path.abspath(file_name)]["mtime"])
+            load_manifest.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_directory_watcher(self):
+        print("test_directory_watcher")
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory, "existing.csv"), "w") as file:
+                file.write("id\n1\n")
+            for polling in (True, False):
+                directory_watcher = watcher.DirectoryWatcher(directory, interval=0.01, settle=0, polling=polling)
+                files = directory_watcher.watch()
+                self.assertEqual(os.path.join(directory, "existing.csv"), next(files))
+                with open(os.path.join(directory, "ignored.txt"), "w") as file:
+                    file.write("id\n1\n")
+                with open(os.path.join(directory, "new.csv"), "w") as file:
+                    file.write("id\n1\n")
+                self.assertEqual(os.path.join(directory, "new.csv"), next(files))
+                directory_watcher.close()
+                os.remove(os.path.join(directory, "new.csv"))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_directory_watcher_skips_bad_files(self):
+        print("test_directory_watcher_skips_bad_files")
+        directory = tempfile.mkdtemp()
+        try:
+            for polling in (True, False):
+                for pattern in (directory, os.path.join(directory, "*")):
+                    directory_watcher = watcher.DirectoryWatcher(pattern, interval=0.01, settle=0, polling=polling)
+                    files = directory_watcher.watch()
+                    # The bad records file of a load is written into the watched directory
+                    with open(os.path.join(directory, "new.csv.bad"), "w") as file:
+                        file.write("1\n")
+                    with open(os.path.join(directory, "new.csv.gz"), "wb") as file:
+                        file.write(gzip.compress(b"id\n1\n"))
+                    self.assertEqual(os.path.join(directory, "new.csv.gz"), next(files))
+                    directory_watcher.close()
+                    os.remove(os.path.join(directory, "new.csv.bad"))
+                    os.remove(os.path.join(directory, "new.csv.gz"))
+            self.assertFalse(f.is_csv_file(os.path.join(directory, "new.csv.bad")))
+            self.assertTrue(f.is_csv_file(os.path.join(directory, "new.csv.tar.xz")))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_is_connection_error(self):
+        print("test_is_connection_error")
+
+        class OperationalError(Exception):
+            pass
+
+        class DatabaseError(Exception):
+            pass
+
+        class DeadSessionError:
+            is_session_dead = True
+
+        self.assertTrue(f.is_connection_error(OperationalError("server closed the connection unexpectedly")))
+        self.assertTrue(f.is_connection_error(DatabaseError(DeadSessionError())))
+        self.assertFalse(f.is_connection_error(DatabaseError("ORA-01722: invalid number")))
+        self.assertFalse(f.is_connection_error(ValueError()))
+
+    def test_zip_archive_members(self):
+        print("test_zip_archive_members")
+        directory = tempfile.mkdtemp()
+        try:
+            archive = os.path.join(directory, "archive.zip")
+            with zipfile.ZipFile(archive, "w") as zip_file:
+                zip_file.writestr("first.csv", "id\n1\n")
+                zip_file.writestr("sub/", "")
+                zip_file.writestr("sub/second.csv", "id\n2\n")
+                zip_file.writestr("__MACOSX/._first.csv", "")
+                zip_file.writestr("README.txt", "readme")
+                zip_file.writestr("third.csv.gz", gzip.compress(b"id\n3\n"))
+            # Only CSV files are loaded by default, compressed files within archives are not decompressed
+            self.assertEqual([archive + "/first.csv", archive + "/sub/second.csv"], f.find_all_files(archive))
+            cfg.zip_members = "sub/*"
+            self.assertEqual([archive + "/sub/second.csv"], f.find_all_files(archive))
+            cfg.zip_members = "*.txt"
+            self.assertEqual([archive + "/README.txt"], f.find_all_files(archive))
+            cfg.zip_members = None
+            self.assertEqual((archive, "sub/second.csv"), f.split_archive_member(archive + "/sub/second.csv"))
+            self.assertEqual((archive, None), f.split_archive_member(archive))
+            self.assertFalse(f.is_splittable(archive + "/first.csv"))
+            with f.open_file(archive + "/sub/second.csv") as file:
+                self.assertEqual("id\n2\n", file.read())
+            # Archives with a single member keep their name, whatever the name of the member
+            self.assertEqual(["resources/test_files/201811-citibike-tripdata.csv.zip"],
+                             f.find_all_files("resources/test_files/201811-citibike-tripdata.csv.zip"))
+            single = os.path.join(directory, "single.zip")
+            with zipfile.ZipFile(single, "w") as zip_file:
+                zip_file.writestr("data.txt", "id\n1\n")
+            self.assertEqual([single], f.find_all_files(single))
+            cfg.zip_members = "*.csv"
+            self.assertEqual([], f.find_all_files(single))
+        finally:
+            cfg.zip_members = None
+            shutil.rmtree(directory)
+
+    def test_decompression(self):
+        print("test_decompression")
+        directory = tempfile.mkdtemp()
+        try:
+            data = "id,name\n1,one\n2,two\n"
+            for extension, module in ((".gz", gzip), (".bz2", bz2), (".xz", lzma)):
+                with module.open(os.path.join(directory, "data.csv" + extension), "wt") as file:
+                    file.write(data)
+            with open(os.path.join(directory, "data.csv"), "w") as file:
+                file.write(data)
+            with tarfile.open(os.path.join(directory, "data.tar.gz"), "w:gz") as tar_file:
+                tar_file.add(os.path.join(directory, "data.csv"), "first.csv")
+                tar_file.add(os.path.join(directory, "data.csv"), "second.csv")
+            with tarfile.open(os.path.join(directory, "data.tar"), "w") as tar_file:
+                tar_file.add(os.path.join(directory, "data.csv"), "first.csv")
+                tar_file.add(os.path.join(directory, "data.csv"), "notes.txt")
+                tar_file.add(os.path.join(directory, "data.csv"), "second.csv")
+            # Uncompressed tar archives are listed up front, as only the headers are read
+            archive = os.path.join(directory, "data.tar")
+            self.assertEqual([archive + "/first.csv", archive + "/second.csv"], f.find_all_files(archive))
+            for decompressor in ("auto", "python"):
+                cfg.decompressor = decompressor
+                for extension in (".gz", ".bz2", ".xz"):
+                    file_name = os.path.join(directory, "data.csv" + extension)
+                    self.assertFalse(f.is_splittable(file_name))
+                    with f.open_file(file_name) as file:
+                        self.assertEqual(data, file.read())
+                archive = os.path.join(directory, "data.tar.gz")
+                # Compressed tar archives are listed while their members are read, in one pass
+                self.assertEqual([archive], f.find_all_files(archive))
+                self.assertTrue(f.is_compressed_tar(archive))
+                self.assertFalse(f.is_compressed_tar(archive + "/first.csv"))
+                member_names = []
+                for member_name in compression.iter_tar_members(archive):
+                    member_names.append(member_name)
+                    tar_reader = cfg.tar_reader
+                    with f.open_file(archive + "/" + member_name) as file:
+                        self.assertEqual(data, file.read())
+                    self.assertIs(tar_reader, cfg.tar_reader)
+                self.assertEqual(["first.csv", "second.csv"], member_names)
+                self.assertIsNone(cfg.tar_reader)
+                self.assertEqual([(["id", "name"], [None, None])] * 2, csv2db.scan_entry(archive))
+                # The members are read in one pass over the archive
+                with f.open_file(archive + "/first.csv") as file:
+                    self.assertEqual(data, file.read())
+                tar_reader = cfg.tar_reader
+                with f.open_file(archive + "/second.csv") as file:
+                    self.assertEqual(data, file.read())
+                self.assertIs(tar_reader, cfg.tar_reader)
+                # Members before the current position are read from the start again
+                with f.open_file(archive + "/first.csv") as file:
+                    self.assertEqual(data, file.read())
+                self.assertIsNot(tar_reader, cfg.tar_reader)
+                compression.close_tar_reader()
+                self.assertIsNone(cfg.tar_reader)
+            # Commands writing more warnings than fit into a pipe don't block
+            command = [sys.executable, "-c", "import sys; sys.stderr.write('w' * 1000000); sys.stdout.write('data')"]
+            with io.BufferedReader(compression.ProcessStream("warnings", command)) as stream:
+                self.assertEqual(b"data", stream.read())
+        finally:
+            compression.close_tar_reader()
+            cfg.decompressor = "auto"
+            shutil.rmtree(directory)
+
+    def test_open_stream(self):
+        print("test_open_stream")
+        data = "id,name\n1,one\n2,two\n"
+        self.assertEqual([f.STDIN], f.find_all_files(f.STDIN))
+        self.assertTrue(f.is_stream(f.STDIN))
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, data.encode())
+        os.close(write_fd)
+        stdin = sys.stdin
+        try:
+            sys.stdin = os.fdopen(read_fd)
+            with f.open_file(f.STDIN) as file:
+                self.assertEqual("stdin", file.name)
+                self.assertEqual(data, file.read())
+        finally:
+            sys.stdin.close()
+            sys.stdin = stdin
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory, "latin1.csv"), "wb") as file:
+                file.write("id,name\n1,Å\n".encode("latin-1"))
+            with self.assertRaises(UnicodeDecodeError):
+                f.open_file(os.path.join(directory, "latin1.csv"))
+        finally:
+            shutil.rmtree(directory)
+        with self.assertRaises(SystemExit):
+            csv2db.parse_arguments(["load", "-f", "-", "-t", "test", "-u", "test", "-p", "test",
+                                    "--checkpoint", "journal"])
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "Named pipes are not supported on this platform")
+    def test_open_named_pipe(self):
+        print("test_open_named_pipe")
+        data = "id,name\n1,one\n2,two\n"
+        directory = tempfile.mkdtemp()
+        try:
+            pipe = os.path.join(directory, "pipe.csv")
+            os.mkfifo(pipe)
+            self.assertTrue(f.is_stream(pipe))
+            self.assertFalse(f.is_splittable(pipe))
+            for option in (["--checkpoint", "journal"], ["--incremental", "manifest"], ["--chunk-size", "1"]):
+                with self.assertRaises(SystemExit):
+                    csv2db.parse_arguments(["load", "-f", pipe, "-t", "test", "-u", "test", "-p", "test"] + option)
+            args = csv2db.parse_arguments(["load", "-f", os.path.join(directory, "*.csv"), "-t", "test",
+                                           "-u", "test", "-p", "test", "--checkpoint", "journal"])
+            self.assertEqual("journal", args.checkpoint)
+
+            def write_pipe():
+                with open(pipe, "w") as pipe_file:
+                    pipe_file.write(data)
+
+            writer = threading.Thread(target=write_pipe)
+            writer.start()
+            with f.open_file(pipe) as file:
+                self.assertEqual(data, file.read())
+            writer.join()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_mmap_file(self):
+        print("test_mmap_file")
+        directory = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(directory, "data.csv")
+            with open(file_name, "w", newline="") as file:
+                file.write('id,name\r\n1,"multi\r\nline"\r\n2,Ä\r\n3,last')
+            cfg.column_separator = ","
+            cfg.quote_char = '"'
+            with f.open_file(file_name) as file:
+                expected = list(f.get_csv_reader(file))
+            cfg.mmap = True
+            with f.open_file(file_name) as file:
+                self.assertIsInstance(file, f.MmapFile)
+                self.assertEqual(expected, list(f.get_csv_reader(file)))
+            start = len('id,name\r\n')
+            with f.open_file_range(file_name, 1, start, os.path.getsize(file_name)) as file:
+                self.assertEqual("{0}.part1".format(file_name), file.name)
+                self.assertEqual(expected[1:], list(f.get_csv_reader(file)))
+            # Empty files cannot be mapped
+            open(os.path.join(directory, "empty.csv"), "w").close()
+            with f.open_file(os.path.join(directory, "empty.csv")) as file:
+                self.assertNotIsInstance(file, f.MmapFile)
+            with open(os.path.join(directory, "latin1.csv"), "wb") as file:
+                file.write("id,name\n1,Å\n".encode("latin-1"))
+            with self.assertRaises(UnicodeDecodeError):
+                f.open_file(os.path.join(directory, "latin1.csv"))
+        finally:
+            cfg.mmap = False
+            shutil.rmtree(directory)
+
+    def test_convert_types(self):
+        print("test_convert_types")
+        columns = [metadata.TableColumn("ID", 1, "NUMBER", None, 0, False),
+                   metadata.TableColumn("AMOUNT", 2, "NUMBER", None, 2, True),
+                   metadata.TableColumn("RATIO", 3, "FLOAT", None, None, True),
+                   metadata.TableColumn("DAY", 4, "DATE", None, None, True),
+                   metadata.TableColumn("CREATED", 5, "TIMESTAMP(6)", None, 6, True),
+                   metadata.TableColumn("NAME", 6, "VARCHAR2", 20, None, True)]
+        converters = conversion.get_converters(cons.DBType.POSTGRES, columns)
+        self.assertEqual([conversion.to_int, conversion.to_decimal, conversion.to_float, conversion.to_date,
+                          conversion.to_datetime, None], converters)
+        self.assertIs(conversion.to_oracle_date, conversion.get_converters(cons.DBType.ORACLE, columns[3:4])[0])
+        records = [("1", "1.50", "0.5", "2024-01-31", "2024-01-31 12:30:00.5", "a"),
+                   ("", "", "", "", "", "")]
+        self.assertEqual([(1, decimal.Decimal("1.50"), 0.5, datetime.date(2024, 1, 31),
+                           datetime.datetime(2024, 1, 31, 12, 30, 0, 500000), "a"),
+                          (None, None, None, None, None, "")],
+                         conversion.convert_records(converters, records))
+        # Invalid values and records with missing values are left to the database to reject
+        self.assertEqual([(1, "x", None, None, None, "a"), ("2",)],
+                         conversion.convert_records(converters, [("1", "x", "", "", "", "a"), ("2",)]))
+        # Any number of fractional digits is accepted on every Python version
+        self.assertEqual(datetime.datetime(2024, 1, 31, 12, 30, 0, 123456),
+                         conversion.to_datetime("2024-01-31T12:30:00.123456789"))
+        self.assertEqual(datetime.datetime(2024, 1, 31, 12, 30), conversion.to_datetime("2024-01-31 12:30"))
+        self.assertEqual(datetime.datetime(2024, 1, 31), conversion.to_datetime("2024-01-31"))
+        try:
+            cfg.date_format = "%d/%m/%Y"
+            self.assertEqual(datetime.date(2024, 1, 31), conversion.to_date("31/01/2024"))
+            self.assertEqual(datetime.datetime(2024, 1, 31), conversion.to_oracle_date("31/01/2024"))
+            self.assertEqual(datetime.datetime(2024, 1, 31, 8), conversion.to_oracle_date("2024-01-31 08:00"))
+        finally:
+            cfg.date_format = None
+
+    def test_table_metadata(self):
+        print("test_table_metadata")
+        columns = [metadata.TableColumn("ID", 1, "NUMBER", 0, 0, False),
+                   metadata.TableColumn("NAME", 2, "VARCHAR2", 20, None, True),
+                   metadata.TableColumn("CREATED", 3, "DATE", 0, None, True)]
+        table = metadata.TableMetadata("STAGING", columns)
+        try:
+            cfg.db_type = cons.DBType.ORACLE
+            self.assertEqual([3, 1], table.get_column_ids(['"CREATED"', "id"]))
+            table.validate_header(["NAME", "ID"])
+            # Columns missing in the table are reported before any data is loaded
+            with self.assertRaises(NameError) as context:
+                table.validate_header(["ID", "NAME", "UNKNOWN"])
+            self.assertIn("UNKNOWN", str(context.exception))
+            with self.assertRaises(NameError):
+                table.get_converters(["ID", "UNKNOWN"])
+            # Tables not found in the data dictionary are not validated
+            metadata.TableMetadata("SYNONYM", []).validate_header(["UNKNOWN"])
+            with self.assertRaises(NameError):
+                metadata.TableMetadata("SYNONYM", []).get_column_ids(["UNKNOWN"])
+            # Derived metadata is cached per column map
+            converters = table.get_converters(["ID", "CREATED"])
+            self.assertEqual([conversion.to_int, conversion.to_oracle_date], converters)
+            self.assertIs(converters, table.get_converters(["ID", "CREATED"]))
+            self.assertEqual([], metadata.TableMetadata("SYNONYM", []).get_input_sizes(["UNKNOWN"]))
+        finally:
+            cfg.db_type = None
+
+    def test_oracle_input_sizes(self):
+        print("test_oracle_input_sizes")
+        try:
+            import oracledb
+        except ImportError:
+            self.skipTest("oracledb is not installed")
+        columns = [metadata.TableColumn("ID", 1, "NUMBER", 0, 0, False),
+                   metadata.TableColumn("NAME", 2, "VARCHAR2", 20, None, True),
+                   metadata.TableColumn("CREATED", 3, "DATE", 0, None, True),
+                   metadata.TableColumn("RATIO", 4, "BINARY_DOUBLE", 0, None, True)]
+        col_map = ["ID", "NAME", "CREATED", "RATIO"]
+        try:
+            cfg.db_type = cons.DBType.ORACLE
+            # Strings are bound with the length of character columns only
+            self.assertEqual([None, 20, None, None], metadata.TableMetadata("STAGING", columns).get_input_sizes(col_map))
+            cfg.convert_types = True
+            self.assertEqual([oracledb.DB_TYPE_NUMBER, 20, oracledb.DB_TYPE_DATE, oracledb.DB_TYPE_BINARY_DOUBLE],
+                             metadata.TableMetadata("STAGING", columns).get_input_sizes(col_map))
+        finally:
+            cfg.db_type = None
+            cfg.convert_types = False
+
+    def test_arrow_reader(self):
+        print("test_arrow_reader")
+        if readers.pyarrow is None:
+            self.skipTest("pyarrow is not installed")
+        file_name = "resources/test_files/201811-citibike-tripdata.csv.gz"
+        cfg.column_separator = ","
+        cfg.quote_char = '"'
+        with f.open_file(file_name) as file:
+            expected = list(f.get_csv_reader(file))
+        try:
+            cfg.reader = "arrow"
+            with f.open_file(file_name) as file:
+                reader = f.get_csv_reader(file)
+                self.assertIsInstance(reader, readers.ArrowReader)
+                self.assertEqual(expected[0], next(reader))
+                self.assertEqual(expected[1], next(reader))
+                rows = [list(row) for row in reader.read_block()]
+                block = reader.read_block()
+                while block is not None:
+                    rows.extend(list(row) for row in block)
+                    block = reader.read_block()
+                self.assertEqual(expected[2:], rows)
+        finally:
+            cfg.reader = "csv"
+
+    def test_arrow_reader_same_rows(self):
+        print("test_arrow_reader_same_rows")
+        if readers.pyarrow is None:
+            self.skipTest("pyarrow is not installed")
+        directory = tempfile.mkdtemp()
+        file_name = os.path.join(directory, "test.csv")
+        try:
+            with open(file_name, "w", newline="") as file:
+                file.write('id,name,comment\r\n1,"a, b","x\r\ny"\r\n2,,"say ""hi"""\r\n3,"c","line\nbreak"\r\n')
+            cfg.column_separator = ","
+            cfg.quote_char = '"'
+            with f.open_file(file_name) as file:
+                expected = list(f.get_csv_reader(file))
+            cfg.reader = "arrow"
+            with f.open_file(file_name) as file:
+                self.assertEqual(expected, list(f.get_csv_reader(file)))
+            self.assertEqual(["1", "a, b", "x\ny"], expected[1])
+        finally:
+            cfg.reader = "csv"
+            shutil.rmtree(directory)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -37,6 +37,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import csv2db.checkpoint as checkpoint
 import csv2db.constants as cons
 import csv2db.functions as f
 import csv2db.config as cfg
@@ -127,6 +128,25 @@ class LoadingTestsSuite(unittest.TestCase):
         # Assert that double the amount of rows has been loaded (2 * first count == second count)
         self.assertEqual((count1*2), count2)
 
+    def load_in_parallel(self):
+        params = ["load",
+                  "-f", "resources/test_files/201811-citibike-tripdata.csv*",
+                  "-o", self.params["db_type"],
+                  "-u", self.params["user"],
+                  "-p", self.params["password"],
+                  "-d", self.params["database"],
+                  "-t", self.params["table_staging"],
+                  "--truncate"
+                  ]
+
+        self.assertEqual(cons.ExitCodes.SUCCESS.value, csv2db.run(params))
+        count1 = self.table_count(self.params["table_staging"])
+
+        self.assertEqual(cons.ExitCodes.SUCCESS.value, csv2db.run(params + ["--parallel", "3"]))
+        count2 = self.table_count(self.params["table_staging"])
+
+        self.assertEqual(count1, count2)
+
     def setUp(self):
         # Set the defaults for all tests
         cfg.column_separator = ","
@@ -136,6 +156,10 @@ class LoadingTestsSuite(unittest.TestCase):
         cfg.log_bad_records = False
         cfg.debug = False
         cfg.truncate_before_load = False
+        cfg.bulk_load = False
+        cfg.pipeline_depth = 0
+        cfg.async_connections = 0
+        cfg.parallel = 1
 
     def tearDown(self):
         # Truncate tables
@@ -226,6 +250,110 @@ class LoadingTestsSuite(unittest.TestCase):
         print("test_loading_" + self.params["db_type"])
         self.load_data("resources/test_files/201811-citibike-tripdata.csv", self.params["table_staging"])
 
+    def test_pipelined_loading(self):
+        print("test_pipelined_loading_" + self.params["db_type"])
+        self.assertEqual(cons.ExitCodes.SUCCESS.value,
+                         csv2db.run(
+                             ["load",
+                              "-o", self.params["db_type"],
+                              "-f", "resources/test_files/201811-citibike-tripdata.csv",
+                              "-u", self.params["user"],
+                              "-p", self.params["password"],
+                              "-d", self.params["database"],
+                              "-t", self.params["table_staging"],
+                              "-b", "5",
+                              "--pipeline", "2"
+                              ])
+                         )
+        self.assertEqual(16, self.table_count(self.params["table_staging"]))
+
+    def test_resume_load(self):
+        print("test_resume_load_" + self.params["db_type"])
+        file_name = "resources/test_files/201811-citibike-tripdata.csv"
+        journal_file = "test_resume_load.journal"
+        # Pretend a previous load committed the first batch of 10 rows before it died
+        journal = checkpoint.CheckpointJournal(journal_file)
+        journal.record(file_name, 10)
+        journal.close()
+        params = ["load",
+                  "-o", self.params["db_type"],
+                  "-f", file_name,
+                  "-u", self.params["user"],
+                  "-p", self.params["password"],
+                  "-d", self.params["database"],
+                  "-t", self.params["table_staging"],
+                  "-b", "5",
+                  "--checkpoint", journal_file,
+                  "--resume"]
+        try:
+            self.assertEqual(cons.ExitCodes.SUCCESS.value, csv2db.run(params))
+            self.assertEqual(6, self.table_count(self.params["table_staging"]))
+            # The file has been loaded completely and is skipped
+            self.assertEqual(cons.ExitCodes.SUCCESS.value, csv2db.run(params))
+            self.assertEqual(6, self.table_count(self.params["table_staging"]))
+        finally:
+            os.remove(journal_file)
+
+    def test_convert_types_load(self):
+        print("test_convert_types_load_" + self.params["db_type"])
+        params = ["load",
+                  "-o", self.params["db_type"],
+                  "-f", "resources/test_files/201811-citibike-tripdata.csv",
+                  "-u", self.params["user"],
+                  "-p", self.params["password"],
+                  "-d", self.params["database"],
+                  "-t", self.params["table_staging"],
+                  "--convert-types"]
+        try:
+            self.assertEqual(cons.ExitCodes.SUCCESS.value, csv2db.run(params))
+            self.assertIsNotNone(cfg.table_metadata.get_column("tripduration"))
+            count = self.table_count(self.params["table_staging"])
+            cfg.convert_types = False
+            # The same rows are loaded without conversion
+            self.assertEqual(count * 2, self.load_data("resources/test_files/201811-citibike-tripdata.csv",
+                                                       self.params["table_staging"]))
+        finally:
+            cfg.convert_types = False
+
+    def test_batch_size_tuning_with_memory_limit(self):
+        print("test_batch_size_tuning_with_memory_limit_" + self.params["db_type"])
+        # The memory limit is reached long before the starting batch size, the batches are tuned nevertheless
+        self.assertEqual(cons.ExitCodes.SUCCESS.value,
+                         csv2db.run(
+                             ["load",
+                              "-o", self.params["db_type"],
+                              "-f", "resources/test_files/201811-citibike-tripdata.csv",
+                              "-u", self.params["user"],
+                              "-p", self.params["password"],
+                              "-d", self.params["database"],
+                              "-t", self.params["table_staging"],
+                              "--batch", "auto",
+                              "--batch-bytes", "4K"
+                              ])
+                         )
+        self.assertEqual(16, self.table_count(self.params["table_staging"]))
+        self.assertIsNotNone(cfg.batch_tuner.last_throughput)
+
+    def test_async_loading(self):
+        print("test_async_loading_" + self.params["db_type"])
+        if self.params["db_type"] not in ("oracle", "postgres"):
+            self.skipTest("Asynchronous loading is not supported for " + self.params["db_type"])
+        self.assertEqual(cons.ExitCodes.SUCCESS.value,
+                         csv2db.run(
+                             ["load",
+                              "-o", self.params["db_type"],
+                              "-f", "resources/test_files/201811-citibike-tripdata.csv*",
+                              "-u", self.params["user"],
+                              "-p", self.params["password"],
+                              "-d", self.params["database"],
+                              "-t", self.params["table_staging"],
+                              "-b", "5",
+                              "--async", "2"
+                              ])
+                         )
+        # The asynchronous connections are reused for all three files
+        self.assertEqual(36, self.table_count(self.params["table_staging"]))
+
     def test_unicode_file(self):
         print("test_unicode_file_" + self.params["db_type"])
         self.load_data("resources/test_files/allCountries.1000.txt.gz",
@@ -239,6 +367,10 @@ class LoadingTestsSuite(unittest.TestCase):
         print("test_negative_truncate_table_before_load_" + self.params["db_type"])
         self.load_with_truncated_table_negative()
 
+    def test_parallel_load(self):
+        print("test_parallel_load_" + self.params["db_type"])
+        self.load_in_parallel()
+
     def test_negative_load_invalid_file_type(self):
         print("test_negative_load_invalid_file_type")
         self.assertEqual(cons.ExitCodes.GENERIC_ERROR.value,
@@ -288,10 +420,26 @@ class LoadingTestsSuite(unittest.TestCase):
                          self.table_count(self.params["table_staging"])
                          )
 
-    def test_log_bad_rows(self):
-        print("test_ignore_bad_data")
-        bad_rows = 3
-        bad_rows_found = 0
+    def test_bulk_load(self):
+        print("test_bulk_load_" + self.params["db_type"])
+        self.assertEqual(cons.ExitCodes.SUCCESS.value,
+                         csv2db.run(
+                             ["load",
+                              "-o", self.params["db_type"],
+                              "-f", "resources/test_files/201811-citibike-tripdata.csv",
+                              "-u", self.params["user"],
+                              "-p", self.params["password"],
+                              "-d", self.params["database"],
+                              "-t", self.params["table_staging"],
+                              "--bulk",
+                              "--debug"
+                              ])
+                         )
+        self.assertEqual(16, self.table_count(self.params["table_staging"]))
+
+    def test_bulk_load_ignore_bad_data(self):
+        print("test_bulk_load_ignore_bad_data_" + self.params["db_type"])
+        good_records = 7
         self.assertEqual(cons.ExitCodes.SUCCESS.value,
                          csv2db.run(
                              ["load",
@@ -301,23 +449,70 @@ class LoadingTestsSuite(unittest.TestCase):
                               "-p", self.params["password"],
                               "-d", self.params["database"],
                               "-t", self.params["table_staging"],
-                              "--log",
+                              "--bulk",
+                              "--ignore",
                               "--debug"
                               ])
                          )
+        self.assertEqual(good_records,
+                         self.table_count(self.params["table_staging"])
+                         )
 
-        with f.open_file("resources/test_files/bad/201811-citibike-tripdata-errors.csv.bad") as bad_file:
-            bad_reader = f.get_csv_reader(bad_file)
-            for bad_line in bad_reader:
-                with f.open_file("resources/test_files/bad/201811-citibike-tripdata-errors.csv") as file:
-                    reader = f.get_csv_reader(file)
-                    for line in reader:
-                        if bad_line == line:
-                            bad_rows_found += 1
-                            break
-
-        self.assertEqual(bad_rows, bad_rows_found)
-        os.remove("resources/test_files/bad/201811-citibike-tripdata-errors.csv.bad")
+    def test_ignore_bad_data_small_batches(self):
+        print("test_ignore_bad_data_small_batches_" + self.params["db_type"])
+        good_records = 7
+        self.assertEqual(cons.ExitCodes.SUCCESS.value,
+                         csv2db.run(
+                             ["load",
+                              "-o", self.params["db_type"],
+                              "-f", "resources/test_files/bad/201811-citibike-tripdata-errors.csv",
+                              "-u", self.params["user"],
+                              "-p", self.params["password"],
+                              "-d", self.params["database"],
+                              "-t", self.params["table_staging"],
+                              "-b", "3",
+                              "--ignore"
+                              ])
+                         )
+        self.assertEqual(good_records,
+                         self.table_count(self.params["table_staging"])
+                         )
+
+    def test_log_bad_rows(self):
+        print("test_ignore_bad_data")
+        bad_rows = 3
+        # Bad rows are logged as they are in the file, whether or not the values are converted
+        for options in ([], ["--convert-types"]):
+            bad_rows_found = 0
+            try:
+                self.assertEqual(cons.ExitCodes.SUCCESS.value,
+                                 csv2db.run(
+                                     ["load",
+                                      "-o", self.params["db_type"],
+                                      "-f", "resources/test_files/bad/201811-citibike-tripdata-errors.csv",
+                                      "-u", self.params["user"],
+                                      "-p", self.params["password"],
+                                      "-d", self.params["database"],
+                                      "-t", self.params["table_staging"],
+                                      "--log",
+                                      "--debug"
+                                      ] + options)
+                                 )
+            finally:
+                cfg.convert_types = False
+
+            with f.open_file("resources/test_files/bad/201811-citibike-tripdata-errors.csv.bad") as bad_file:
+                bad_reader = f.get_csv_reader(bad_file)
+                for bad_line in bad_reader:
+                    with f.open_file("resources/test_files/bad/201811-citibike-tripdata-errors.csv") as file:
+                        reader = f.get_csv_reader(file)
+                        for line in reader:
+                            if bad_line == line:
+                                bad_rows_found += 1
+                                break
+
+            self.assertEqual(bad_rows, bad_rows_found)
+            os.remove("resources/test_files/bad/201811-citibike-tripdata-errors.csv.bad")
 
     def test_load_utf_16_file(self):
         print("test_load_utf_16_file")